@@ -330,7 +330,7 @@ export function ScreenerStep({
             console.log('✅ Mapped to: progressed on targeted therapy');
           } else if (status === "progressed_on_chemo" || status === "progressed_on_immunotherapy") {
             currentTreatmentStatus = "progressed_chemo_immuno";
-            lineOfTherapy = "second_line";
+            lineOfTherapy = "post_chemo_immuno";
             console.log('✅ Mapped to: progressed on chemo/immunotherapy');
           } else if (status === "newly_diagnosed") {
             currentTreatmentStatus = "first_line";
@@ -345,6 +345,7 @@ export function ScreenerStep({
           updates.currentTreatmentStatus = currentTreatmentStatus;
           updates.lineOfTherapy = lineOfTherapy === "first_line" ? "first" :
                                   lineOfTherapy === "second_line" ? "post_targeted" :
+                                  lineOfTherapy === "post_chemo_immuno" ? "post_chemo_immuno" :
                                   null;
         }
         // Handle nested structure (treatment_status object)
@@ -364,7 +365,7 @@ export function ScreenerStep({
             else if (status.current_status === "progressed_on_chemo" ||
                      status.current_status === "progressed_on_immunotherapy") {
               currentTreatmentStatus = "progressed_chemo_immuno";
-              lineOfTherapy = "second_line";
+              lineOfTherapy = "post_chemo_immuno";
               console.log('✅ Mapped to: progressed on chemo/immunotherapy');
             }
           }
@@ -378,6 +379,7 @@ export function ScreenerStep({
           updates.currentTreatmentStatus = currentTreatmentStatus;
           updates.lineOfTherapy = lineOfTherapy === "first_line" ? "first" :
                                   lineOfTherapy === "second_line" ? "post_targeted" :
+                                  lineOfTherapy === "post_chemo_immuno" ? "post_chemo_immuno" :
                                   null;
           updates.priorRegimenName = status.prior_regimen;
           updates.progressionDetected = status.progression_detected;
@@ -130,11 +130,77 @@ function transformPatientDataToProfile(patientData: PatientData): PatientProfile
     ecog: patientData.ecogStatus !== null ? String(patientData.ecogStatus) as '0' | '1' | '2' | '3' | '4' | 'unknown' : '1',
     biomarkers,
     prior_treatments,
-    line_of_therapy: (patientData.lineOfTherapy || 'later_line') as 'first' | 'post_targeted' | 'later_line',
+    line_of_therapy: (patientData.lineOfTherapy || 'later_line') as 'first' | 'post_targeted' | 'post_chemo_immuno' | 'later_line',
   };
 }
 
+/**
+ * Match ids from earlier matches in this browser session, by profile, so
+ * other pages (e.g. the walkthrough) reuse the stored result instead of
+ * re-running matching
+ */
+const MATCH_ID_PREFIX = 'trialscout:match-id:';
+
+function rememberedMatchId(profile: PatientProfile): string | null {
+  try {
+    return sessionStorage.getItem(MATCH_ID_PREFIX + JSON.stringify(profile));
+  } catch {
+    return null;
+  }
+}
+
+function rememberMatchId(profile: PatientProfile, matchId?: string): void {
+  if (!matchId) return;
+  try {
+    sessionStorage.setItem(MATCH_ID_PREFIX + JSON.stringify(profile), matchId);
+  } catch {
+    // Storage unavailable (private mode, quota): matching just runs again next time
+  }
+}
+
+/**
+ * Whether a stored result's profile is the one being asked about. The
+ * server's copy is validated and may carry extra defaulted fields, so only
+ * the fields sent are compared (null and missing are the same).
+ */
+function describesProfile(stored: unknown, sent: unknown): boolean {
+  if (sent === null || sent === undefined) return stored === null || stored === undefined;
+  if (Array.isArray(sent)) {
+    return Array.isArray(stored) && stored.length === sent.length &&
+      sent.every((item, i) => describesProfile(stored[i], item));
+  }
+  if (typeof sent === 'object') {
+    if (stored === null || typeof stored !== 'object') return false;
+    return Object.entries(sent as Record<string, unknown>).every(([key, value]) =>
+      describesProfile((stored as Record<string, unknown>)[key], value)
+    );
+  }
+  return stored === sent;
+}
+
+/**
+ * Match a profile, reusing a stored result when a match id is known.
+ * An expired id (404), or one stored for a different profile (e.g. a
+ * ?match= link opened with another ?patient=), falls back to matching again.
+ */
+async function matchProfile(profile: PatientProfile, matchId?: string | null): Promise<MatchResponse> {
+  const knownId = matchId || rememberedMatchId(profile);
+  if (knownId) {
+    try {
+      const stored = await api.trials.getMatchResult(knownId);
+      if (describesProfile(stored.context.patient, profile)) return stored;
+      console.warn(`Match ${knownId} is for a different patient profile; matching again`);
+    } catch (error) {
+      if (!(error instanceof APIClientError && error.status === 404)) throw error;
+    }
+  }
+  const response = await api.trials.match(profile);
+  rememberMatchId(profile, response.match_id);
+  return response;
+}
+
 export interface UseTrialMatchingOptions {
+  matchId?: string | null; // stored result to show instead of matching again
   enabled?: boolean;
   onSuccess?: (data: MatchResponse) => void;
   onError?: (error: APIClientError) => void;
@@ -148,12 +214,12 @@ export function useTrialMatching(
 
   // Query for matching trials
   const matchQuery = useQuery({
-    queryKey: ['trial-matches', patientData],
+    queryKey: ['trial-matches', patientData, options.matchId ?? null],
     queryFn: async () => {
       const profile = transformPatientDataToProfile(patientData);
       console.log('=== SENDING TO BACKEND ===');
       console.log('Profile:', JSON.stringify(profile, null, 2));
-      return api.trials.match(profile);
+      return matchProfile(profile, options.matchId);
     },
     enabled: options.enabled !== false && patientData.cancerType !== null,
     retry: 2,
@@ -164,7 +230,9 @@ export function useTrialMatching(
   const matchMutation = useMutation({
     mutationFn: async (data: PatientData) => {
       const profile = transformPatientDataToProfile(data);
-      return api.trials.match(profile);
+      const response = await api.trials.match(profile);
+      rememberMatchId(profile, response.match_id);
+      return response;
     },
     onSuccess: (data) => {
       toast({
@@ -198,6 +266,7 @@ export function useTrialMatching(
   return {
     // Data
     matchResponse: matchQuery.data,
+    matchId: matchQuery.data?.match_id,
     matchedTrials: matchQuery.data?.matches || [],
     possiblyEligibleCount: matchQuery.data?.stats.possibly_eligible || 0,
     totalTrialsEvaluated: matchQuery.data?.stats.total_trials || 0,
@@ -220,18 +289,30 @@ export function useClinicianBrief() {
   const [isGenerating, setIsGenerating] = useState(false);
 
   const generateBrief = useCallback(
-    async (patientData: PatientData, matchedTrials: APIMatchedTrial[], topN: number = 5) => {
+    async (
+      patientData: PatientData,
+      matchedTrials: APIMatchedTrial[],
+      topN: number = 5,
+      matchId?: string
+    ) => {
       setIsGenerating(true);
       try {
-        const profile = transformPatientDataToProfile(patientData);
-        const response = await api.brief.generate({
-          patient_profile: profile,
+        const fullRequest = () => api.brief.fetchPdf({
+          patient_profile: transformPatientDataToProfile(patientData),
           matched_trials: matchedTrials,
           top_n: topN,
         });
+        // With a match id the server already has the profile and results;
+        // send them only if the stored result has expired
+        const response = matchId
+          ? await api.brief.fetchPdf({ match_id: matchId, top_n: topN }).catch((error) => {
+              if (error instanceof APIClientError && error.status === 404) return fullRequest();
+              throw error;
+            })
+          : await fullRequest();
         
         // Download the PDF
-        api.brief.download(response.pdf_base64, response.filename);
+        api.brief.download(response.pdf, response.filename);
         
         toast({
           title: 'Brief Generated',
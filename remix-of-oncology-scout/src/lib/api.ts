@@ -6,10 +6,12 @@
 import type {
   PatientProfile,
   MatchResponse,
+  MatchPage,
   TrialFullDetail,
   TrialDetail,
   ClinicianBriefRequest,
   ClinicianBriefResponse,
+  ClinicianBriefPDF,
   HealthResponse,
   APIError,
 } from '@/types/api';
@@ -33,13 +35,13 @@ export class APIClientError extends Error {
 }
 
 /**
- * Fetch wrapper with error handling and timeout
+ * Fetch wrapper with error handling and timeout; resolves to the raw response
  */
-async function fetchAPI<T>(
+async function fetchResponse(
   endpoint: string,
   options?: RequestInit,
   timeoutMs: number = API_TIMEOUT
-): Promise<T> {
+): Promise<Response> {
   const controller = new AbortController();
   const timeout = setTimeout(() => controller.abort(), timeoutMs);
 
@@ -82,7 +84,7 @@ async function fetchAPI<T>(
       throw new APIClientError(response.status, errorMessage, errorDetail);
     }
 
-    return response.json();
+    return response;
   } catch (error) {
     clearTimeout(timeout);
 
@@ -102,6 +104,18 @@ async function fetchAPI<T>(
   }
 }
 
+/**
+ * Fetch wrapper for JSON endpoints
+ */
+async function fetchAPI<T>(
+  endpoint: string,
+  options?: RequestInit,
+  timeoutMs: number = API_TIMEOUT
+): Promise<T> {
+  const response = await fetchResponse(endpoint, options, timeoutMs);
+  return response.json();
+}
+
 /**
  * Health Check
  * Check backend status and dataset information
@@ -127,6 +141,35 @@ export async function matchTrials(
   );
 }
 
+/**
+ * Get Stored Match
+ * Page through a match result by its match_id (404 once it has expired)
+ */
+export async function getMatch(
+  matchId: string,
+  offset: number = 0,
+  limit: number = 100
+): Promise<MatchPage> {
+  return fetchAPI<MatchPage>(
+    `/api/v1/match/${encodeURIComponent(matchId)}?offset=${offset}&limit=${limit}`
+  );
+}
+
+/**
+ * Get Stored Match (all pages)
+ * The full match result for a match_id, without re-running matching
+ */
+export async function getMatchResult(matchId: string): Promise<MatchResponse> {
+  const page = await getMatch(matchId);
+  const matches = [...page.matches];
+  while (matches.length < page.total) {
+    const next = await getMatch(matchId, matches.length);
+    if (next.matches.length === 0) break;
+    matches.push(...next.matches);
+  }
+  return { matches, context: page.context, stats: page.stats, match_id: page.match_id };
+}
+
 /**
  * Get Trial Details
  * Get full details for a specific trial by NCT number
@@ -175,18 +218,50 @@ export async function generateClinicianBrief(
   );
 }
 
+/**
+ * Fetch Clinician Brief PDF
+ * Same request as generateClinicianBrief, but negotiates application/pdf:
+ * the body is the PDF itself, with no base64 or JSON to decode
+ */
+export async function fetchClinicianBriefPDF(
+  request: ClinicianBriefRequest
+): Promise<ClinicianBriefPDF> {
+  const response = await fetchResponse(
+    '/api/brief',
+    {
+      method: 'POST',
+      body: JSON.stringify(request),
+      headers: { Accept: 'application/pdf' },
+    },
+    60000 // 60 second timeout for PDF generation
+  );
+  const disposition = response.headers.get('Content-Disposition') ?? '';
+  return {
+    pdf: await response.blob(),
+    filename: /filename="([^"]+)"/.exec(disposition)?.[1] ?? 'TrialScout_Clinician_Brief.pdf',
+    generated_at: response.headers.get('X-Brief-Generated-At') ?? '',
+    cache_hit: response.headers.get('X-Brief-Cache') === 'hit',
+  };
+}
+
 /**
  * Download PDF Helper
- * Download a PDF from base64 string
+ * Download a PDF from a Blob or a base64 string
  */
-export function downloadPDF(base64: string, filename: string): void {
-  const linkSource = `data:application/pdf;base64,${base64}`;
+export function downloadPDF(pdf: Blob | string, filename: string): void {
+  const linkSource = typeof pdf === 'string'
+    ? `data:application/pdf;base64,${pdf}`
+    : URL.createObjectURL(pdf);
   const downloadLink = document.createElement('a');
   downloadLink.href = linkSource;
   downloadLink.download = filename;
   document.body.appendChild(downloadLink);
   downloadLink.click();
   document.body.removeChild(downloadLink);
+  if (typeof pdf !== 'string') {
+    // Revoke after the click has started the download
+    setTimeout(() => URL.revokeObjectURL(linkSource), 0);
+  }
 }
 
 /**
@@ -241,11 +316,14 @@ export const api = {
   },
   trials: {
     match: matchTrials,
+    getMatch,
+    getMatchResult,
     getDetails: getTrialDetails,
     list: listTrials,
   },
   brief: {
     generate: generateClinicianBrief,
+    fetchPdf: fetchClinicianBriefPDF,
     download: downloadPDF,
   },
   utils: {
@@ -19,6 +19,8 @@ export default function Walkthrough() {
   const [copiedSection, setCopiedSection] = useState<string | null>(null);
 
   const patientKey = (searchParams.get("patient") as SamplePatientKey) || "her2_low";
+  // A stored result for a different patient than ?patient= is not reused (see matchProfile)
+  const matchId = searchParams.get("match");
   const patientData = SAMPLE_PATIENTS[patientKey];
   const patientDescription = SAMPLE_PATIENT_DESCRIPTIONS[patientKey];
 
@@ -29,6 +31,7 @@ export default function Walkthrough() {
     isLoading,
     isError,
   } = useTrialMatching(patientData, {
+    matchId,
     enabled: patientData?.cancerType !== null,
   });
 
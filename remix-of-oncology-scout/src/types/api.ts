@@ -63,7 +63,7 @@ export interface PatientProfile {
   ecog: '0' | '1' | '2' | '3' | '4' | 'unknown';
   biomarkers: BreastBiomarkers | LungBiomarkers;
   prior_treatments: PriorTreatment[];
-  line_of_therapy?: 'first' | 'post_targeted' | 'later_line';
+  line_of_therapy?: 'first' | 'post_targeted' | 'post_chemo_immuno' | 'later_line';
 }
 
 // Trial Types
@@ -146,15 +146,26 @@ export interface MatchResponse {
   matches: MatchResult[];
   context: MatchingContext;
   stats: MatchingStats;
+  match_id?: string; // reference for getMatch() and the clinician brief
+}
+
+// One page of a stored match result (GET /api/v1/match/{match_id})
+export interface MatchPage extends MatchResponse {
+  match_id: string;
+  total: number;
+  offset: number;
+  limit: number;
 }
 
 // Legacy type aliases for backward compatibility
 export type MatchedTrial = MatchResult;
 
-// Clinician Brief Types (not yet implemented in new backend)
+// Clinician Brief Types
+// Send match_id (from matchTrials) or the profile and results themselves
 export interface ClinicianBriefRequest {
-  patient_profile: PatientProfile;
-  matched_trials: MatchResult[];
+  match_id?: string;
+  patient_profile?: PatientProfile;
+  matched_trials?: MatchResult[];
   top_n?: number; // 1-10, default 5
 }
 
@@ -162,12 +173,22 @@ export interface ClinicianBriefResponse {
   pdf_base64: string;
   filename: string;
   generated_at: string;
+  cache_hit?: boolean;
+}
+
+// The same brief requested with Accept: application/pdf
+export interface ClinicianBriefPDF {
+  pdf: Blob;
+  filename: string;
+  generated_at: string;
+  cache_hit: boolean;
 }
 
 // Health Check Type
 export interface HealthResponse {
   status: string;
   dataset_version: string;
+  catalog_version?: string;
   last_updated: string;
   total_trials: number;
 }
@@ -0,0 +1,93 @@
+"""
+Admin API endpoints
+"""
+from fastapi import APIRouter, Header, HTTPException, Depends
+from typing import Optional
+from app.catalog import catalog
+from app.config import settings
+from app.extractors.cache import extraction_cache
+from app.lanes import get_lane
+from app.ratelimit import AdmissionRejected
+import hmac
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Check the X-Admin-Token header; without a configured ADMIN_TOKEN the admin API is closed"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin API disabled: set ADMIN_TOKEN to enable it")
+    if not hmac.compare_digest(x_admin_token or "", settings.admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/extraction-cache")
+async def inspect_extraction_cache():
+    """
+    Inspect the biomarker extraction cache
+    
+    Returns size/hit stats and entry metadata (most recently used first)
+    """
+    lane = get_lane("extraction")  # reads every entry file
+    return {
+        "stats": await lane.run(extraction_cache.stats),
+        "entries": await lane.run(extraction_cache.entries)
+    }
+
+
+@router.delete("/extraction-cache")
+async def purge_extraction_cache():
+    """Remove every cached extraction result"""
+    removed = await get_lane("extraction").run(extraction_cache.purge)
+    return {"message": "Extraction cache purged", "removed": removed}
+
+
+@router.delete("/extraction-cache/{key}")
+async def purge_extraction_cache_entry(key: str):
+    """Remove a single cached extraction result"""
+    if not await get_lane("extraction").run(extraction_cache.purge, key):
+        raise HTTPException(status_code=404, detail=f"Cache entry {key} not found")
+    return {"message": "Cache entry removed", "key": key}
+
+
+@router.get("/catalog")
+async def inspect_catalog():
+    """
+    Current catalog snapshot
+    
+    "stale" is true when trials have changed since the snapshot was built
+    (SQLite only)
+    """
+    snapshot = catalog.current
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Catalog not loaded yet")
+    return {
+        "catalog_version": snapshot.version,
+        "stale": await get_lane("interactive").run(catalog.is_stale),  # one counter query
+        **snapshot.stats
+    }
+
+
+@router.post("/catalog/reload")
+async def reload_catalog():
+    """
+    Rebuild the catalog from the database and swap it in without a restart
+    
+    The new snapshot is built in the bulk lane while requests keep using the
+    current one; matches already running finish against the snapshot they
+    started with. If the rebuild fails, the current snapshot stays.
+    """
+    previous = catalog.current
+    try:
+        snapshot = await get_lane("bulk").run(catalog.reload, "admin")
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Catalog reload failed: {e}")
+    return {
+        "message": "Catalog reloaded",
+        "previous_version": previous.version if previous else None,
+        "catalog_version": snapshot.version,
+        "total_trials": snapshot.stats["total_trials"]
+    }
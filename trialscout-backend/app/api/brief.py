@@ -0,0 +1,159 @@
+"""
+API endpoint for clinician briefs
+"""
+from datetime import date
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from typing import Optional
+import base64
+import logging
+
+from app.briefs import BulkBriefSource, get_brief, stream_bulk_briefs
+from app.config import settings
+from app.match_store import match_store
+from app.models.brief import BulkBriefRequest, ClinicianBriefRequest, ClinicianBriefResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["brief"])
+
+# Response headers carrying the JSON fields when the brief is sent as raw PDF
+BRIEF_HEADERS = ("Content-Disposition", "X-Brief-Generated-At", "X-Brief-Cache")
+
+
+def _media_quality(accept: str, media_type: str) -> float:
+    """q-value an Accept header gives media_type (most specific range wins)"""
+    main_type = media_type.split("/")[0]
+    best, specificity = 0.0, -1
+    for part in accept.split(","):
+        fields = [field.strip() for field in part.split(";")]
+        media_range = fields[0].lower()
+        if media_range == media_type:
+            rank = 2
+        elif media_range == f"{main_type}/*":
+            rank = 1
+        elif media_range == "*/*":
+            rank = 0
+        else:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if rank > specificity:
+            best, specificity = q, rank
+    return best
+
+
+def wants_pdf(accept: Optional[str]) -> bool:
+    """True if the client prefers application/pdf over the JSON envelope
+
+    Only an explicit application/pdf counts; no Accept header or */* keeps
+    the base64 JSON response existing clients expect.
+    """
+    if not accept or "application/pdf" not in accept.lower():
+        return False
+    pdf = _media_quality(accept, "application/pdf")
+    return pdf > 0 and pdf >= _media_quality(accept, "application/json")
+
+
+@router.post(
+    "/brief",
+    response_model=ClinicianBriefResponse,
+    responses={200: {"content": {"application/pdf": {}}, "description": "The brief as JSON or raw PDF"}},
+)
+async def generate_clinician_brief(request: ClinicianBriefRequest, accept: Optional[str] = Header(None)):
+    """
+    Generate a PDF clinician brief for the top matched trials
+
+    Send the match_id returned by /api/v1/match, or the patient_profile and
+    matched_trials themselves. Rendering runs in a worker process; a brief identical to one rendered
+    earlier today (same profile, trials, top_n and catalog version) comes
+    from the brief cache with "cache_hit": true.
+
+    With "Accept: application/pdf" the rendered bytes are sent as the body
+    (no base64 or JSON), with the file name in Content-Disposition and the
+    other fields in X-Brief-Generated-At and X-Brief-Cache (hit or miss).
+
+    Returns:
+        {"pdf_base64": "...", "filename": "...", "generated_at": "...", "cache_hit": false}
+    """
+    if request.match_id is not None:
+        result = match_store.get(request.match_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"Match result {request.match_id} not found or expired")
+        patient_profile, matched_trials = result.context.patient, result.matches
+    else:
+        patient_profile, matched_trials = request.patient_profile, request.matched_trials
+
+    brief, cache_hit = await get_brief(patient_profile, matched_trials, request.top_n)
+    logger.info(
+        f"Clinician brief for {min(request.top_n, len(matched_trials))} trials "
+        f"({len(brief.pdf) / 1024:.0f} KB, {'cached' if cache_hit else 'rendered'})"
+    )
+    filename = f"TrialScout_Clinician_Brief_{brief.generated_at[:10]}.pdf"
+    if wants_pdf(accept):
+        return Response(
+            content=brief.pdf,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "X-Brief-Generated-At": brief.generated_at,
+                "X-Brief-Cache": "hit" if cache_hit else "miss",
+                "Vary": "Accept",
+            },
+        )
+    return ClinicianBriefResponse(
+        pdf_base64=base64.b64encode(brief.pdf).decode("ascii"),
+        filename=filename,
+        generated_at=brief.generated_at,
+        cache_hit=cache_hit,
+    )
+
+
+@router.post("/brief/bulk", response_class=StreamingResponse)
+async def generate_bulk_clinician_briefs(request: BulkBriefRequest):
+    """
+    Generate clinician briefs for a whole clinic list as a ZIP archive
+
+    Each entry takes a match_id or a patient_profile and matched_trials, like
+    /api/brief, plus an optional label used in the file name. Briefs render
+    in parallel in the worker processes and the archive is streamed as they
+    finish, in completion order; members are numbered by position in the
+    request, and manifest.json at the end lists every entry with its file
+    name or error.
+
+    Unknown or expired match ids answer 404 before anything is rendered.
+    """
+    if len(request.briefs) > settings.brief_bulk_max_items:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.brief_bulk_max_items} briefs per request ({len(request.briefs)} given)",
+        )
+
+    sources = []
+    missing = []
+    for item in request.briefs:
+        if item.match_id is not None:
+            result = match_store.get(item.match_id)
+            if result is None:
+                missing.append(item.match_id)
+                continue
+            patient_profile, matched_trials = result.context.patient, result.matches
+        else:
+            patient_profile, matched_trials = item.patient_profile, item.matched_trials
+        sources.append(BulkBriefSource(item.label, item.match_id, patient_profile, matched_trials, item.top_n))
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Match results not found or expired: {', '.join(missing)}")
+
+    logger.info(f"Bulk clinician briefs for {len(sources)} patients")
+    return StreamingResponse(
+        stream_bulk_briefs(sources),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="TrialScout_Clinician_Briefs_{date.today().isoformat()}.zip"'
+        },
+    )
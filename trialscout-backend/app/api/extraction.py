@@ -2,10 +2,17 @@
 API endpoints for document extraction
 """
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from typing import Optional
+from typing import List, Optional
 from app.extractors.document_extractor import DocumentExtractor
-from app.extractors.biomarker_extractor import BiomarkerExtractor
+from app.extractors.llm_client import LLMUnavailable
+from app.extractors.pipeline import ALLOWED_CONTENT_TYPES, extract_document
+from app.extractors.profile_builder import build_patient_profile
+from app.lanes import get_lane
+from app.ratelimit import AdmissionRejected
+from app.uploads import MAX_BATCH_FILES, Upload, read_upload
+import asyncio
 import logging
+import math
 import time
 
 logger = logging.getLogger(__name__)
@@ -30,63 +37,50 @@ async def extract_biomarkers(
             "success": true,
             "biomarker_data": {...},
             "raw_text": "extracted text from document",
-            "processing_time_seconds": 3.2
+            "processing_time_seconds": 3.2,
+            "cache_hit": false
         }
+    
+    Identical uploads (same bytes, hint, model and prompt version) are
+    answered from the extraction cache with "cache_hit": true.
     """
     start_time = time.time()
     
     # Validate file type
-    allowed_types = ["application/pdf", "text/plain", "application/txt"]
-    if file.content_type not in allowed_types:
+    if file.content_type not in ALLOWED_CONTENT_TYPES:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported file type: {file.content_type}. Allowed: PDF, TXT"
         )
     
-    # Validate file size (max 10MB)
-    file_size = 0
-    content = await file.read()
-    file_size = len(content)
-    await file.seek(0)  # Reset file pointer
-    
-    if file_size > 10 * 1024 * 1024:  # 10MB
-        raise HTTPException(
-            status_code=400,
-            detail="File too large. Maximum size is 10MB"
-        )
+    # Read in chunks: size limit (max 10MB) enforced and hash computed as it streams
+    upload = await read_upload(file)
     
     try:
-        # Step 1: Extract text from document
-        logger.info(f"Extracting text from {file.filename}...")
-        document_extractor = DocumentExtractor()
-        raw_text = await document_extractor.extract_text(file)
-        
-        if not raw_text or len(raw_text.strip()) < 20:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract text from document. Please ensure the file is readable and contains text."
-            )
-        
-        logger.info(f"Extracted {len(raw_text)} characters of text")
-        
-        # Step 2: Extract biomarkers using Claude
-        logger.info("Extracting biomarkers with Claude API...")
-        biomarker_extractor = BiomarkerExtractor()
-        biomarker_data = biomarker_extractor.extract_biomarkers(
-            report_text=raw_text,
-            cancer_type=cancer_type
-        )
+        result = await extract_document(upload, cancer_type)
         
         processing_time = time.time() - start_time
         logger.info(f"Extraction complete in {processing_time:.2f} seconds")
         
         return {
             "success": True,
-            "biomarker_data": biomarker_data,
-            "raw_text": raw_text[:1000] + "..." if len(raw_text) > 1000 else raw_text,  # Truncate for response
-            "processing_time_seconds": round(processing_time, 2)
+            "biomarker_data": result["biomarker_data"],
+            "raw_text": result["raw_text"],
+            "processing_time_seconds": round(processing_time, 3 if result["cache_hit"] else 2),
+            "cache_hit": result["cache_hit"]
         }
     
+    except (HTTPException, AdmissionRejected):
+        raise
+    
+    except LLMUnavailable as e:
+        logger.warning(f"Extraction rejected, LLM circuit open: {e.reason}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Biomarker extraction temporarily unavailable: {e.reason}",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
+    
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -97,25 +91,140 @@ async def extract_biomarkers(
             status_code=500,
             detail=f"Error processing document: {str(e)}"
         )
+    
+    finally:
+        upload.close()
+
+
+@router.post("/extract-patient-profile")
+async def extract_patient_profile(
+    files: List[UploadFile] = File(...),
+    cancer_type: Optional[str] = Form(None)
+):
+    """
+    Extract biomarkers from several documents for one patient and merge them
+    
+    Accepts up to 5 PDF/TXT files (e.g. pathology report, oncology note,
+    molecular report). All documents are extracted concurrently, so latency
+    is roughly that of the slowest document.
+    
+    Returns:
+        {
+            "success": true,
+            "profile": {...PatientProfile...} or null,
+            "missing_fields": ["stage"],
+            "validation_errors": [],
+            "provenance": {"stage": {"source": "note.txt", "confidence": "high"}, ...},
+            "conflicts": [{"field": "biomarkers.HER2", "chosen": {...}, "values": [...]}],
+            "merged_biomarker_data": {...},
+            "documents": [{"filename": "...", "success": true, "cache_hit": false, ...}],
+            "processing_time_seconds": 3.4
+        }
+    
+    profile is null when a required field (age, sex, cancer type, stage)
+    wasn't found in any document; the merged data is still returned.
+    """
+    start_time = time.time()
+    
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Maximum is {MAX_BATCH_FILES} per request"
+        )
+    
+    uploads: List[Upload] = []
+    try:
+        for file in files:
+            if file.content_type not in ALLOWED_CONTENT_TYPES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unsupported file type for {file.filename}: {file.content_type}. Allowed: PDF, TXT"
+                )
+            uploads.append(await read_upload(file))
+        
+        results = await asyncio.gather(
+            *(extract_document(upload, cancer_type) for upload in uploads),
+            return_exceptions=True
+        )
+        return _merge_documents(uploads, results, start_time)
+    finally:
+        for upload in uploads:
+            upload.close()
+
+
+def _merge_documents(uploads: List[Upload], results: list, start_time: float) -> dict:
+    """Build the /extract-patient-profile response from per-document pipeline results"""
+    documents = []
+    extracted = []
+    failures = []
+    for upload, result in zip(uploads, results):
+        filename = upload.filename
+        if isinstance(result, AdmissionRejected):
+            raise result
+        if isinstance(result, BaseException):
+            logger.warning(f"Extraction failed for {filename}: {result}")
+            failures.append(result)
+            documents.append({"filename": filename, "success": False, "error": str(result)})
+            continue
+        extracted.append((filename, result["biomarker_data"]))
+        documents.append({
+            "filename": filename,
+            "success": True,
+            "cache_hit": result["cache_hit"],
+            "extraction_method": result["biomarker_data"].get("extraction_method")
+        })
+    
+    if not extracted:
+        error = failures[0]
+        if isinstance(error, LLMUnavailable):
+            raise HTTPException(
+                status_code=503,
+                detail=f"Biomarker extraction temporarily unavailable: {error.reason}",
+                headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+            )
+        if isinstance(error, ValueError):
+            raise HTTPException(status_code=400, detail=str(error))
+        raise HTTPException(status_code=500, detail=f"Error processing documents: {str(error)}")
+    
+    merged = build_patient_profile(extracted)
+    processing_time = time.time() - start_time
+    logger.info(
+        f"Merged {len(extracted)}/{len(uploads)} documents in {processing_time:.2f} seconds "
+        f"({len(merged['conflicts'])} conflicts)"
+    )
+    
+    return {
+        "success": True,
+        **merged,
+        "documents": documents,
+        "processing_time_seconds": round(processing_time, 2)
+    }
 
 
 @router.post("/extract-text-only")
 async def extract_text_only(file: UploadFile = File(...)):
     """
     Extract raw text from document without biomarker extraction
-    Useful for debugging or preview
+    Useful for debugging or preview; for PDFs, "pages" lists each page's
+    extractor, character count and extraction time
     """
     try:
-        document_extractor = DocumentExtractor()
-        raw_text = await document_extractor.extract_text(file)
+        with await read_upload(file) as upload:
+            raw_text, pages = await get_lane("extraction").run(
+                DocumentExtractor.extract_text_with_pages, upload.source, upload.content_type
+            )
         
         return {
             "success": True,
             "text": raw_text,
             "char_count": len(raw_text),
-            "line_count": len(raw_text.split('\n'))
+            "line_count": len(raw_text.split('\n')),
+            "pages": [page.timing() for page in pages]
         }
     
+    except (HTTPException, AdmissionRejected):
+        raise
+    
     except Exception as e:
         logger.error(f"Text extraction error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
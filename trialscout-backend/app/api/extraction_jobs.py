@@ -0,0 +1,93 @@
+"""
+API endpoints for asynchronous extraction jobs
+"""
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Header
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional
+from app.extractors.pipeline import ALLOWED_CONTENT_TYPES
+from app.jobs import extraction_jobs
+from app.uploads import read_upload
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/extraction-jobs", tags=["extraction"])
+
+
+def _links(job_id: str) -> dict:
+    return {
+        "status_url": f"/api/v1/extraction-jobs/{job_id}",
+        "events_url": f"/api/v1/extraction-jobs/{job_id}/events",
+    }
+
+
+@router.post("", status_code=202)
+async def submit_extraction_job(
+    file: UploadFile = File(...),
+    cancer_type: Optional[str] = Form(None)
+):
+    """
+    Queue biomarker extraction for an uploaded report
+
+    Accepts the same upload as /api/v1/extract-biomarkers but returns at
+    once; poll the status URL or subscribe to the events URL for progress.
+
+    Returns:
+        {"job_id": "...", "status": "queued", "status_url": "...", "events_url": "..."}
+    """
+    if file.content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type: {file.content_type}. Allowed: PDF, TXT"
+        )
+
+    # Copied from the request's spool into the job's payload file
+    with await read_upload(file) as upload:
+        job = await extraction_jobs.submit(upload, cancer_type)
+    logger.info(f"Queued extraction job {job['job_id']} for {file.filename}")
+
+    links = _links(job["job_id"])
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job["job_id"], "status": job["status"], **links},
+        headers={"Location": links["status_url"]}
+    )
+
+
+@router.get("/{job_id}")
+async def get_extraction_job(job_id: str):
+    """
+    Job status, progress events and (once succeeded) the extraction result
+
+    status is one of queued, running, succeeded, failed; result has the
+    same biomarker_data / raw_text / cache_hit fields as the synchronous
+    endpoint.
+    """
+    job = await extraction_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Extraction job {job_id} not found")
+    return job
+
+
+@router.get("/{job_id}/events")
+async def stream_extraction_job_events(
+    job_id: str,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-sent progress events for a job
+
+    Replays recorded stages (queued, started, text_extracted, llm_started,
+    parsed, done) and follows the job until it finishes; the final event is
+    `succeeded` or `failed` with the full job. Reconnects resume after the
+    Last-Event-ID header.
+    """
+    if await extraction_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Extraction job {job_id} not found")
+
+    resume_after = int(last_event_id) if last_event_id and last_event_id.isdigit() else -1
+    return StreamingResponse(
+        extraction_jobs.stream(job_id, resume_after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
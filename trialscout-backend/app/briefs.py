@@ -0,0 +1,311 @@
+"""
+Clinician brief rendering and cache
+
+Briefs are rendered by the shared process pool, admitted through the
+rendering lane, so ReportLab layout never holds the GIL the event loop
+needs. Finished PDFs are cached in memory under a hash of the patient
+profile, the selected trials, top_n, the catalog version and the date
+printed on the brief; regenerating the same brief is a lookup, and
+identical concurrent requests share one render.
+
+Bulk requests (a clinic list at once) stream a ZIP archive: up to
+brief_bulk_concurrency renders are in the process pool at a time, and each
+PDF is written to the response as soon as it finishes, so memory stays
+bounded by that window rather than by the size of the list.
+"""
+import asyncio
+import json
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.catalog import catalog
+from app.config import settings
+from app.data.constants import DATASET_VERSION
+from app.fingerprint import fingerprint
+from app.lanes import get_lane, get_process_pool, process_pool_workers, reset_process_pool
+from app.metrics import cache_hit_ratio, counter
+from app.models.matching import MatchResult
+from app.models.patient import PatientProfile
+from app.singleflight import SingleFlight
+import logging
+
+logger = logging.getLogger(__name__)
+
+brief_cache_requests = counter(
+    "trialscout_brief_cache_requests_total",
+    "Clinician brief cache lookups by result",
+    ("result",),
+)
+cache_hit_ratio.track("brief", brief_cache_requests)
+bulk_brief_items = counter(
+    "trialscout_bulk_brief_items_total",
+    "Briefs in bulk ZIP requests, by outcome",
+    ("outcome",),
+)
+
+
+@dataclass
+class RenderedBrief:
+    pdf: bytes
+    generated_at: str  # ISO timestamp of the render
+
+
+def brief_key(
+    patient_profile: PatientProfile,
+    trials: List[MatchResult],
+    top_n: int,
+    dataset_version: str,
+    generated_on: date,
+) -> str:
+    """Cache key for one brief: everything that ends up in the PDF"""
+    return fingerprint(
+        patient_profile,
+        [trial.model_dump(mode="json") for trial in trials],
+        top_n,
+        dataset_version,
+        generated_on.isoformat(),
+    )
+
+
+class BriefCache:
+    """Size-bounded in-memory LRU of rendered briefs"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, RenderedBrief]" = OrderedDict()
+        self._total_bytes = 0
+
+    def get(self, key: str) -> Optional[RenderedBrief]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                brief_cache_requests.inc(result="miss")
+                return None
+            self._entries.move_to_end(key)
+        brief_cache_requests.inc(result="hit")
+        return entry
+
+    def put(self, key: str, entry: RenderedBrief) -> None:
+        if len(entry.pdf) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= len(previous.pdf)
+            self._entries[key] = entry
+            self._total_bytes += len(entry.pdf)
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted.pdf)
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+brief_cache = BriefCache(settings.brief_cache_max_mb * 1024 * 1024)
+brief_flight = SingleFlight("brief")
+
+
+def render_brief_pdf(
+    patient_profile: PatientProfile,
+    trials: List[MatchResult],
+    top_n: int,
+    generated_on: date,
+    catalog_version: str,
+) -> bytes:
+    """Render a brief in a worker process (blocking; call from the rendering lane)"""
+    from app.pdf_generator import render_brief  # ReportLab loads with the first brief
+
+    args = (patient_profile, trials, top_n, DATASET_VERSION, generated_on, catalog_version)
+    if settings.brief_process_pool_enabled:
+        try:
+            return get_process_pool().submit(render_brief, *args).result()
+        except BrokenProcessPool:
+            logger.warning("Brief worker process died; rendering in-process")
+            reset_process_pool()
+    return render_brief(*args)
+
+
+async def render_brief_pdf_bulk(
+    patient_profile: PatientProfile,
+    trials: List[MatchResult],
+    top_n: int,
+    generated_on: date,
+    catalog_version: str,
+) -> bytes:
+    """Render a brief straight in the process pool, without holding a lane thread
+
+    The caller bounds how many of these are in flight.
+    """
+    from app.pdf_generator import render_brief
+
+    args = (patient_profile, trials, top_n, DATASET_VERSION, generated_on, catalog_version)
+    if settings.brief_process_pool_enabled:
+        try:
+            return await asyncio.wrap_future(get_process_pool().submit(render_brief, *args))
+        except BrokenProcessPool:
+            logger.warning("Brief worker process died; rendering in the rendering lane")
+            reset_process_pool()
+    return await get_lane("rendering").run(render_brief, *args)
+
+
+async def get_brief(
+    patient_profile: PatientProfile,
+    matched_trials: List[MatchResult],
+    top_n: int,
+    bulk: bool = False,
+) -> Tuple[RenderedBrief, bool]:
+    """Return (brief, cache_hit) for the top_n of matched_trials
+
+    bulk=True renders through render_brief_pdf_bulk instead of the rendering
+    lane, and reads the brief cache without filling it, so a clinic list
+    doesn't push out briefs clinicians are working with.
+    """
+    trials = matched_trials[:top_n]
+    generated_on = date.today()
+    catalog_version = catalog.version
+    key = brief_key(patient_profile, trials, top_n, catalog_version, generated_on)
+
+    cached = brief_cache.get(key)
+    if cached is not None:
+        return cached, True
+
+    async def render() -> RenderedBrief:
+        if bulk:
+            pdf = await render_brief_pdf_bulk(patient_profile, trials, top_n, generated_on, catalog_version)
+        else:
+            pdf = await get_lane("rendering").run(
+                render_brief_pdf, patient_profile, trials, top_n, generated_on, catalog_version
+            )
+        entry = RenderedBrief(pdf, datetime.now().isoformat())
+        if not bulk:
+            brief_cache.put(key, entry)
+        return entry
+
+    return await brief_flight.do(key, render), False
+
+
+@dataclass
+class BulkBriefSource:
+    """One brief of a bulk request, with its source already resolved"""
+    label: Optional[str]
+    match_id: Optional[str]
+    patient_profile: PatientProfile
+    matched_trials: List[MatchResult]
+    top_n: int
+
+
+class _ZipSink:
+    """Write-only file for ZipFile that hands out what was written so far
+
+    It has no tell() or seek(), so ZipFile writes each entry with a trailing
+    data descriptor and never goes back into bytes already sent.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def bulk_brief_filename(index: int, width: int, label: Optional[str]) -> str:
+    """Archive member name: input position first, so the list order survives"""
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", label or "").strip("._")[:60]
+    return f"{index + 1:0{width}d}_{slug or 'patient'}.pdf"
+
+
+async def stream_bulk_briefs(items: List[BulkBriefSource]) -> AsyncIterator[bytes]:
+    """Yield a ZIP archive of briefs for items, one chunk per finished PDF
+
+    PDFs are added in completion order; members are numbered by input
+    position, and manifest.json (written last) lists every item with its
+    file name, or the error if its brief could not be rendered. PDFs are
+    already compressed, so members are stored rather than deflated.
+    """
+    concurrency = settings.brief_bulk_concurrency or process_pool_workers()
+    width = len(str(len(items)))
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED)
+    manifest: List[Dict[str, Any]] = []
+    queued = iter(enumerate(items))
+    pending = set()
+
+    async def one(index: int, item: BulkBriefSource):
+        try:
+            return index, await get_brief(item.patient_profile, item.matched_trials, item.top_n, bulk=True)
+        except Exception as e:
+            logger.error(f"Bulk brief {index + 1} failed: {e}")
+            return index, e
+
+    try:
+        while True:
+            while len(pending) < concurrency:
+                queued_item = next(queued, None)
+                if queued_item is None:
+                    break
+                pending.add(asyncio.ensure_future(one(*queued_item)))
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, outcome = task.result()
+                item = items[index]
+                entry: Dict[str, Any] = {"index": index + 1, "label": item.label, "match_id": item.match_id}
+                if isinstance(outcome, Exception):
+                    bulk_brief_items.inc(outcome="error")
+                    entry["error"] = str(outcome) or type(outcome).__name__
+                else:
+                    brief, cache_hit = outcome
+                    bulk_brief_items.inc(outcome="cached" if cache_hit else "rendered")
+                    entry["filename"] = bulk_brief_filename(index, width, item.label)
+                    entry["trials"] = min(item.top_n, len(item.matched_trials))
+                    entry["cache_hit"] = cache_hit
+                    info = zipfile.ZipInfo(entry["filename"], datetime.now().timetuple()[:6])
+                    archive.writestr(info, brief.pdf)
+                manifest.append(entry)
+                yield sink.take()
+
+        manifest.sort(key=lambda entry: entry["index"])
+        archive.writestr(
+            zipfile.ZipInfo("manifest.json", datetime.now().timetuple()[:6]),
+            json.dumps({
+                "generated_at": datetime.now().isoformat(),
+                "catalog_version": catalog.version,
+                "dataset_version": DATASET_VERSION,
+                "briefs": manifest,
+            }, indent=2),
+        )
+        archive.close()
+        yield sink.take()
+    finally:
+        for task in pending:
+            task.cancel()
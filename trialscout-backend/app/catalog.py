@@ -0,0 +1,275 @@
+"""
+In-process trial catalog cache
+
+Holds the validated Trial objects and summary stats so that read paths
+(health probes, matching, trial lookups) don't query the database on every
+request.
+
+The catalog is an immutable CatalogSnapshot. A reload (after a write
+endpoint commits, from POST /api/v1/admin/catalog/reload, or when the
+trials table changes and CATALOG_WATCH_INTERVAL_SECONDS is set) builds a
+complete new snapshot off to the side and then swaps one reference, so
+requests never see a half-built catalog. A request takes the snapshot once
+and uses it to the end: in-flight matches finish against the trials they
+started with, and their dataset_version names that snapshot. Data changes
+no longer need a restart; code changes (matching rules) still do.
+
+Changes are detected with the trial revision, a counter in the
+catalog_revision table that SQLite triggers bump on every insert, update
+or delete on trials (app/models/catalog_revision_db.py). Writes to other
+tables (extraction jobs, ...) never make the catalog stale.
+
+With a file-backed SQLite database, each rebuild is also written to a
+memory-mapped snapshot file (app/catalog_file.py). A worker that starts,
+or reloads after another worker already did, maps that file instead of
+reading the trials table, as long as it was built at the current trial
+revision; workers serving the same file report the same catalog_version.
+"""
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.catalog_file import MappedCatalog, open_snapshot, write_snapshot
+from app.config import settings
+from app.data.constants import DATASET_VERSION
+from app.database import SessionLocal, engine
+from app.lanes import get_lane
+from app.metrics import counter
+from app.models.catalog_revision_db import read_revision
+from app.models.trial import Trial
+from app.models.trial_db import TrialDB
+import logging
+
+logger = logging.getLogger(__name__)
+
+catalog_reloads = counter(
+    "trialscout_catalog_reloads_total",
+    "Catalog snapshot rebuilds by trigger and outcome",
+    ("trigger", "outcome"),
+)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """One compiled, read-only version of the trials table"""
+    revision: int
+    trials: Sequence[Trial]
+    by_nct: Mapping[str, Trial]
+    stats: Dict
+    trial_revision: Optional[int] = field(default=None, compare=False)
+
+    @property
+    def version(self) -> str:
+        """Dataset version plus snapshot revision, e.g. '1.0+r3'"""
+        return f"{DATASET_VERSION}+r{self.revision}"
+
+
+def _file_backed() -> bool:
+    """True for a SQLite database in a file (shared by every worker process)"""
+    url = engine.url
+    return url.get_backend_name() == "sqlite" and bool(url.database) and url.database != ":memory:"
+
+
+def trial_revision() -> Optional[int]:
+    """The trials table's change counter, or None if the database doesn't track it"""
+    if not _file_backed():
+        return None
+    try:
+        with engine.connect() as connection:
+            return read_revision(connection)
+    except SQLAlchemyError:
+        return None  # counter table not created yet
+
+
+def snapshot_path() -> Optional[str]:
+    """Where the shared snapshot file lives, or None when it is disabled or unsupported"""
+    if not settings.catalog_snapshot_enabled or not _file_backed():
+        return None
+    return settings.catalog_snapshot_path or engine.url.database + ".catalog"
+
+
+class CatalogCache:
+    """Compiled, in-memory copy of the trials table, swapped atomically on reload"""
+
+    def __init__(self):
+        # Serialises rebuilds, so an older read can't be swapped in after a
+        # newer one; readers never take it
+        self._refresh_lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._revision = 0
+
+    @property
+    def is_warm(self) -> bool:
+        """True once the catalog has been loaded and compiled"""
+        return self._snapshot is not None
+
+    @property
+    def current(self) -> Optional[CatalogSnapshot]:
+        """The current snapshot, or None before the first load"""
+        return self._snapshot
+
+    @property
+    def revision(self) -> int:
+        """Incremented on every refresh, used to key derived caches"""
+        return self._revision
+
+    @property
+    def version(self) -> str:
+        """Dataset version plus cache revision, e.g. '1.0+r3'"""
+        return f"{DATASET_VERSION}+r{self._revision}"
+
+    def refresh(self, db: Session, trigger: str = "write") -> CatalogSnapshot:
+        """Build a new snapshot (or map a matching shared one) and swap it in"""
+        with self._refresh_lock:
+            trial_rev = trial_revision()  # taken first: a write during the read triggers another reload
+            path = snapshot_path()
+            shared = open_snapshot(path) if path else None
+            shared_revision = shared.metadata.get("revision", 0) if shared else 0
+            if shared is not None and not self._is_current(shared, trial_rev):
+                shared = None
+
+            if shared is not None:
+                # Another worker already compiled this trial revision
+                snapshot = self._from_file(shared, trial_rev)
+                outcome = "mapped"
+            else:
+                try:
+                    db_trials = db.query(TrialDB).all()
+                    trials = [Trial(**trial.to_dict()) for trial in db_trials]
+                except Exception:
+                    catalog_reloads.inc(trigger=trigger, outcome="error")
+                    raise
+                snapshot = self._build(trials, max(self._revision, shared_revision) + 1, trial_rev, path)
+                outcome = "ok"
+            # The swap: requests holding the previous snapshot keep using it
+            self._snapshot = snapshot
+            self._revision = snapshot.revision
+
+        catalog_reloads.inc(trigger=trigger, outcome=outcome)
+        logger.info(
+            f"Catalog refreshed ({trigger}): {snapshot.stats['total_trials']} trials "
+            f"(revision {snapshot.revision}{', mapped from ' + path if outcome == 'mapped' else ''})"
+        )
+        return snapshot
+
+    def _is_current(self, shared: MappedCatalog, trial_rev: Optional[int]) -> bool:
+        """True if a snapshot file was built at the current trial revision and is newer than ours"""
+        meta = shared.metadata
+        return (
+            meta.get("dataset_version") == DATASET_VERSION
+            and meta.get("trial_revision") == trial_rev
+            and meta.get("revision", 0) > self._revision
+        )
+
+    def _from_file(self, shared: MappedCatalog, trial_rev: Optional[int]) -> CatalogSnapshot:
+        return CatalogSnapshot(
+            revision=shared.metadata["revision"],
+            trials=shared,
+            by_nct=shared.by_nct,
+            stats=shared.stats(),
+            trial_revision=trial_rev,
+        )
+
+    def _build(self, trials, revision: int, trial_rev: Optional[int], path: Optional[str]) -> CatalogSnapshot:
+        """Compile trials into a snapshot, sharing it through the snapshot file when enabled"""
+        built_at = datetime.now().isoformat()
+        if path:
+            try:
+                write_snapshot(path, trials, {
+                    "dataset_version": DATASET_VERSION,
+                    "revision": revision,
+                    "trial_revision": trial_rev,
+                    "built_at": built_at,
+                })
+                shared = open_snapshot(path)
+                if shared is not None and shared.metadata.get("revision") == revision:
+                    shared.prime(trials)  # this worker already has them decoded
+                    return self._from_file(shared, trial_rev)
+            except Exception as e:
+                logger.warning(f"Could not write catalog snapshot {path}: {e}; serving from memory")
+
+        by_cancer_type: Dict[str, int] = {}
+        for trial in trials:
+            key = trial.cancer_type.value
+            by_cancer_type[key] = by_cancer_type.get(key, 0) + 1
+        return CatalogSnapshot(
+            revision=revision,
+            trials=trials,
+            by_nct={t.nct_number: t for t in trials},
+            stats={
+                "total_trials": len(trials),
+                "trials_by_cancer_type": by_cancer_type,
+                "last_updated": built_at,
+            },
+            trial_revision=trial_rev,
+        )
+
+    def reload(self, trigger: str = "admin") -> CatalogSnapshot:
+        """Rebuild the snapshot with a short-lived session (blocking; run it in a lane)"""
+        db = SessionLocal()
+        try:
+            return self.refresh(db, trigger)
+        finally:
+            db.close()
+
+    def warm(self) -> None:
+        """Load the catalog with a short-lived session (startup / cold paths)"""
+        self.reload("startup")
+
+    def snapshot(self, db: Session) -> CatalogSnapshot:
+        """The current snapshot, loading it on first use; hold on to it for the whole request"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh(db, "first_use")
+        return snapshot
+
+    def get_trials(self, db: Session) -> Sequence[Trial]:
+        """Return the cached trials, loading them on first use"""
+        return self.snapshot(db).trials
+
+    def get_versioned(self, db: Session) -> Tuple[str, Sequence[Trial]]:
+        """Return (version, trials) from the same snapshot"""
+        snapshot = self.snapshot(db)
+        return snapshot.version, snapshot.trials
+
+    def get_trial(self, db: Session, nct_number: str) -> Optional[Trial]:
+        """Look up a single trial by NCT number"""
+        return self.snapshot(db).by_nct.get(nct_number)
+
+    def stats(self) -> Dict:
+        """Cached summary stats (empty until the catalog is warm)"""
+        snapshot = self._snapshot
+        return dict(snapshot.stats) if snapshot else {}
+
+    def is_stale(self) -> bool:
+        """True if trials changed since the current snapshot was built"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.trial_revision is None:
+            return False
+        return trial_revision() != snapshot.trial_revision
+
+    async def watch(self, interval: float) -> None:
+        """Reload whenever the trial revision changes (runs until cancelled)"""
+        # Both checks query the database: keep them off the event loop
+        if await run_in_threadpool(trial_revision) is None:
+            logger.warning("Catalog watch needs a file-backed SQLite database; not watching")
+            return
+        logger.info(f"Watching the catalog database for changes every {interval:g}s")
+        while True:
+            await asyncio.sleep(interval)
+            if not await run_in_threadpool(self.is_stale):
+                continue
+            try:
+                await get_lane("bulk").run(self.reload, "watch")
+            except Exception as e:
+                # Keep serving the previous snapshot; retried on the next poll
+                logger.error(f"Catalog reload after trial change failed: {e}")
+
+
+catalog = CatalogCache()
@@ -0,0 +1,231 @@
+"""
+Shared catalog snapshot file
+
+The compiled catalog is written to one versioned binary file that every
+uvicorn worker memory-maps read-only, so only the first worker (or a
+reload) reads and validates the trials table; the others map the file in
+milliseconds and share its pages through the OS page cache.
+
+Layout (little-endian):
+
+    header    magic, format, record count, and the offset/size of each section
+    records   one fixed-width record per trial: enum codes for cancer type,
+              status, phase, eligibility score and match confidence, the
+              distance, and (offset, length) pairs into the heaps below
+    strings   UTF-8 heap holding each trial's id and NCT number
+    json      UTF-8 heap holding each trial as a self-contained JSON
+              document, plus the snapshot metadata
+
+Scalar fields and NCT lookups are served straight from the mapping. A
+Trial is decoded (one validate_json call) the first time it is used and
+then kept by that worker. The metadata records the revision, the dataset
+version, the enum code tables and the trial revision (the trials table's
+change counter) the snapshot was built at; a file that doesn't match is
+ignored and rebuilt.
+"""
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, get_args
+
+from app.models.patient import CancerType
+from app.models.trial import Trial
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TSCATLG\0"
+FORMAT_VERSION = 1
+
+# magic, format, record count, then (offset, size) of records, strings, json and the metadata
+_HEADER = struct.Struct("<8sII8Q")
+# cancer type, status, phase, eligibility score, match confidence, distance,
+# then (offset, length) of id and NCT number in the string heap and of the
+# trial document in the json heap
+_RECORD = struct.Struct("<5B3xI6I")
+
+# Enum code tables, in declaration order; stored in the metadata so a file
+# written before a model change is never decoded with the wrong codes
+CODE_TABLES: Dict[str, List[str]] = {
+    "cancer_type": [member.value for member in CancerType],
+    "status": list(get_args(Trial.model_fields["status"].annotation)),
+    "phase": list(get_args(Trial.model_fields["phase"].annotation)),
+    "eligibility_score": list(get_args(Trial.model_fields["eligibility_score"].annotation)),
+    "match_confidence": list(get_args(Trial.model_fields["match_confidence"].annotation)),
+}
+_CODES = {name: {value: code for code, value in enumerate(values)} for name, values in CODE_TABLES.items()}
+
+
+def write_snapshot(path: str, trials: List[Trial], metadata: Dict[str, Any]) -> None:
+    """Write trials and metadata to path atomically (temp file + rename)"""
+    records = bytearray()
+    strings = bytearray()
+    documents = bytearray()
+
+    def put(heap: bytearray, data: bytes):
+        offset = len(heap)
+        heap.extend(data)
+        return offset, len(data)
+
+    for trial in trials:
+        records.extend(_RECORD.pack(
+            _CODES["cancer_type"][trial.cancer_type.value],
+            _CODES["status"][trial.status],
+            _CODES["phase"][trial.phase],
+            _CODES["eligibility_score"][trial.eligibility_score],
+            _CODES["match_confidence"][trial.match_confidence],
+            trial.distance,
+            *put(strings, trial.id.encode("utf-8")),
+            *put(strings, trial.nct_number.encode("utf-8")),
+            *put(documents, trial.model_dump_json().encode("utf-8")),
+        ))
+    meta = json.dumps(dict(metadata, codes=CODE_TABLES)).encode("utf-8")
+
+    records_at = _HEADER.size
+    strings_at = records_at + len(records)
+    json_at = strings_at + len(strings)
+    meta_at = json_at + len(documents)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(trials),
+        records_at, len(records), strings_at, len(strings), json_at, len(documents), meta_at, len(meta),
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".catalog-", dir=directory)
+    try:
+        os.fchmod(fd, 0o644)  # mkstemp creates it owner-only
+        with os.fdopen(fd, "wb") as f:
+            for part in (header, records, strings, documents, meta):
+                f.write(part)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)  # workers mapping the old file keep their mapping
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class MappedCatalog(Sequence):
+    """Read-only view of a snapshot file; a sequence of Trial decoded on first access"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self._count, records_at, records_size, self._strings_at, _,
+             self._json_at, _, meta_at, meta_size) = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a format {FORMAT_VERSION} catalog snapshot")
+            if records_size != self._count * _RECORD.size:
+                raise ValueError(f"{path} is truncated or corrupt")
+            self.metadata: Dict[str, Any] = json.loads(self._map[meta_at:meta_at + meta_size])
+            if self.metadata.get("codes") != CODE_TABLES:
+                raise ValueError(f"{path} was written with different trial enums")
+        except Exception:
+            self._map.close()
+            raise
+        self._records = memoryview(self._map)[records_at:records_at + records_size]
+        self._trials: List[Optional[Trial]] = [None] * self._count
+        self._by_nct: Optional[NctIndex] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, index: int):
+        return _RECORD.unpack_from(self._records, index * _RECORD.size)
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_at + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        trial = self._trials[index]
+        if trial is None:
+            *_, doc_offset, doc_length = self._record(index)
+            start = self._json_at + doc_offset
+            trial = Trial.model_validate_json(self._map[start:start + doc_length])
+            self._trials[index] = trial
+        return trial
+
+    def __iter__(self) -> Iterator[Trial]:
+        for index in range(self._count):
+            yield self[index]
+
+    def cancer_type(self, index: int) -> str:
+        """Cancer type of one trial, without decoding it"""
+        return CODE_TABLES["cancer_type"][self._record(index)[0]]
+
+    def of_cancer_type(self, cancer_type: str) -> List[Trial]:
+        """Trials of one cancer type, selected from the fixed-width records; only those are decoded"""
+        code = _CODES["cancer_type"].get(cancer_type)
+        return [self[index] for index in range(self._count) if self._record(index)[0] == code]
+
+    @property
+    def by_nct(self) -> "NctIndex":
+        """Trials keyed by NCT number; the index is built from the string heap on first use"""
+        if self._by_nct is None:
+            by_nct = {}
+            for index in range(self._count):
+                record = self._record(index)
+                by_nct[self._string(record[8], record[9])] = index
+            self._by_nct = NctIndex(self, by_nct)
+        return self._by_nct
+
+    def stats(self) -> Dict[str, Any]:
+        """Record count and counts by cancer type, from the fixed-width records"""
+        by_cancer_type: Dict[str, int] = {}
+        for index in range(self._count):
+            key = CODE_TABLES["cancer_type"][self._record(index)[0]]
+            by_cancer_type[key] = by_cancer_type.get(key, 0) + 1
+        return {
+            "total_trials": self._count,
+            "trials_by_cancer_type": by_cancer_type,
+            "last_updated": self.metadata.get("built_at"),
+        }
+
+    def prime(self, trials: List[Trial]) -> None:
+        """Adopt already-decoded trials, in file order (used by the worker that wrote the file)"""
+        if len(trials) == self._count:
+            self._trials = list(trials)
+
+    def decoded(self) -> int:
+        """How many trials this worker has decoded so far"""
+        return sum(trial is not None for trial in self._trials)
+
+
+class NctIndex(Mapping):
+    """NCT number -> Trial view over a MappedCatalog"""
+
+    def __init__(self, trials: MappedCatalog, positions: Dict[str, int]):
+        self._trials = trials
+        self._positions = positions
+
+    def __getitem__(self, nct_number: str) -> Trial:
+        return self._trials[self._positions[nct_number]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+def open_snapshot(path: str) -> Optional[MappedCatalog]:
+    """Map path if it holds a usable snapshot; None if it is missing or unreadable"""
+    try:
+        return MappedCatalog(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, struct.error) as e:
+        logger.warning(f"Ignoring catalog snapshot {path}: {e}")
+        return None
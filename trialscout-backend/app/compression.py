@@ -0,0 +1,232 @@
+"""
+Response compression middleware
+
+Negotiates gzip or brotli on Accept-Encoding and compresses buffered
+responses above a size threshold. Large bodies are compressed in a worker
+thread so the event loop keeps serving other requests. Routes can carry
+their own policy (e.g. the clinician brief, whose base64 PDF payload barely
+compresses and is expensive to squeeze hard).
+"""
+import gzip
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import counter
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+# Content types that are already compressed or must be streamed as-is
+UNCOMPRESSIBLE_TYPES = (
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "image/",
+    "text/event-stream",
+)
+
+compression_responses = counter(
+    "trialscout_compression_responses_total",
+    "Responses by negotiated content encoding",
+    ("encoding",),
+)
+compression_bytes_in = counter(
+    "trialscout_compression_bytes_in_total",
+    "Uncompressed body bytes of responses that were compressed",
+    ("encoding",),
+)
+compression_bytes_out = counter(
+    "trialscout_compression_bytes_out_total",
+    "Bytes on the wire after compression",
+    ("encoding",),
+)
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """How responses on a route are compressed"""
+    min_size: int
+    gzip_level: int
+    brotli_quality: int
+    enabled: bool = True
+
+
+def default_policies() -> Dict[str, CompressionPolicy]:
+    """Per-path-prefix policies built from settings ("" is the fallback)"""
+    return {
+        "": CompressionPolicy(
+            min_size=settings.compression_min_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+            enabled=settings.compression_enabled,
+        ),
+        # Base64 PDF only shrinks by ~25%, so trade ratio for speed
+        "/api/brief": CompressionPolicy(
+            min_size=settings.compression_brief_min_size,
+            gzip_level=1,
+            brotli_quality=1,
+            enabled=settings.compression_enabled,
+        ),
+    }
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header, honouring q-values"""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+
+    wildcard = accepted.get("*", 0.0)
+    candidates: List[Tuple[float, int, str]] = []
+    if brotli is not None:
+        candidates.append((accepted.get("br", wildcard), 1, "br"))
+    candidates.append((accepted.get("gzip", wildcard), 0, "gzip"))
+    q, _, encoding = max(candidates)
+    return encoding if q > 0 else None
+
+
+def compress_body(body: bytes, encoding: str, policy: CompressionPolicy) -> bytes:
+    """Compress a complete response body"""
+    if encoding == "br":
+        return brotli.compress(body, quality=policy.brotli_quality)
+    return gzip.compress(body, compresslevel=policy.gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """ASGI middleware applying size-aware gzip/brotli compression"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        policies: Optional[Dict[str, CompressionPolicy]] = None,
+        offload_size: Optional[int] = None,
+    ):
+        self.app = app
+        self.policies = policies or default_policies()
+        self.offload_size = offload_size if offload_size is not None else settings.compression_offload_size
+        # Longest prefix first so specific routes win over the fallback
+        self._prefixes = sorted(self.policies, key=len, reverse=True)
+
+    def _policy_for(self, path: str) -> CompressionPolicy:
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return self.policies[prefix]
+        return self.policies[""]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        policy = self._policy_for(scope["path"])
+        encoding = None
+        if policy.enabled:
+            encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            compression_responses.inc(encoding="identity")
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self.app, encoding, policy, self.offload_size)
+        await responder(scope, receive, send)
+
+
+class _CompressingResponder:
+    """Buffers a single response and decides whether to compress it"""
+
+    def __init__(self, app: ASGIApp, encoding: str, policy: CompressionPolicy, offload_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.policy = policy
+        self.offload_size = offload_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.started = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or content_type.startswith(UNCOMPRESSIBLE_TYPES):
+                self.passthrough = True
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough or self.started:
+            await self._start_identity()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        if message.get("more_body", False):
+            # Streaming responses (SSE, ZIP, chunked PDFs) go out untouched
+            await self._start_identity()
+            await self.send(message)
+            return
+
+        if len(body) < self.policy.min_size:
+            await self._start_identity()
+            await self.send(message)
+            return
+
+        if len(body) >= self.offload_size:
+            compressed = await anyio.to_thread.run_sync(compress_body, body, self.encoding, self.policy)
+        else:
+            compressed = compress_body(body, self.encoding, self.policy)
+
+        if len(compressed) >= len(body):
+            await self._start_identity()
+            await self.send(message)
+            return
+
+        compression_responses.inc(encoding=self.encoding)
+        compression_bytes_in.inc(len(body), encoding=self.encoding)
+        compression_bytes_out.inc(len(compressed), encoding=self.encoding)
+
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        headers.add_vary_header("Accept-Encoding")
+        self.started = True
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    async def _start_identity(self) -> None:
+        if self.started:
+            return
+        self.started = True
+        compression_responses.inc(encoding="identity")
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        await self.send(self.start_message)
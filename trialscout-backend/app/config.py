@@ -1,3 +1,4 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from typing import List
 
@@ -18,12 +19,114 @@ class Settings(BaseSettings):
     
     # Other settings
     cors_origins: List[str] = ["*"]  # Allow all origins for development
-    rate_limit_per_hour: int = 100
+    rate_limit_per_hour: int = 100  # expensive routes (match, extraction, bulk import) per client
+    
+    # Rate limiting and admission control
+    rate_limit_enabled: bool = True
+    rate_limit_expensive_burst: int = 20
+    rate_limit_cheap_per_minute: int = 600
+    rate_limit_cheap_burst: int = 100
+    rate_limit_trust_forwarded: bool = False  # use X-Forwarded-For behind a trusted proxy
+    rate_limit_redis_url: str = ""  # e.g. redis://localhost:6379/0 to share buckets across workers
+    admission_max_concurrency: int = 8  # concurrent requests per expensive route
+    admission_max_queue: int = 32  # waiting requests per expensive route before 429
+    
+    # Execution lanes: worker threads and max queued tasks per lane
+    lane_interactive_workers: int = 4
+    lane_interactive_queue: int = 64
+    lane_extraction_workers: int = 4
+    lane_extraction_queue: int = 32
+    lane_rendering_workers: int = 2
+    lane_rendering_queue: int = 16
+    lane_bulk_workers: int = 1
+    lane_bulk_queue: int = 4
+    process_pool_workers: int = 0  # CPU-bound work (PDF parsing, briefs); 0 = one per CPU
+    interactive_latency_slo_ms: int = 250  # p95 target for /api/v1/match under mixed load
     dataset_version: str = "1.0"
+    catalog_watch_interval_seconds: float = 0  # reload the catalog when the trials table changes; 0 = off
+    catalog_snapshot_enabled: bool = True  # share the compiled catalog between workers via a mapped file
+    catalog_snapshot_path: str = ""  # default: next to the SQLite database, "<db>.catalog"
+
+    # Metrics: match stage timings are recorded for 1 in N match requests (1 = every request)
+    match_stage_sample_every: int = 16
+    
+    # Response compression (gzip always; brotli when the brotli package is installed)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024  # bytes; smaller bodies go out uncompressed
+    compression_offload_size: int = 64 * 1024  # compress in a worker thread above this size
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_brief_min_size: int = 256 * 1024  # base64 PDF briefs: only compress large ones
+    
+    # Uploads: files up to this size are parsed from memory; larger ones straight from the request's spool file
+    upload_spool_bytes: int = 1024 * 1024
+    
+    # Match results are kept under a match_id for briefs, paging and the walkthrough
+    match_store_max_entries: int = 1000
+    match_store_ttl_seconds: int = 3600
+    
+    # Clinician briefs
+    brief_process_pool_enabled: bool = True  # Render briefs in worker processes instead of lane threads
+    brief_cache_max_mb: int = 64  # In-memory cache of rendered briefs
+    brief_fragment_cache_enabled: bool = True  # Reuse per-trial title/details/location/burden flowables
+    brief_fragment_cache_size: int = 2000  # Trials per worker process
+    brief_bulk_max_items: int = 500  # Briefs per bulk ZIP request
+    brief_bulk_concurrency: int = 0  # Bulk renders in flight per request; 0 = one per process pool worker
+    
+    # PDF text extraction
+    pdf_process_pool_enabled: bool = True  # Parse PDFs in worker processes instead of lane threads
+    pdf_pages_per_task: int = 16  # Larger PDFs are split into page ranges parsed in parallel
+    pdf_min_page_chars: int = 20  # Pages with less PyPDF2 text are re-read with pdfplumber
     
     # Anthropic API for document extraction
     anthropic_api_key: str = ""  # Required for document upload feature
+    anthropic_model: str = "claude-sonnet-4-20250514"
+    anthropic_base_url: str = ""  # Override the API endpoint, e.g. a local stand-in server for benchmarks
+    # Shared async LLM client
+    llm_max_concurrency: int = 8  # In-flight LLM calls per process
+    llm_max_connections: int = 16  # Keep-alive pool size (room for hedges)
+    llm_timeout_seconds: float = 60.0
+    llm_hedge_enabled: bool = True
+    llm_hedge_percentile: float = 95.0  # Hedge calls still running past this latency percentile
+    llm_hedge_min_samples: int = 20  # ...once this many latencies have been observed
+    llm_hedge_min_delay_seconds: float = 1.0
+    llm_breaker_failure_threshold: int = 5  # Consecutive upstream failures before failing fast
+    llm_breaker_reset_seconds: float = 30.0
+    
+    extraction_fast_path: bool = True  # Deterministic rules first, LLM only for unresolved fields
+    extraction_slicing_enabled: bool = True  # Send only relevant report sections to the LLM
+    extraction_prompt_max_chars: int = 12000  # Budget for report text in the prompt (~3k tokens)
+    extraction_chunking_enabled: bool = False  # Split reports over one chunk (before slicing) and extract chunks concurrently
+    extraction_chunk_chars: int = 24000  # ~6k tokens per chunk
+    extraction_chunk_overlap_chars: int = 1000  # 0 <= overlap < extraction_chunk_chars
+    extraction_chunk_parallelism: int = 4  # Concurrent chunk calls per document (LLM_MAX_CONCURRENCY bounds all calls)
+    
+    # Extraction result cache (holds extracted patient data - keep the directory private)
+    extraction_cache_enabled: bool = True
+    extraction_cache_dir: str = "./.extraction_cache"
+    extraction_cache_max_mb: int = 256
     
+    # Asynchronous extraction jobs (queued in the database; uploads wait in payload files)
+    extraction_job_workers: int = 2  # Concurrent jobs per process
+    extraction_job_max_queued: int = 100  # Submissions beyond this answer 429
+    extraction_job_payload_dir: str = "./.extraction_jobs"  # Shared by every API process; holds patient documents - keep private
+    extraction_job_poll_seconds: float = 1.0  # SSE fallback poll, for jobs running in another process
+    extraction_job_idle_poll_seconds: float = 15.0  # Idle workers check for jobs submitted to another process
+    extraction_job_lease_seconds: int = 300  # Running jobs without a heartbeat this long are retried
+    extraction_job_max_requeues: int = 5  # Jobs requeued this often while the LLM is unavailable then fail
+    extraction_job_ttl_hours: int = 24  # Finished jobs are purged after this
+    
+    # Admin endpoints require this token in the X-Admin-Token header; empty = admin API disabled
+    admin_token: str = ""
+    
+    @model_validator(mode="after")
+    def _check_chunking(self):
+        if self.extraction_chunk_chars <= 0:
+            raise ValueError("EXTRACTION_CHUNK_CHARS must be positive")
+        if not 0 <= self.extraction_chunk_overlap_chars < self.extraction_chunk_chars:
+            raise ValueError("EXTRACTION_CHUNK_OVERLAP_CHARS must be >= 0 and less than EXTRACTION_CHUNK_CHARS")
+        return self
+
     class Config:
         env_file = ".env"
         case_sensitive = False
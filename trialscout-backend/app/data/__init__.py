@@ -1,5 +1,18 @@
-"""Data package"""
-from app.data.mock_trials import TRIALS, get_trial_by_nct, get_trials_by_cancer_type
+"""Data package
+
+The seed trials are only loaded when TRIALS or one of its helpers is first
+used (PEP 562), so importing app.data.constants stays cheap.
+"""
 from app.data.constants import DATASET_VERSION
 
-__all__ = ["TRIALS", "get_trial_by_nct", "get_trials_by_cancer_type", "DATASET_VERSION"]
\ No newline at end of file
+__all__ = ["TRIALS", "get_trial_by_nct", "get_trials_by_cancer_type", "DATASET_VERSION"]
+
+_MOCK_TRIALS_EXPORTS = ("TRIALS", "get_trial_by_nct", "get_trials_by_cancer_type")
+
+
+def __getattr__(name):
+    if name in _MOCK_TRIALS_EXPORTS:
+        from app.data import mock_trials
+
+        return getattr(mock_trials, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
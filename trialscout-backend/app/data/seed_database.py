@@ -1,5 +1,5 @@
 """
-Script to seed database with initial trial data from mock_trials.py
+Script to seed database with initial trial data from seed_trials.json
 Run with: python -m app.data.seed_database
 """
 import sys
@@ -18,7 +18,7 @@ logger = logging.getLogger(__name__)
 
 
 def seed_trials():
-    """Seed database with trials from mock_trials.py"""
+    """Seed database with trials from the seed catalog"""
     
     # Create tables if they don't exist
     Base.metadata.create_all(bind=engine)
@@ -1,25 +1,74 @@
 """
 Extract biomarkers from medical text using Claude
 """
-import anthropic
 import json
-from typing import Dict, Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from app.config import settings
+from app.extractors.chunked_extractor import extract_chunked_async
+from app.extractors.llm_client import LLMUnavailable, llm_client
+from app.extractors.rule_extractor import RULES_VERSION, RuleBasedExtractor, merge_with_llm
+from app.extractors.text_slicer import slice_report
+from app.lanes import get_lane
+from app.metrics import counter, histogram
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the prompt or response parsing changes so cached
+# extraction results from the old prompt are not reused
+PROMPT_TEMPLATE_VERSION = f"2+rules{RULES_VERSION}"
+
+
+def extraction_options() -> str:
+    """The settings that change what an extraction returns, for cache keys"""
+    return (
+        f"fast_path={settings.extraction_fast_path};"
+        f"slicing={settings.extraction_slicing_enabled}/{settings.extraction_prompt_max_chars};"
+        f"chunking={settings.extraction_chunking_enabled}/{settings.extraction_chunk_chars}"
+        f"/{settings.extraction_chunk_overlap_chars}"
+    )
+
+extraction_paths = counter(
+    "trialscout_extraction_path_total",
+    "Biomarker extractions by path (rules only, or rules + LLM)",
+    ("path",),
+)
+extraction_stage_seconds = histogram(
+    "trialscout_extraction_stage_seconds",
+    "Wall time of extraction pipeline stages (text extraction, rules, each LLM call and its parse)",
+    ("stage",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+extraction_prompt_tokens = counter(
+    "trialscout_extraction_prompt_tokens_total",
+    "Estimated report tokens before slicing and actually sent to the LLM",
+    ("stage",),
+)
+
 
 class BiomarkerExtractor:
     """Extract structured biomarker data using Claude API"""
     
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+        self.rules = RuleBasedExtractor()
     
-    def extract_biomarkers(self, report_text: str, cancer_type: Optional[str] = None) -> Dict[str, Any]:
+    async def extract_biomarkers_async(
+        self,
+        report_text: str,
+        cancer_type: Optional[str] = None,
+        on_llm_start: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
         """
         Extract biomarkers from pathology report or oncology note
         
+        The deterministic rules run first; Claude is only called when the
+        report mentions a field the rules could not resolve confidently.
+        CPU work (rules, slicing) runs in the extraction lane; LLM calls go
+        through the shared async client (admission, hedging, circuit
+        breaker), so no thread is held while waiting on the API.
+        `on_llm_start` is awaited just before the LLM is called (progress
+        reporting for extraction jobs).
+        
         Args:
             report_text: Raw text from document
             cancer_type: "breast", "lung", or None (will auto-detect)
@@ -27,29 +76,98 @@ class BiomarkerExtractor:
         Returns:
             Structured biomarker data as dict
         """
-        prompt = self._build_extraction_prompt(report_text, cancer_type)
+        lane = get_lane("extraction")
+        if not settings.extraction_fast_path:
+            if on_llm_start:
+                await on_llm_start()
+            data = await self._extract_with_llm_async(report_text, cancer_type)
+            data["extraction_method"] = "llm"
+            return data
         
-        try:
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=3000,
-                temperature=0,  # Deterministic for medical data
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            # Extract text content
-            response_text = message.content[0].text
-            
-            # Parse JSON response
-            biomarker_data = self._parse_response(response_text)
-            
-            return biomarker_data
+        with extraction_stage_seconds.time(stage="rules"):
+            rule_data, rule_fields = await lane.run(self.rules.extract, report_text, cancer_type)
+        unresolved = self._unresolved(rule_fields)
+        if not unresolved:
+            rule_data["extraction_method"] = "rules"
+            return rule_data
         
+        if on_llm_start:
+            await on_llm_start()
+        llm_data = await self._extract_with_llm_async(report_text, cancer_type or rule_data["cancer_type"])
+        return self._merge(rule_data, rule_fields, llm_data)
+    
+    def _unresolved(self, rule_fields) -> List[str]:
+        unresolved = self.rules.unresolved_fields(rule_fields)
+        if unresolved:
+            logger.info(f"Rules left {len(unresolved)} field(s) unresolved, calling LLM: {', '.join(unresolved)}")
+            extraction_paths.inc(path="llm")
+        else:
+            extraction_paths.inc(path="rules")
+        return unresolved
+    
+    @staticmethod
+    def _merge(rule_data, rule_fields, llm_data) -> Dict[str, Any]:
+        merged = merge_with_llm(rule_data, rule_fields, llm_data)
+        merged["extraction_method"] = "rules+llm"
+        return merged
+    
+    def _slice(self, report_text: str) -> str:
+        """Reduce the report to its relevant parts (when slicing is enabled)"""
+        if not settings.extraction_slicing_enabled:
+            return report_text
+        sliced = slice_report(report_text)
+        extraction_prompt_tokens.inc(sliced.original_tokens, stage="original")
+        extraction_prompt_tokens.inc(sliced.sliced_tokens, stage="sent")
+        logger.info(
+            f"Sliced report from ~{sliced.original_tokens} to ~{sliced.sliced_tokens} tokens "
+            f"({sliced.kept_blocks}/{sliced.total_blocks} paragraphs kept)"
+        )
+        return sliced.text
+    
+    async def _extract_with_llm_async(self, report_text: str, cancer_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run the extraction prompt through Claude
+
+        With chunking enabled, a report longer than one chunk is extracted
+        chunk by chunk concurrently and the results merged. Otherwise the
+        report is sliced to its relevant parts. The length is checked before
+        slicing: a sliced report fits the prompt budget, which is smaller
+        than a chunk, so chunking after slicing would never apply.
+        """
+        if cancer_type == "unknown":
+            cancer_type = None
+        if self._chunked(report_text):
+            return await extract_chunked_async(lambda chunk: self._call_llm_async(chunk, cancer_type), report_text)
+        report_text = await get_lane("extraction").run(self._slice, report_text)
+        return await self._call_llm_async(report_text, cancer_type)
+
+    @staticmethod
+    def _chunked(report_text: str) -> bool:
+        """True if the (unsliced) report should be extracted chunk by chunk"""
+        return settings.extraction_chunking_enabled and len(report_text) > settings.extraction_chunk_chars
+    
+    def _message_params(self, report_text: str, cancer_type: Optional[str]) -> Dict[str, Any]:
+        return {
+            "model": settings.anthropic_model,
+            "max_tokens": 3000,
+            "temperature": 0,  # Deterministic for medical data
+            "messages": [
+                {"role": "user", "content": self._build_extraction_prompt(report_text, cancer_type)}
+            ],
+        }
+    
+    async def _call_llm_async(self, report_text: str, cancer_type: Optional[str] = None) -> Dict[str, Any]:
+        """One extraction call through the shared async client"""
+        try:
+            with extraction_stage_seconds.time(stage="llm_call"):
+                message = await llm_client.create_message(**self._message_params(report_text, cancer_type))
+        except LLMUnavailable:
+            raise
         except Exception as e:
             logger.error(f"Claude API error: {e}")
             raise
+        with extraction_stage_seconds.time(stage="parse"):
+            return self._parse_response(message.content[0].text)
     
     def _build_extraction_prompt(self, report_text: str, cancer_type: Optional[str] = None) -> str:
         """Build structured prompt for Claude"""
@@ -83,6 +201,7 @@ Include both breast and lung cancer biomarkers if cancer type is unclear.
 """
         
         prompt = f"""You are a medical data extraction assistant specialized in oncology. Extract biomarker information from this pathology report or oncology note.
+The report text may be excerpted: bracketed lines are section headings and "..." marks omitted text.
 
 REPORT TEXT:
 {report_text}
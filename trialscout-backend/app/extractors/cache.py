@@ -0,0 +1,213 @@
+"""
+Content-addressed cache for biomarker extraction results
+
+Entries are keyed by SHA-256 of the uploaded bytes plus the cancer_type
+hint, model name, prompt-template version and the extraction settings
+that change the result (fast path, slicing, chunking), so re-uploading the
+same pathology report skips text extraction and the LLM call entirely.
+Stored as one JSON file per entry; total size is bounded with LRU eviction
+(file mtime is bumped on every hit). The index is built once per process;
+a key missing from it is still looked up on disk, so entries written by
+another worker process are found. Every method does blocking disk IO:
+async callers run them in the extraction lane.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.metrics import cache_hit_ratio, counter
+import logging
+
+logger = logging.getLogger(__name__)
+
+extraction_cache_requests = counter(
+    "trialscout_extraction_cache_requests_total",
+    "Extraction cache lookups by result",
+    ("result",),
+)
+cache_hit_ratio.track("extraction", extraction_cache_requests)
+
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 hex digest of uploaded bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def cache_key(
+    content_sha256: str, cancer_type: Optional[str], model: str, prompt_version: str, options: str = ""
+) -> str:
+    """Cache key for one (document, hint, model, prompt, extraction settings) combination"""
+    parts = [content_sha256, cancer_type or "", model, prompt_version, options]
+    return hashlib.sha256("\x1e".join(parts).encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """Size-bounded on-disk LRU cache of extraction results"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, int]"] = None  # key -> file size, oldest first
+        self._total_bytes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        """Build the LRU index from the files on disk (once per process)"""
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name[:-5], stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def _adopt(self, key: str) -> bool:
+        """Index an entry another process wrote since the index was built (lock held)"""
+        try:
+            size = self._path(key).stat().st_size
+        except OSError:
+            return False
+        self._index[key] = size
+        self._total_bytes += size
+        return True
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for key, or None"""
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index.move_to_end(key)
+            elif not self._adopt(key):
+                extraction_cache_requests.inc(result="miss")
+                return None
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable extraction cache entry {key}: {e}")
+            self.purge(key)
+            extraction_cache_requests.inc(result="miss")
+            return None
+
+        extraction_cache_requests.inc(result="hit")
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry (atomically) and evict least recently used entries"""
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            index = self._load_index()
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+
+            self._total_bytes += len(data) - index.pop(key, 0)
+            index[key] = len(data)
+
+            while self._total_bytes > self.max_bytes and index:
+                old_key, size = index.popitem(last=False)
+                self._total_bytes -= size
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+
+    def purge(self, key: Optional[str] = None) -> int:
+        """Remove one entry (or all entries when key is None); returns count removed"""
+        with self._lock:
+            index = self._load_index()
+            keys = list(index) if key is None else ([key] if key in index else [])
+            for k in keys:
+                self._total_bytes -= index.pop(k)
+                try:
+                    os.remove(self._path(k))
+                except OSError:
+                    pass
+            return len(keys)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Metadata for every entry, most recently used first"""
+        with self._lock:
+            keys = list(reversed(self._load_index().items()))
+
+        result = []
+        for key, size in keys:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            result.append({
+                "key": key,
+                "size_bytes": size,
+                "filename": entry.get("filename"),
+                "content_sha256": entry.get("content_sha256"),
+                "cancer_type": entry.get("cancer_type"),
+                "model": entry.get("model"),
+                "prompt_version": entry.get("prompt_version"),
+                "options": entry.get("options"),
+                "created_at": entry.get("created_at"),
+            })
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            index = self._load_index()
+            return {
+                "entries": len(index),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": int(extraction_cache_requests.value(result="hit")),
+                "misses": int(extraction_cache_requests.value(result="miss")),
+            }
+
+
+extraction_cache = ExtractionCache(
+    settings.extraction_cache_dir,
+    settings.extraction_cache_max_mb * 1024 * 1024,
+)
+
+
+def new_entry(
+    content_sha256: str,
+    filename: Optional[str],
+    cancer_type: Optional[str],
+    model: str,
+    prompt_version: str,
+    biomarker_data: Dict[str, Any],
+    raw_text: str,
+    options: str = "",
+) -> Dict[str, Any]:
+    """Build a cache entry in the on-disk format"""
+    return {
+        "content_sha256": content_sha256,
+        "filename": filename,
+        "cancer_type": cancer_type,
+        "model": model,
+        "prompt_version": prompt_version,
+        "options": options,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "biomarker_data": biomarker_data,
+        "raw_text": raw_text,
+    }
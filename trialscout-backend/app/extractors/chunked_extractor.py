@@ -0,0 +1,142 @@
+"""
+Map-reduce extraction for long documents
+
+Long notes and multi-page outside records are split into overlapping
+chunks on line boundaries; each chunk is extracted with its own LLM
+call (concurrently, with a process-wide bound on parallel calls) and the
+per-chunk results are merged field by field: the most confident value
+wins, and among equally confident values the one from the later chunk
+wins, since notes are written chronologically and restaging, progression
+and repeat biopsies come after the original diagnosis.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.extractors.rule_extractor import CONFIDENCE_RANK
+
+UNKNOWN_VALUES = ("unknown", None, "", [])
+
+# Top-level fields the prompt returns without a confidence of their own
+SCALAR_FIELDS = ("cancer_type", "stage", "ecog", "age", "sex", "current_treatment_status")
+
+def split_chunks(text: str, chunk_chars: int, overlap_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most ~chunk_chars on line boundaries
+
+    Consecutive chunks share roughly overlap_chars of trailing lines so a
+    finding split across a boundary is seen whole by at least one chunk.
+    Lines longer than a chunk (PDF text without line breaks) are hard-split.
+    Requires 0 <= overlap_chars < chunk_chars (otherwise the hard split
+    would never advance).
+    """
+    if chunk_chars <= 0 or not 0 <= overlap_chars < chunk_chars:
+        raise ValueError(f"need 0 <= overlap_chars < chunk_chars, got {overlap_chars} and {chunk_chars}")
+    lines: List[str] = []
+    for line in text.split("\n"):
+        while len(line) > chunk_chars:
+            lines.append(line[:chunk_chars])
+            line = line[chunk_chars - overlap_chars:]
+        lines.append(line)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        if current and size + len(line) > chunk_chars:
+            chunks.append("\n".join(current))
+            # Carry trailing lines over as overlap
+            carried: List[str] = []
+            carried_size = 0
+            for previous in reversed(current):
+                if carried_size + len(previous) > overlap_chars:
+                    break
+                carried.insert(0, previous)
+                carried_size += len(previous) + 1
+            current, size = carried, carried_size
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def _confidence(entry: Any) -> int:
+    if isinstance(entry, dict):
+        return CONFIDENCE_RANK.get(entry.get("confidence", "low"), 0)
+    return CONFIDENCE_RANK["medium"]
+
+
+def _is_known(entry: Any) -> bool:
+    if isinstance(entry, dict):
+        value = entry.get("value", entry.get("status"))
+        return value not in UNKNOWN_VALUES
+    return entry not in UNKNOWN_VALUES
+
+
+def _pick(current: Any, candidate: Any) -> Any:
+    """Keep the more confident known value; later chunks win ties"""
+    if not _is_known(candidate):
+        return current if current is not None else candidate
+    if current is None or not _is_known(current):
+        return candidate
+    return candidate if _confidence(candidate) >= _confidence(current) else current
+
+
+def merge_chunk_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce per-chunk extraction results (in document order) into one"""
+    merged: Dict[str, Any] = {"biomarkers": {}, "prior_treatments": []}
+    notes: List[str] = []
+
+    for result in results:
+        for name in SCALAR_FIELDS:
+            if name in result:
+                merged[name] = _pick(merged.get(name), result[name])
+        for name, entry in (result.get("biomarkers") or {}).items():
+            merged["biomarkers"][name] = _pick(merged["biomarkers"].get(name), entry)
+        for treatment in result.get("prior_treatments") or []:
+            if treatment not in merged["prior_treatments"]:
+                merged["prior_treatments"].append(treatment)
+        note = result.get("extraction_notes")
+        if note and note not in notes:
+            notes.append(note)
+
+    for name in SCALAR_FIELDS:
+        merged.setdefault(name, None if name == "age" else "unknown")
+    merged["extraction_notes"] = " ".join(notes)
+    merged["chunks"] = len(results)
+    return merged
+
+
+def _chunks(report_text: str, chunk_chars: Optional[int], overlap_chars: Optional[int]) -> List[str]:
+    return split_chunks(
+        report_text,
+        chunk_chars or settings.extraction_chunk_chars,
+        overlap_chars if overlap_chars is not None else settings.extraction_chunk_overlap_chars,
+    )
+
+
+async def extract_chunked_async(
+    extract_chunk: Callable[[str], Awaitable[Dict[str, Any]]],
+    report_text: str,
+    chunk_chars: Optional[int] = None,
+    overlap_chars: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Map `extract_chunk` over the chunks of report_text concurrently, then merge
+
+    At most extraction_chunk_parallelism chunks of one document are in
+    flight; the shared LLM client bounds calls across documents.
+    """
+    chunks = _chunks(report_text, chunk_chars, overlap_chars)
+    if len(chunks) == 1:
+        return await extract_chunk(chunks[0])
+
+    semaphore = asyncio.Semaphore(settings.extraction_chunk_parallelism)
+
+    async def bounded(chunk: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await extract_chunk(chunk)
+
+    # gather() returns results in argument order, i.e. document order
+    return merge_chunk_results(list(await asyncio.gather(*(bounded(chunk) for chunk in chunks))))
@@ -1,11 +1,11 @@
 """
 Extract text from various document formats
 """
-import io
-import PyPDF2
-import pdfplumber
-from typing import Optional
+from typing import List, Tuple
 from fastapi import UploadFile
+from app.extractors.pdf_text import PageText, Source, extract_pdf_text
+from app.lanes import get_lane
+from app.uploads import Upload, read_upload
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,27 +20,51 @@ class DocumentExtractor:
         Extract text from uploaded file
         
         Supports:
-        - Text-based PDFs (PyPDF2, pdfplumber)
+        - Text-based PDFs (PyPDF2, pdfplumber for pages PyPDF2 can't read)
         - Plain text files
         """
-        content = await file.read()
-        file_type = file.content_type
+        with await read_upload(file) as upload:
+            return await get_lane("extraction").run(DocumentExtractor.extract_text_from_upload, upload)
+    
+    @staticmethod
+    def extract_text_from_bytes(content: bytes, file_type: str) -> str:
+        """
+        Extract text from an already-read upload
+        
+        Blocking (PDF parsing is CPU-bound); call it from an execution lane
+        rather than directly on the event loop.
+        """
+        text, _ = DocumentExtractor.extract_text_with_pages(content, file_type)
+        return text
+    
+    @staticmethod
+    def extract_text_from_upload(upload: Upload) -> str:
+        """Extract text from an Upload (in memory or spooled to disk); blocking"""
+        text, _ = DocumentExtractor.extract_text_with_pages(upload.source, upload.content_type)
+        return text
+    
+    @staticmethod
+    def extract_text_with_pages(source: Source, file_type: str) -> Tuple[str, List[PageText]]:
+        """
+        Extract text plus per-page results (extractor used, timing)
         
+        source is the document bytes, or an upload's spool file (Upload.source). Pages
+        are only reported for PDFs; plain text returns an empty list.
+        """
         try:
             if file_type == "application/pdf":
-                # Try text extraction first (faster)
-                text = DocumentExtractor._extract_from_text_pdf(content)
-                
-                if not text or len(text.strip()) < 50:
-                    # Fallback to pdfplumber for better table handling
-                    logger.info("PyPDF2 extraction minimal, trying pdfplumber...")
-                    text = DocumentExtractor._extract_with_pdfplumber(content)
-                
-                return text
+                # PyPDF2 per page, pdfplumber only for pages it can't read
+                return extract_pdf_text(source)
             
             elif file_type in ["text/plain", "application/txt"]:
                 # Extract from plain text file
-                return content.decode('utf-8', errors='ignore')
+                if isinstance(source, str):
+                    with open(source, "rb") as f:
+                        source = f.read()
+                elif not isinstance(source, (bytes, bytearray)):
+                    source.seek(0)
+                    source = source.read()
+                return source.decode('utf-8', errors='ignore'), []
             
             else:
                 raise ValueError(f"Unsupported file type: {file_type}")
@@ -48,39 +72,3 @@ class DocumentExtractor:
         except Exception as e:
             logger.error(f"Error extracting text: {e}")
             raise
-    
-    @staticmethod
-    def _extract_from_text_pdf(content: bytes) -> str:
-        """Extract text from text-based PDF using PyPDF2"""
-        try:
-            pdf_file = io.BytesIO(content)
-            reader = PyPDF2.PdfReader(pdf_file)
-            
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            
-            return text.strip()
-        except Exception as e:
-            logger.warning(f"PyPDF2 extraction failed: {e}, trying pdfplumber...")
-            return DocumentExtractor._extract_with_pdfplumber(content)
-    
-    @staticmethod
-    def _extract_with_pdfplumber(content: bytes) -> str:
-        """Extract text using pdfplumber (better for tables)"""
-        try:
-            pdf_file = io.BytesIO(content)
-            text = ""
-            
-            with pdfplumber.open(pdf_file) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            
-            return text.strip()
-        except Exception as e:
-            logger.error(f"pdfplumber extraction failed: {e}")
-            return ""
\ No newline at end of file
@@ -0,0 +1,272 @@
+"""
+Process-wide async LLM client
+
+One AsyncAnthropic client (and one keep-alive connection pool) shared by
+every extraction in the process, with:
+
+- a concurrency semaphore bounding in-flight LLM calls
+- hedging: if a call is still running past the recent latency percentile,
+  a second identical attempt is started and whichever finishes first wins
+  (only when a concurrency slot is free, so hedges never add queueing)
+- a circuit breaker that fails fast with LLMUnavailable after repeated
+  upstream failures, then lets a single probe through after a cool-down
+
+The anthropic SDK is imported when the first client is created, not when
+this module is, so the API starts without paying for it.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Optional
+
+from app.config import settings
+from app.metrics import counter
+import logging
+
+if TYPE_CHECKING:
+    import anthropic
+
+logger = logging.getLogger(__name__)
+
+llm_requests = counter(
+    "trialscout_llm_requests_total",
+    "LLM calls by outcome",
+    ("outcome",),
+)
+llm_hedges = counter(
+    "trialscout_llm_hedges_total",
+    "Hedged second attempts, by whether the hedge won",
+    ("result",),
+)
+llm_breaker_transitions = counter(
+    "trialscout_llm_breaker_transitions_total",
+    "Circuit breaker state changes",
+    ("state",),
+)
+
+
+class LLMUnavailable(Exception):
+    """Raised without calling upstream while the circuit breaker is open"""
+
+    def __init__(self, retry_after: float, reason: str = "LLM service unavailable"):
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Errors that say the upstream is degraded (as opposed to a bad request)"""
+    import anthropic  # already loaded once a call has been made
+
+    if isinstance(exc, (anthropic.APIConnectionError, anthropic.APITimeoutError, asyncio.TimeoutError)):
+        return True
+    if isinstance(exc, anthropic.APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open probe after a cool-down"""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"LLM circuit breaker {self.state} -> {state}")
+            self.state = state
+            llm_breaker_transitions.inc(state=state)
+
+    def before_call(self) -> bool:
+        """
+        Raise LLMUnavailable unless a call may go upstream now
+
+        Returns True when this call is the half-open probe. Only the probe's
+        outcome moves the breaker out of half-open; calls that started
+        before the breaker opened (stragglers) never touch the probe flag.
+        """
+        if self.state == "open":
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0:
+                raise LLMUnavailable(remaining)
+            self._set_state("half_open")
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                raise LLMUnavailable(self.reset_seconds, "LLM service recovering")
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self, probe: bool = False) -> None:
+        self._failures = 0
+        if probe:
+            self._probe_in_flight = False
+            self._set_state("closed")
+
+    def release_probe(self) -> None:
+        """The probe ended without an outcome (cancelled); let the next call probe instead"""
+        self._probe_in_flight = False
+
+    def record_failure(self, upstream: bool, probe: bool = False) -> None:
+        if probe:
+            self._probe_in_flight = False
+        if not upstream:
+            # The upstream answered; a bad request says nothing about its health
+            if probe:
+                self._set_state("closed")
+            return
+        self._failures += 1
+        if probe or (self.state == "closed" and self._failures >= self.failure_threshold):
+            self._opened_at = time.monotonic()
+            self._set_state("open")
+
+
+class LatencyTracker:
+    """Recent successful call latencies, for picking the hedge delay"""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class LLMClient:
+    """Shared async Messages API client with bounded concurrency, hedging and circuit breaking"""
+
+    def __init__(self):
+        self._client: Optional["anthropic.AsyncAnthropic"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.latencies = LatencyTracker()
+        self.breaker = CircuitBreaker(
+            settings.llm_breaker_failure_threshold,
+            settings.llm_breaker_reset_seconds,
+        )
+
+    @property
+    def client(self) -> "anthropic.AsyncAnthropic":
+        if self._client is None:
+            import anthropic
+            import httpx
+
+            self._client = anthropic.AsyncAnthropic(
+                api_key=settings.anthropic_api_key,
+                base_url=settings.anthropic_base_url or None,
+                max_retries=0,  # hedging and the breaker replace SDK retries
+                timeout=settings.llm_timeout_seconds,
+                http_client=anthropic.DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=settings.llm_max_connections,
+                        max_keepalive_connections=settings.llm_max_connections,
+                    ),
+                    timeout=settings.llm_timeout_seconds,
+                ),
+            )
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the serving event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+        return self._semaphore
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None when hedging is off / not calibrated"""
+        if not settings.llm_hedge_enabled or len(self.latencies) < settings.llm_hedge_min_samples:
+            return None
+        return max(settings.llm_hedge_min_delay_seconds, self.latencies.percentile(settings.llm_hedge_percentile))
+
+    async def _attempt(self, params: Dict[str, Any]) -> Any:
+        started = time.monotonic()
+        message = await self.client.messages.create(**params)
+        self.latencies.record(time.monotonic() - started)
+        return message
+
+    async def create_message(self, **params) -> Any:
+        """messages.create() with admission, hedging and circuit breaking"""
+        probe = self.breaker.before_call()
+        try:
+            async with self.semaphore:
+                try:
+                    message = await self._hedged(params)
+                except Exception as e:
+                    self.breaker.record_failure(is_upstream_failure(e), probe)
+                    llm_requests.inc(outcome="error")
+                    raise
+            self.breaker.record_success(probe)
+        finally:
+            # Cancellation (a BaseException) skips both records above; without
+            # this a cancelled half-open probe would block every later call
+            if probe:
+                self.breaker.release_probe()
+        llm_requests.inc(outcome="ok")
+        return message
+
+    async def _hedged(self, params: Dict[str, Any]) -> Any:
+        first = asyncio.ensure_future(self._attempt(params))
+        pending = {first}
+        hedge = None
+        hedge_slot = False
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                # Only hedge into a free slot; never queue behind other requests
+                if not done and not self.semaphore.locked():
+                    await self.semaphore.acquire()
+                    hedge_slot = True
+                    hedge = asyncio.ensure_future(self._attempt(params))
+                    pending.add(hedge)
+                    llm_hedges.inc(result="launched")
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            llm_hedges.inc(result="won")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (first, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+            if hedge_slot:
+                self.semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.latencies.percentile(50)
+        p95 = self.latencies.percentile(95)
+        return {
+            "breaker_state": self.breaker.state,
+            "in_flight_limit": settings.llm_max_concurrency,
+            "latency_p50_seconds": round(p50, 3) if p50 is not None else None,
+            "latency_p95_seconds": round(p95, 3) if p95 is not None else None,
+            "hedge_delay_seconds": self.hedge_delay(),
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+llm_client = LLMClient()
@@ -0,0 +1,237 @@
+"""
+PDF text extraction
+
+Each page is read once with PyPDF2; only pages that draw text but where it
+finds (almost) none are re-read with pdfplumber, instead of re-parsing the
+whole document whenever the PyPDF2 result is short. Blank and scanned
+pages (no text operators) are not re-read. Parsing runs in the shared process
+pool - small PDFs as a single task, larger ones as contiguous page ranges
+parsed in parallel - and page text is collected in a list and joined once.
+
+A PDF is given as bytes, as the path of an upload's spool file, or (where
+the spool has no path) as the open spool itself. A path or spool is
+memory-mapped instead of copied; a path is mapped by each worker process,
+while an open spool can't be sent to one and is parsed in-process.
+"""
+import io
+import math
+import mmap
+import re
+import time
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple, Union
+
+from app.config import settings
+from app.lanes import get_process_pool, process_pool_workers, reset_process_pool
+from app.metrics import counter
+import logging
+
+logger = logging.getLogger(__name__)
+
+pdf_pages_total = counter(
+    "trialscout_pdf_pages_total",
+    "PDF pages extracted, by the extractor that produced the text",
+    ("extractor",),
+)
+
+
+Source = Union[bytes, str, BinaryIO]  # PDF bytes, the path of an upload's spool file, or the spool
+
+
+@contextmanager
+def _stream(source: Source) -> Iterator[Any]:
+    """A seekable binary stream over the PDF (memory-mapped when given a path or a spool)"""
+    if isinstance(source, (bytes, bytearray)):
+        yield io.BytesIO(source)
+        return
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            with _mapped(f) as stream:
+                yield stream
+        return
+    with _mapped(source) as stream:
+        yield stream
+
+
+@contextmanager
+def _mapped(f: BinaryIO) -> Iterator[Any]:
+    if f.seek(0, io.SEEK_END) == 0:
+        yield io.BytesIO(b"")
+        return
+    try:
+        fileno = f.fileno()
+    except (AttributeError, io.UnsupportedOperation):  # spool still in memory
+        f.seek(0)
+        yield io.BytesIO(f.read())
+        return
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
+@dataclass
+class PageText:
+    """Text of one PDF page and how it was obtained"""
+    page: int  # 1-based
+    text: str
+    extractor: str  # "pypdf2" | "pdfplumber" | "none"
+    seconds: float
+
+    def timing(self) -> Dict[str, Any]:
+        return {
+            "page": self.page,
+            "extractor": self.extractor,
+            "chars": len(self.text),
+            "seconds": round(self.seconds, 4),
+        }
+
+
+def _open_pypdf2(stream):
+    import PyPDF2  # imported on first use; the API starts without the PDF libraries
+
+    try:
+        return PyPDF2.PdfReader(stream)
+    except Exception as e:
+        logger.warning(f"PyPDF2 could not open PDF: {e}, using pdfplumber")
+        return None
+
+
+def page_count(source: Source) -> int:
+    with _stream(source) as stream:
+        reader = _open_pypdf2(stream)
+        if reader is not None:
+            return len(reader.pages)
+        import pdfplumber
+
+        try:
+            stream.seek(0)
+            with pdfplumber.open(stream) as pdf:
+                return len(pdf.pages)
+        except Exception as e:
+            logger.error(f"pdfplumber could not open PDF: {e}")
+            return 0
+
+
+# Text-showing operators: Tj, TJ, ' and "
+_SHOW_TEXT = re.compile(rb"T[jJ]|['\"]")
+
+
+def _shows_text(page) -> bool:
+    """Whether a page draws any text at all (blank and scanned pages don't)"""
+    try:
+        resources = page.get("/Resources")
+        if resources is None or "/Font" not in resources.get_object():
+            return False
+        contents = page.get_contents()
+        return contents is not None and bool(_SHOW_TEXT.search(contents.get_data()))
+    except Exception:
+        return True  # can't tell; let pdfplumber try
+
+
+def extract_page_range(source: Source, start: int, stop: int, min_chars: int) -> List[PageText]:
+    """Extract pages [start, stop); runs in a worker process"""
+    with _stream(source) as stream:
+        return _extract_range(stream, start, stop, min_chars)
+
+
+def _extract_range(stream, start: int, stop: int, min_chars: int) -> List[PageText]:
+    reader = _open_pypdf2(stream)
+    plumber = None
+    pages: List[PageText] = []
+    try:
+        for index in range(start, stop):
+            started = time.perf_counter()
+            text = ""
+            extractor = "pypdf2"
+            shows_text = True
+            if reader is not None:
+                try:
+                    page = reader.pages[index]
+                    text = (page.extract_text() or "").strip()
+                    if len(text) < min_chars:
+                        shows_text = _shows_text(page)
+                except Exception as e:
+                    logger.warning(f"PyPDF2 failed on page {index + 1}: {e}")
+
+            if not shows_text:
+                extractor = "pypdf2" if text else "none"  # nothing more for pdfplumber to find (no OCR)
+            elif len(text) < min_chars:
+                # Only this page is re-read, and pdfplumber is opened at most once per range
+                try:
+                    if plumber is None:
+                        import pdfplumber
+
+                        stream.seek(0)
+                        plumber = pdfplumber.open(stream)
+                    fallback = (plumber.pages[index].extract_text() or "").strip()
+                except Exception as e:
+                    logger.warning(f"pdfplumber failed on page {index + 1}: {e}")
+                    fallback = ""
+                if len(fallback) > len(text):
+                    text, extractor = fallback, "pdfplumber"
+                elif not text:
+                    extractor = "none"
+
+            pages.append(PageText(index + 1, text, extractor, time.perf_counter() - started))
+    finally:
+        if plumber is not None:
+            plumber.close()
+    return pages
+
+
+def _page_ranges(count: int) -> List[Tuple[int, int]]:
+    # At most one range per worker, so each process parses the file structure once
+    per_task = max(settings.pdf_pages_per_task, math.ceil(count / process_pool_workers()))
+    return [(start, min(start + per_task, count)) for start in range(0, count, per_task)]
+
+
+def extract_pages(source: Source) -> List[PageText]:
+    """
+    Extract every page of a PDF, in page order
+
+    Blocking; call from an execution lane. The lane thread only waits while
+    worker processes parse, so PDF parsing no longer holds the GIL that the
+    event loop and other lanes need.
+    """
+    count = page_count(source)
+    if count == 0:
+        return []
+    ranges = _page_ranges(count)
+    min_chars = settings.pdf_min_page_chars
+
+    pages: List[PageText] = []
+    if settings.pdf_process_pool_enabled and isinstance(source, (bytes, bytearray, str)):
+        try:
+            pool = get_process_pool()
+            futures = [pool.submit(extract_page_range, source, start, stop, min_chars) for start, stop in ranges]
+            for future in futures:
+                pages.extend(future.result())
+            return pages
+        except BrokenProcessPool:
+            logger.warning("PDF worker process died; extracting in-process")
+            reset_process_pool()
+            pages = []
+
+    for start, stop in ranges:
+        pages.extend(extract_page_range(source, start, stop, min_chars))
+    return pages
+
+
+def extract_pdf_text(source: Source) -> Tuple[str, List[PageText]]:
+    """Return (document text, per-page results)"""
+    started = time.perf_counter()
+    pages = extract_pages(source)
+    text = "\n".join(page.text for page in pages if page.text)
+
+    extractors = Counter(page.extractor for page in pages)
+    for extractor, pages_extracted in extractors.items():
+        pdf_pages_total.inc(pages_extracted, extractor=extractor)
+    if pages:
+        slowest = max(pages, key=lambda page: page.seconds)
+        logger.info(
+            f"Extracted {len(pages)} PDF pages in {time.perf_counter() - started:.2f}s "
+            f"({dict(extractors)}; slowest page {slowest.page}: {slowest.seconds * 1000:.0f} ms)"
+        )
+    return text, pages
@@ -0,0 +1,102 @@
+"""
+Document -> biomarker data pipeline
+
+Shared by the synchronous extraction endpoint and the extraction job
+workers: extraction cache lookup, text extraction, biomarker extraction
+(rules first, LLM if needed) and cache fill. Cache and text extraction IO
+runs in the extraction lane, never on the event loop. Progress
+is reported through an optional async callback as the stages complete.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.config import settings
+from app.extractors.biomarker_extractor import (
+    BiomarkerExtractor, PROMPT_TEMPLATE_VERSION, extraction_options, extraction_stage_seconds,
+)
+from app.extractors.cache import extraction_cache, cache_key, new_entry
+from app.extractors.document_extractor import DocumentExtractor
+from app.lanes import get_lane
+from app.ratelimit import AdmissionRejected
+from app.uploads import Upload
+import logging
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_CONTENT_TYPES = ("application/pdf", "text/plain", "application/txt")
+
+# One extractor per process: the LLM client and its connection pool are shared
+biomarker_extractor = BiomarkerExtractor()
+
+Progress = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class UnreadableDocument(ValueError):
+    """The document yielded no usable text"""
+
+
+async def extract_document(
+    upload: Upload,
+    cancer_type: Optional[str] = None,
+    progress: Optional[Progress] = None,
+) -> Dict[str, Any]:
+    """
+    Run the full extraction pipeline for one uploaded document
+
+    Returns {"biomarker_data", "raw_text" (first 1000 chars), "cache_hit"}.
+    Progress stages: "cache_hit", "text_extracted", "llm_started", "parsed".
+    """
+    async def report(stage: str, **data) -> None:
+        if progress:
+            await progress(stage, data)
+
+    filename = upload.filename
+    content_sha256 = upload.sha256  # computed while the upload was read
+    options = extraction_options()
+    key = cache_key(content_sha256, cancer_type, settings.anthropic_model, PROMPT_TEMPLATE_VERSION, options)
+    if settings.extraction_cache_enabled:
+        cached = await get_lane("extraction").run(extraction_cache.get, key)
+        if cached:
+            logger.info(f"Extraction cache hit for {filename}")
+            await report("cache_hit")
+            return {
+                "biomarker_data": cached["biomarker_data"],
+                "raw_text": cached["raw_text"],
+                "cache_hit": True,
+            }
+
+    # Step 1: Extract text from document
+    logger.info(f"Extracting text from {filename}...")
+    with extraction_stage_seconds.time(stage="text_extraction"):
+        raw_text = await get_lane("extraction").run(DocumentExtractor.extract_text_from_upload, upload)
+    if not raw_text or len(raw_text.strip()) < 20:
+        raise UnreadableDocument(
+            "Could not extract text from document. Please ensure the file is readable and contains text."
+        )
+    logger.info(f"Extracted {len(raw_text)} characters of text")
+    await report("text_extracted", characters=len(raw_text))
+
+    # Step 2: Extract biomarkers (rules first, Claude only if needed)
+    biomarker_data = await biomarker_extractor.extract_biomarkers_async(
+        report_text=raw_text,
+        cancer_type=cancer_type,
+        on_llm_start=lambda: report("llm_started"),
+    )
+    await report("parsed", extraction_method=biomarker_data.get("extraction_method"))
+
+    raw_text_preview = raw_text[:1000] + "..." if len(raw_text) > 1000 else raw_text  # Truncate for response
+    if settings.extraction_cache_enabled:
+        entry = new_entry(
+            content_sha256, filename, cancer_type, settings.anthropic_model,
+            PROMPT_TEMPLATE_VERSION, biomarker_data, raw_text_preview, options,
+        )
+        try:
+            await get_lane("extraction").run(extraction_cache.put, key, entry)
+        except AdmissionRejected:
+            # The result is ready; don't fail the request over a cache fill
+            logger.warning(f"Extraction lane full, not caching the result for {filename}")
+
+    return {
+        "biomarker_data": biomarker_data,
+        "raw_text": raw_text_preview,
+        "cache_hit": False,
+    }
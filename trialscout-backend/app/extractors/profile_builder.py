@@ -0,0 +1,269 @@
+"""
+Merge extractions from several documents into one candidate PatientProfile
+
+A patient's pathology report, oncology note and molecular report each
+cover part of the picture. Fields are merged independently: the most
+confident known value wins (ties keep the earlier document), every chosen
+value records the document it came from, and documents that disagree on a
+field are reported as conflicts for review instead of being silently
+resolved.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.extractors.chunked_extractor import SCALAR_FIELDS, UNKNOWN_VALUES
+from app.extractors.rule_extractor import CONFIDENCE_RANK, treatment_categories
+from app.models.patient import LineOfTherapy, PatientProfile
+
+REQUIRED_FIELDS = ("age", "sex", "cancer_type", "stage")
+TREATMENT_CATEGORIES = (
+    "surgery", "radiation", "chemotherapy", "targeted_therapy", "immunotherapy", "hormone_therapy"
+)
+STATUSES = ("present", "absent", "unknown")
+
+# current_treatment_status -> line_of_therapy, as the screener step maps it
+LINE_OF_THERAPY = {
+    "newly_diagnosed": LineOfTherapy.FIRST.value,
+    "on_treatment": LineOfTherapy.FIRST.value,
+    "progressed_on_targeted": LineOfTherapy.POST_TARGETED.value,
+    "progressed_on_chemo": LineOfTherapy.POST_CHEMO_IMMUNO.value,
+}
+
+# Treatment status only moves forward: among equally confident documents the
+# furthest-along status wins (the molecular report predates the progression note)
+TREATMENT_STATUS_ORDER = {
+    "newly_diagnosed": 0,
+    "on_treatment": 1,
+    "progressed_on_targeted": 2,
+    "progressed_on_chemo": 2,
+}
+
+_CONFIDENCE_NAMES = {rank: name for name, rank in CONFIDENCE_RANK.items()}
+
+Document = Tuple[str, Dict[str, Any]]  # (filename, biomarker_data)
+
+
+def _value(entry: Any) -> Any:
+    if isinstance(entry, dict):
+        return entry.get("value", entry.get("status"))
+    return entry
+
+
+def _is_known(entry: Any) -> bool:
+    return _value(entry) not in UNKNOWN_VALUES
+
+
+def _confidence(data: Dict[str, Any], name: str, entry: Any) -> int:
+    """Biomarkers carry their own confidence; scalars use field_confidence when present"""
+    if isinstance(entry, dict) and "confidence" in entry:
+        return CONFIDENCE_RANK.get(entry["confidence"], 0)
+    level = (data.get("field_confidence") or {}).get(name, "medium")
+    return CONFIDENCE_RANK.get(level, CONFIDENCE_RANK["medium"])
+
+
+def _stage_group(stage: Any) -> Optional[str]:
+    """"IVB" -> "IV", "Stage IIA" -> "II"; None when no stage group is recognisable"""
+    match = re.search(r"\b(IV|III|II|I)(?:[ABC]\d?)?\b", str(stage or "").upper())
+    return match.group(1) if match else None
+
+
+def _normalise(name: str, value: Any) -> Any:
+    if name == "stage":
+        return _stage_group(value)
+    return str(value).strip().lower() if value is not None else None
+
+
+def _agrees(name: str, a: Any, b: Any) -> bool:
+    """Same finding; a detail present in only one document (e.g. the mutation) is not a conflict"""
+    if not isinstance(a, dict) or not isinstance(b, dict):
+        return _normalise(name, a) == _normalise(name, b)
+    for key in ("value", "status", "mutation", "alteration", "percentage"):
+        left, right = a.get(key), b.get(key)
+        if left in UNKNOWN_VALUES or right in UNKNOWN_VALUES:
+            continue
+        if _normalise(key, left) != _normalise(key, right):
+            return False
+    return True
+
+
+def _display(entry: Any) -> Any:
+    if isinstance(entry, dict):
+        return {key: value for key, value in entry.items() if key not in ("confidence", "details")}
+    return entry
+
+
+class _Merger:
+    def __init__(self):
+        self.provenance: Dict[str, Any] = {}
+        self.conflicts: List[Dict[str, Any]] = []
+
+    def choose(self, path: str, name: str, candidates: List[Tuple[str, Dict[str, Any], Any]]) -> Any:
+        """Pick the value for one field from (source, data, entry) candidates in document order"""
+        known = [
+            (source, entry, _confidence(data, name, entry))
+            for source, data, entry in candidates
+            if _is_known(entry)
+        ]
+        if not known:
+            return candidates[0][2] if candidates else None
+
+        def precedence(candidate):
+            _, entry, rank = candidate
+            if name == "current_treatment_status":
+                return rank, TREATMENT_STATUS_ORDER.get(entry, 0)
+            return rank, 0
+
+        source, chosen, rank = max(known, key=precedence)  # first max: earlier document
+        self.provenance[path] = {"source": source, "confidence": _CONFIDENCE_NAMES.get(rank, "low")}
+        if any(not _agrees(name, entry, chosen) for _, entry, _ in known):
+            self.conflicts.append({
+                "field": path,
+                "chosen": {"source": source, "value": _display(chosen)},
+                "values": [
+                    {"source": other, "value": _display(entry), "confidence": _CONFIDENCE_NAMES.get(level, "low")}
+                    for other, entry, level in known
+                ],
+            })
+        return chosen
+
+
+def _categories(treatment: Any) -> List[str]:
+    if isinstance(treatment, dict):
+        treatment = treatment.get("category") or treatment.get("name") or ""
+    treatment = str(treatment)
+    if treatment in TREATMENT_CATEGORIES:
+        return [treatment]
+    return treatment_categories(treatment)
+
+
+def merge_documents(documents: List[Document]) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Merge per-document extraction results (in upload order)
+
+    Returns (merged biomarker_data, provenance, conflicts). provenance maps
+    a field path ("stage", "biomarkers.HER2") to {"source", "confidence"};
+    prior_treatments maps each category to the documents that mention it.
+    """
+    merger = _Merger()
+    merged: Dict[str, Any] = {"biomarkers": {}, "prior_treatments": []}
+
+    for name in SCALAR_FIELDS:
+        candidates = [(source, data, data[name]) for source, data in documents if name in data]
+        value = merger.choose(name, name, candidates)
+        merged[name] = value if value is not None else (None if name == "age" else "unknown")
+
+    names: List[str] = []
+    for _, data in documents:
+        names.extend(name for name in (data.get("biomarkers") or {}) if name not in names)
+    for name in names:
+        candidates = [
+            (source, data, data["biomarkers"][name])
+            for source, data in documents
+            if name in (data.get("biomarkers") or {})
+        ]
+        merged["biomarkers"][name] = merger.choose(f"biomarkers.{name}", name, candidates)
+
+    treatment_sources: Dict[str, List[str]] = {}
+    for source, data in documents:
+        for treatment in data.get("prior_treatments") or []:
+            for category in _categories(treatment):
+                sources = treatment_sources.setdefault(category, [])
+                if source not in sources:
+                    sources.append(source)
+    merged["prior_treatments"] = list(treatment_sources)
+    merger.provenance["prior_treatments"] = treatment_sources
+
+    notes = [f"{source}: {data['extraction_notes']}" for source, data in documents if data.get("extraction_notes")]
+    merged["extraction_notes"] = " ".join(notes)
+    return merged, merger.provenance, merger.conflicts
+
+
+def _status(entry: Any) -> str:
+    value = str(_value(entry) or "unknown").lower()
+    return value if value in STATUSES else "unknown"
+
+
+def _breast_biomarkers(biomarkers: Dict[str, Any]) -> Dict[str, Any]:
+    her2 = str(_value(biomarkers.get("HER2")) or "unknown").lower()
+    ki67 = _value(biomarkers.get("Ki67_percentage"))
+    return {
+        "ER": _status(biomarkers.get("ER")),
+        "PR": _status(biomarkers.get("PR")),
+        "HER2": her2 if her2 in ("positive", "low", "negative") else "unknown",
+        "Ki67": int(ki67) if isinstance(ki67, (int, float)) else None,
+    }
+
+
+def _lung_biomarkers(biomarkers: Dict[str, Any]) -> Dict[str, Any]:
+    def detail(name: str, key: str) -> Optional[str]:
+        entry = biomarkers.get(name)
+        return entry.get(key) if isinstance(entry, dict) and entry.get(key) else None
+
+    kras = (detail("KRAS", "mutation") or "").upper()
+    met = (detail("MET", "alteration") or "").lower()
+    pdl1 = biomarkers.get("PD_L1", biomarkers.get("PDL1"))
+    percentage = pdl1.get("percentage") if isinstance(pdl1, dict) else None
+    return {
+        "EGFR": {"status": _status(biomarkers.get("EGFR")), "mutation": detail("EGFR", "mutation")},
+        "ALK": _status(biomarkers.get("ALK")),
+        "ROS1": _status(biomarkers.get("ROS1")),
+        "KRAS": {
+            "status": _status(biomarkers.get("KRAS")),
+            "mutation": next((m for m in ("G12C", "G12D", "G12V") if m in kras), "Other" if kras else None),
+        },
+        "MET": {
+            "status": _status(biomarkers.get("MET")),
+            "alteration": "Exon 14 skipping" if "14" in met else "Amplification" if "amplif" in met else None,
+        },
+        "BRAF": _status(biomarkers.get("BRAF")),
+        "PDL1": {
+            "status": _status(pdl1),
+            "percentage": int(percentage) if isinstance(percentage, (int, float)) else None,
+        },
+    }
+
+
+def to_profile(merged: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[str], List[str]]:
+    """
+    Build a PatientProfile from merged biomarker_data
+
+    Returns (profile, missing_fields, validation_errors); profile is None
+    when a required field is unknown or the candidate fails validation.
+    """
+    cancer_type = str(merged.get("cancer_type") or "").lower()
+    ecog = str(merged.get("ecog") or "unknown")
+    biomarkers = merged.get("biomarkers") or {}
+    candidate = {
+        "age": merged.get("age") if isinstance(merged.get("age"), int) else None,
+        "sex": merged.get("sex") if merged.get("sex") in ("male", "female", "other") else None,
+        "cancer_type": cancer_type if cancer_type in ("breast", "lung") else None,
+        "stage": _stage_group(merged.get("stage")),
+        "ecog": ecog if ecog in ("0", "1", "2", "3", "4") else "unknown",
+        "biomarkers": _breast_biomarkers(biomarkers) if cancer_type == "breast" else _lung_biomarkers(biomarkers),
+        "prior_treatments": [{"category": category} for category in merged.get("prior_treatments") or []],
+        "line_of_therapy": LINE_OF_THERAPY.get(merged.get("current_treatment_status"), "later_line"),
+    }
+
+    missing = [name for name in REQUIRED_FIELDS if candidate[name] is None]
+    if missing:
+        return None, missing, []
+    try:
+        return PatientProfile(**candidate).model_dump(mode="json"), [], []
+    except ValidationError as e:
+        return None, [], [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+
+
+def build_patient_profile(documents: List[Document]) -> Dict[str, Any]:
+    """Merge documents and build the candidate profile with provenance and conflicts"""
+    merged, provenance, conflicts = merge_documents(documents)
+    profile, missing, errors = to_profile(merged)
+    return {
+        "profile": profile,
+        "missing_fields": missing,
+        "validation_errors": errors,
+        "provenance": provenance,
+        "conflicts": conflicts,
+        "merged_biomarker_data": merged,
+    }
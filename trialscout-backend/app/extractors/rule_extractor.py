@@ -0,0 +1,522 @@
+"""
+Deterministic fast-path biomarker extraction
+
+Regex rules for the highly regular ways pathology reports and oncology
+notes state biomarkers ("ER: Positive (95%)", "HER2 IHC 1+", "EGFR exon 19
+deletion detected", "PD-L1 TPS 80%"). Produces the same JSON shape as
+BiomarkerExtractor._parse_response, plus per-field confidence, so the LLM
+only needs to be called when a field is mentioned in the report but the
+rules could not resolve it confidently.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Bump when rules change so cached results from older rules aren't reused
+RULES_VERSION = "3"
+
+CONFIDENCE_RANK = {"low": 0, "medium": 1, "high": 2}
+
+BREAST_BIOMARKERS = ("ER", "PR", "HER2", "Ki67_percentage")
+LUNG_BIOMARKERS = ("EGFR", "ALK", "ROS1", "KRAS", "BRAF", "MET", "PD_L1")
+CORE_FIELDS = ("cancer_type", "stage", "ecog", "age", "sex", "current_treatment_status", "prior_treatments")
+
+# Terms that decide a status within a window after a biomarker label.
+# Negative phrases come first so "no rearrangement detected" isn't read as "detected".
+_NEGATIVE = r"not\s+detected|no\s+(?:rearrangement|fusion|mutations?|amplification)|negative|wild[\s-]?type|absent"
+_POSITIVE = r"positive|detected|rearranged|rearrangement|fusion|present|mutant|mutated"
+# "Pending" / "not tested" before any status word means the result isn't in the report
+_PENDING = (
+    r"pending|not\s+(?:yet\s+)?(?:tested|performed|done|assessed|evaluated|available)|"
+    r"insufficient|quantity\s+not\s+sufficient|QNS|failed|indeterminate|awaited|to\s+follow|sent\s+out"
+)
+_STATUS_RE = re.compile(
+    rf"\b(?:(?P<pending>{_PENDING})|(?P<neg>{_NEGATIVE})|(?P<pos>{_POSITIVE}))\b", re.IGNORECASE
+)
+# A status window ends at the next biomarker label or the end of the sentence,
+# so "ALK and ROS1 testing pending; KRAS G12C detected" says nothing about ALK
+_BIOMARKER_LABEL = re.compile(
+    r"\b(?:ER|PR|HER2|Ki-?67|EGFR|ALK|ROS1|KRAS|NRAS|BRAF|MET|RET|NTRK\d?|PD-?L1|TP53|PIK3CA|STK11|KEAP1)\b"
+)
+_SENTENCE_END = re.compile(r"[.;](?=\s|$)|\n\s*\n")
+# Negation shortly before "metastatic" in the same sentence
+# ("No evidence of metastatic disease", "Not metastatic", "non-metastatic")
+_NEGATED = re.compile(
+    r"(?:(?:\bno\b|\bnot\b|\bnegative\s+for|\bwithout|\bfree\s+of|\brule\s+out)(?:\W+\w+){0,3}?|\bnon)\W*$",
+    re.IGNORECASE,
+)
+
+_ROMAN_ORDER = {"I": 1, "II": 2, "III": 3, "IV": 4}
+
+_TARGETED_DRUGS = (
+    r"palbociclib|ribociclib|abemaciclib|cdk4/6|osimertinib|erlotinib|gefitinib|afatinib|"
+    r"alectinib|lorlatinib|crizotinib|sotorasib|adagrasib|trastuzumab|pertuzumab|t-dm1|"
+    r"tucatinib|neratinib|lapatinib|alpelisib|capivasertib|olaparib|tki"
+)
+_CHEMO_DRUGS = (
+    r"chemotherapy|carboplatin|cisplatin|paclitaxel|nab-paclitaxel|docetaxel|pemetrexed|"
+    r"gemcitabine|capecitabine|eribulin|doxorubicin|cyclophosphamide"
+)
+_TREATMENT_CATEGORIES = (
+    ("surgery", r"lumpectomy|mastectomy|lobectomy|resection|\bsurgery|\bsurgical"),
+    ("chemotherapy", _CHEMO_DRUGS),
+    ("radiation", r"radiation|radiotherapy|radiosurgery|\bsbrt\b|\bsrs\b|\bxrt\b"),
+    ("targeted_therapy", _TARGETED_DRUGS),
+    ("immunotherapy", r"pembrolizumab|nivolumab|atezolizumab|durvalumab|immunotherapy"),
+    ("hormone_therapy", r"letrozole|anastrozole|exemestane|tamoxifen|fulvestrant|endocrine therapy|aromatase inhibitor"),
+)
+# Sentences describing treatment already received (not plans or options)
+_HISTORY_CUE = re.compile(
+    r"treated with|status post|\bs/p\b|received(?!\s*:)|underwent|previously|progress\w* (?:on|after)|prior (?:treatment|therapy)",
+    re.IGNORECASE,
+)
+_HISTORY_HEADING = re.compile(
+    r"prior (?:treatments?|therap(?:y|ies))|treatment history|oncologic history|past oncologic", re.IGNORECASE
+)
+# Heading lines ("PHYSICAL EXAM:", "[ASSESSMENT]") end a history section
+_SECTION_BREAK = re.compile(r"^\s*(?:\[[^\]]+\]|(?:\*\*)?[A-Z][A-Z /&()\-]{2,60}:(?:\*\*)?)\s*$")
+# ...but not negations, guideline text, plans or family history
+# ("No prior chemotherapy", "typically treated with", "Mother: ... treated with")
+_NOT_HISTORY = re.compile(
+    r"\bno (?:prior|previous|history)|\bnever\b|\bdenies\b|"
+    r"typically|may be|consider|recommend|option|guideline|if\s|risk of|propensity|"
+    r"\b(?:mother|father|sister|brother|aunt|uncle|cousin|grandmother|grandfather)\b",
+    re.IGNORECASE,
+)
+
+
+class Field:
+    """A resolved field value with its confidence and evidence"""
+
+    __slots__ = ("value", "confidence", "mentioned", "details")
+
+    def __init__(self, value: Any = "unknown", confidence: str = "low", mentioned: bool = False, details: str = ""):
+        self.value = value
+        self.confidence = confidence
+        self.mentioned = mentioned
+        self.details = details
+
+    @property
+    def resolved(self) -> bool:
+        return self.value not in ("unknown", None, [])
+
+
+def _snippet(text: str, start: int, end: int) -> str:
+    return " ".join(text[start:end].split())[:160]
+
+
+def _status_after(text: str, label: str, window: int = 220) -> Field:
+    """
+    Find `label`, then read the first positive/negative term after it
+
+    The window ends at the next biomarker label or the sentence end. An
+    explicit "Result:" line near the label is high confidence; a status
+    word further away is medium; "pending" / "not tested" first leaves the
+    field unknown.
+    """
+    field = Field()
+    for match in re.finditer(label, text, re.IGNORECASE):
+        field.mentioned = True
+        segment = text[match.end():match.end() + window]
+        for boundary in (_BIOMARKER_LABEL.search(segment), _SENTENCE_END.search(segment)):
+            if boundary:
+                segment = segment[:boundary.start()]
+        status = _STATUS_RE.search(segment)
+        if not status or status.group("pending"):
+            continue
+        value = "absent" if status.group("neg") else "present"
+        explicit = re.search(r"result\s*:|:\s*$", segment[:status.start()], re.IGNORECASE | re.MULTILINE)
+        confidence = "high" if explicit or status.start() < 40 else "medium"
+        if CONFIDENCE_RANK[confidence] > CONFIDENCE_RANK[field.confidence] or not field.resolved:
+            field = Field(value, confidence, True, _snippet(text, match.start(), match.end() + status.end()))
+        if confidence == "high":
+            break
+    return field
+
+
+def extract_age(text: str) -> Field:
+    match = re.search(r"\(Age:\s*(\d{1,3})", text) or re.search(r"\bAge:\s*(\d{1,3})\b", text)
+    if match:
+        return Field(int(match.group(1)), "high", True, match.group(0))
+    match = re.search(r"\b(\d{2,3})-year-old\b", text)
+    if match:
+        return Field(int(match.group(1)), "medium", True, match.group(0))
+    return Field(None, "low", bool(re.search(r"\bage\b|year-old|DOB", text, re.IGNORECASE)))
+
+
+def extract_sex(text: str) -> Field:
+    match = re.search(r"\bSex:\s*(Male|Female)\b", text, re.IGNORECASE)
+    if match:
+        return Field(match.group(1).lower(), "high", True, match.group(0))
+    match = re.search(r"year-old\s+(male|female|man|woman|gentleman|lady)\b", text, re.IGNORECASE)
+    if match:
+        value = "male" if match.group(1).lower() in ("male", "man", "gentleman") else "female"
+        return Field(value, "medium", True, match.group(0))
+    return Field("unknown", "low", bool(re.search(r"\bsex\b|\bgender\b", text, re.IGNORECASE)))
+
+
+def extract_cancer_type(text: str) -> Field:
+    breast = len(re.findall(
+        r"breast (?:cancer|carcinoma|primary)|ductal carcinoma|lobular carcinoma|TNBC", text, re.IGNORECASE
+    ))
+    lung = len(re.findall(
+        r"NSCLC|non-small cell|lung (?:adenocarcinoma|cancer|primary)|adenocarcinoma,\s*lung", text, re.IGNORECASE
+    ))
+    if breast and not lung:
+        return Field("breast", "high", True, f"{breast} breast cancer mentions")
+    if lung and not breast:
+        return Field("lung", "high", True, f"{lung} lung cancer mentions")
+    if breast >= 3 * lung and breast:
+        return Field("breast", "medium", True, f"{breast} breast vs {lung} lung mentions")
+    if lung >= 3 * breast and lung:
+        return Field("lung", "medium", True, f"{lung} lung vs {breast} breast mentions")
+    return Field("unknown", "low", bool(breast or lung))
+
+
+def _negated(text: str, start: int) -> bool:
+    """True if the sentence before `start` negates what follows ("no evidence of", "not", "non-")"""
+    sentence_start = max(text.rfind(c, 0, start) for c in ".;\n") + 1
+    return bool(_NEGATED.search(text[sentence_start:start]))
+
+
+def extract_stage(text: str) -> Field:
+    explicit = [
+        (m.group(1).upper(), (m.group(2) or "").upper(), m)
+        for m in re.finditer(r"\bstage\s+(IV|III|II|I)([ABC])?\b", text, re.IGNORECASE)
+    ]
+    metastatic = None
+    for m in re.finditer(r"\bmetasta(?:tic|ses|sis)\b|\bM1[abc]?\b|\brecurrent\b", text, re.IGNORECASE):
+        line_start = text.rfind("\n", 0, m.start()) + 1
+        line_end = text.find("\n", m.end())
+        if _NOT_HISTORY.search(text[line_start:line_end if line_end != -1 else None]) or _negated(text, m.start()):
+            continue
+        metastatic = m
+        break
+
+    if metastatic:
+        stage_iv = [e for e in explicit if e[0] == "IV"]
+        if stage_iv:
+            group, sub, m = stage_iv[-1]
+            return Field(group + sub, "high", True, m.group(0))
+        if explicit:
+            # An earlier stage is stated explicitly (e.g. at original diagnosis):
+            # never override it, leave the conflict to the LLM
+            group, sub, m = explicit[-1]
+            return Field(group + sub, "low", True,
+                         f"{m.group(0)}; {_snippet(text, metastatic.start(), metastatic.end() + 40)}")
+        return Field("IV", "medium", True, _snippet(text, metastatic.start(), metastatic.end() + 40))
+
+    if explicit:
+        distinct = {e[0] for e in explicit}
+        group, sub, m = max(explicit, key=lambda e: _ROMAN_ORDER[e[0]])
+        return Field(group + sub, "high" if len(distinct) == 1 else "medium", True, m.group(0))
+
+    return Field("unknown", "low", bool(re.search(r"\bstag(?:e|ing)\b", text, re.IGNORECASE)))
+
+
+def extract_ecog(text: str) -> Field:
+    values = []
+    for m in re.finditer(
+        r"\bECOG(?:\s+performance\s+status|\s+PS)?\s*(?:[:=]|is|of|remains)?\s*([0-4])(?!\s*[-–]\s*\d)",
+        text, re.IGNORECASE,
+    ):
+        values.append((m.group(1), m.group(0)))
+    mentioned = bool(re.search(r"\bECOG\b|performance status", text, re.IGNORECASE))
+    if not values:
+        return Field("unknown", "low", mentioned)
+    distinct = {v for v, _ in values}
+    value, evidence = values[-1]
+    return Field(value, "high" if len(distinct) == 1 else "medium", True, evidence)
+
+
+def _receptor(text: str, name: str, abbreviation: str) -> Field:
+    # Structured report: "Estrogen Receptor (ER) ...\n  RESULT: POSITIVE\n  Tumor cell staining: 95%"
+    m = re.search(
+        rf"{name}[^\n]*\n\s*RESULT:\s*(POSITIVE|NEGATIVE)(?:[\s\S]{{0,60}}?staining:\s*(\d{{1,3}})%)?",
+        text, re.IGNORECASE,
+    )
+    if m:
+        value = "present" if m.group(1).upper() == "POSITIVE" else "absent"
+        details = f"{abbreviation} {m.group(1).title()}" + (f" ({m.group(2)}%)" if m.group(2) else "")
+        return Field(value, "high", True, details)
+
+    # Inline: "ER: Positive (95%)", "ER positive", "ER-negative"
+    m = re.search(rf"\b{abbreviation}\s*[:\-]?\s*(positive|negative)\b(\s*\(\d{{1,3}}%\))?", text, re.IGNORECASE)
+    if m:
+        value = "present" if m.group(1).lower() == "positive" else "absent"
+        return Field(value, "high" if m.group(2) else "medium", True, m.group(0).strip())
+
+    # Shorthand: "ER+/PR+/HER2-", "ER 90%+"
+    m = re.search(rf"\b{abbreviation}\s?(\d{{1,3}}%)?\s?([+-])(?=[/\s,)]|$)", text, re.MULTILINE)
+    if m:
+        value = "present" if m.group(2) == "+" else "absent"
+        return Field(value, "medium", True, m.group(0).strip())
+
+    # Percentage only: "ER 90%, PR 70%" (>= 1% staining counts as positive)
+    m = re.search(rf"\b{abbreviation}\s+(\d{{1,3}})%", text)
+    if m:
+        value = "present" if int(m.group(1)) >= 1 else "absent"
+        return Field(value, "medium", True, m.group(0))
+
+    mentioned = bool(re.search(rf"\b{abbreviation}\b|{name}", text, re.IGNORECASE))
+    return Field("unknown", "low", mentioned)
+
+
+def extract_her2(text: str) -> Field:
+    # Structured report: "HER2 Immunohistochemistry ...:\n  RESULT: 1+ (HER2-LOW / HER2-NEGATIVE)"
+    m = re.search(r"HER2[^\n]*\n\s*RESULT:\s*([0-3])\+?", text, re.IGNORECASE)
+    score = None
+    confidence = "high"
+    if m:
+        score = int(m.group(1))
+    else:
+        m = re.search(r"HER2(?:/neu)?\s*(?:\(?IHC\)?)?\s*[:=]?\s*(?:IHC\s*)?([0-3])\+", text, re.IGNORECASE)
+        if m:
+            score = int(m.group(1))
+            confidence = "high" if re.search(r"IHC", m.group(0), re.IGNORECASE) else "medium"
+
+    fish_positive = re.search(r"(?:FISH|ISH)[^\n]{0,40}?\b(positive|amplified)\b", text, re.IGNORECASE)
+    fish_negative = re.search(r"(?:FISH|ISH)[^\n]{0,40}?\b(negative|not amplified)\b|2\+/(?:ISH|FISH)-", text, re.IGNORECASE)
+
+    if score is not None:
+        details = f"IHC {score}+"
+        if score == 3:
+            return Field("positive", confidence, True, details)
+        if score == 2:
+            if fish_positive and not fish_negative:
+                return Field("positive", confidence, True, details + ", ISH amplified")
+            if fish_negative:
+                return Field("low", confidence, True, details + ", ISH not amplified")
+            return Field("unknown", "low", True, details + " (equivocal, ISH result not found)")
+        if score == 1:
+            return Field("low", confidence, True, details)
+        return Field("negative", confidence, True, details)
+
+    m = re.search(r"\bHER2[\s-]?(low|positive|negative|\+)(?![/\w])", text, re.IGNORECASE)
+    if m:
+        value = {"low": "low", "positive": "positive", "+": "positive", "negative": "negative"}[m.group(1).lower()]
+        return Field(value, "medium", True, m.group(0))
+
+    return Field("unknown", "low", bool(re.search(r"\bHER2\b", text, re.IGNORECASE)))
+
+
+def extract_ki67(text: str) -> Field:
+    m = re.search(r"Ki-?67[^\n]*\n\s*RESULT:\s*(\d{1,3})\s*%", text, re.IGNORECASE)
+    if m:
+        return Field(int(m.group(1)), "high", True, m.group(0).strip())
+    # Several inline mentions (history, then restaging): the latest is most current
+    matches = list(re.finditer(r"Ki-?67[^\n\d]{0,40}(\d{1,3})\s*%", text, re.IGNORECASE))
+    if matches:
+        m = matches[-1]
+        return Field(int(m.group(1)), "medium", True, m.group(0).strip())
+    return Field(None, "low", bool(re.search(r"Ki-?67", text, re.IGNORECASE)))
+
+
+def extract_egfr(text: str) -> Tuple[Field, Optional[str]]:
+    mutation_re = re.compile(
+        r"exon\s*19\s*del\w*|del\s*19|L858R|exon\s*20\s*ins\w*|T790M|G719\w|L861Q|S768I", re.IGNORECASE
+    )
+    for m in re.finditer(r"\bEGFR\b", text):
+        segment = text[m.end():m.end() + 250]
+        mutation = mutation_re.search(segment)
+        if not mutation:
+            continue
+        after = segment[mutation.end():mutation.end() + 30]
+        if re.match(r"\s*:?\s*(?:mutation:?\s*)?not\s+detected", after, re.IGNORECASE):
+            continue
+        details = _snippet(text, m.start(), m.end() + mutation.end())
+        confidence = "high" if mutation.start() < 80 else "medium"
+        return Field("present", confidence, True, details), mutation.group(0)
+
+    field = _status_after(text, r"\bEGFR\b(?!\s*C797S|\s*T790M)")
+    return field, None
+
+
+def _mutation_status(text: str, gene: str, variants: str) -> Tuple[Field, Optional[str]]:
+    for m in re.finditer(rf"\b{gene}\b", text):
+        segment = text[m.end():m.end() + 200]
+        variant = re.search(variants, segment, re.IGNORECASE)
+        if variant:
+            after = segment[variant.end():variant.end() + 40]
+            if re.match(r"[^\n]{0,20}?(?:not\s+detected|negative)", after, re.IGNORECASE):
+                continue
+            return Field("present", "high" if variant.start() < 60 else "medium", True,
+                         _snippet(text, m.start(), m.end() + variant.end())), variant.group(0)
+    return _status_after(text, rf"\b{gene}\b"), None
+
+
+def extract_pdl1(text: str) -> Tuple[Field, Optional[int]]:
+    m = re.search(r"PD-?L1[\s\S]{0,200}?(?:TPS|Tumor Proportion Score)\)?\s*[:=]?\s*(<?)\s*(\d{1,3})\s*%",
+                  text, re.IGNORECASE)
+    if m:
+        percentage = int(m.group(2))
+        status = "absent" if m.group(1) or percentage < 1 else "present"
+        return Field(status, "high", True, _snippet(text, m.start(), m.end())), percentage
+    field = _status_after(text, r"PD-?L1")
+    if field.confidence == "high":
+        field.confidence = "medium"  # status without a TPS is less useful for matching
+    return field, None
+
+
+def extract_treatment_status(text: str) -> Field:
+    m = re.search(rf"progress\w*\s+(?:on|after|despite|through)\s+[^.\n]{{0,60}}?\b({_TARGETED_DRUGS})",
+                  text, re.IGNORECASE)
+    if m:
+        return Field("progressed_on_targeted", "medium", True, _snippet(text, m.start(), m.end()))
+    m = re.search(rf"progress\w*\s+(?:on|after|despite|through)\s+[^.\n]{{0,60}}?\b({_CHEMO_DRUGS})",
+                  text, re.IGNORECASE)
+    if m:
+        return Field("progressed_on_chemo", "medium", True, _snippet(text, m.start(), m.end()))
+    m = re.search(r"newly diagnosed|treatment[\s-]na[iï]ve", text, re.IGNORECASE)
+    if m:
+        return Field("newly_diagnosed", "medium", True, m.group(0))
+    m = re.search(r"currently (?:on|receiving)\s+\w+", text, re.IGNORECASE)
+    if m:
+        return Field("on_treatment", "medium", True, m.group(0))
+    mentioned = bool(re.search(r"progress|treatment|therapy", text, re.IGNORECASE))
+    return Field("unknown", "low", mentioned)
+
+
+def treatment_categories(text: str) -> List[str]:
+    """PatientProfile treatment categories named in a free-text treatment (e.g. "Letrozole")"""
+    return [category for category, pattern in _TREATMENT_CATEGORIES if re.search(pattern, text, re.IGNORECASE)]
+
+
+def extract_prior_treatments(text: str) -> Field:
+    """
+    Treatment categories from history lines
+
+    A line counts when it sits under a treatment-history heading or itself
+    describes treatment received, and isn't guideline text or family history.
+    """
+    found: List[str] = []
+    mentioned = False
+    in_history = False
+    for line in text.splitlines():
+        if _HISTORY_HEADING.search(line):
+            in_history = True
+        elif _SECTION_BREAK.match(line):
+            in_history = False
+        if not (in_history or _HISTORY_CUE.search(line)) or _NOT_HISTORY.search(line):
+            continue
+        mentioned = mentioned or bool(_HISTORY_CUE.search(line))
+        for category, pattern in _TREATMENT_CATEGORIES:
+            if category not in found and re.search(pattern, line, re.IGNORECASE):
+                found.append(category)
+    if found:
+        return Field(found, "medium", True, "keyword match in treatment history")
+    return Field([], "low", mentioned)
+
+
+class RuleBasedExtractor:
+    """Regex fast path producing BiomarkerExtractor-shaped results"""
+
+    def extract(self, report_text: str, cancer_type: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Field]]:
+        """
+        Extract what the rules can from a report
+
+        Returns (data, fields): `data` has the same shape as the LLM
+        response (plus "field_confidence"); `fields` keeps per-field
+        evidence for deciding whether the LLM is still needed.
+        """
+        fields: Dict[str, Field] = {
+            "age": extract_age(report_text),
+            "sex": extract_sex(report_text),
+            "cancer_type": extract_cancer_type(report_text),
+            "stage": extract_stage(report_text),
+            "ecog": extract_ecog(report_text),
+            "current_treatment_status": extract_treatment_status(report_text),
+            "prior_treatments": extract_prior_treatments(report_text),
+        }
+        # Newly diagnosed and no treatment found: nothing for the LLM to look for
+        if fields["current_treatment_status"].value == "newly_diagnosed" and not fields["prior_treatments"].resolved:
+            fields["prior_treatments"].mentioned = False
+        if cancer_type in ("breast", "lung"):
+            fields["cancer_type"] = Field(cancer_type, "high", True, "cancer_type hint")
+        detected = fields["cancer_type"].value
+
+        biomarkers: Dict[str, Any] = {}
+        if detected in ("breast", "unknown"):
+            for key, field in (
+                ("ER", _receptor(report_text, "Estrogen Receptor", "ER")),
+                ("PR", _receptor(report_text, "Progesterone Receptor", "PR")),
+                ("HER2", extract_her2(report_text)),
+            ):
+                fields[key] = field
+                biomarkers[key] = {"value": field.value, "confidence": field.confidence, "details": field.details}
+            ki67 = fields["Ki67_percentage"] = extract_ki67(report_text)
+            biomarkers["Ki67_percentage"] = {"value": ki67.value, "confidence": ki67.confidence}
+
+        if detected in ("lung", "unknown"):
+            egfr, egfr_mutation = extract_egfr(report_text)
+            kras, kras_mutation = _mutation_status(report_text, "KRAS", r"G12[CDVARS]|G13\w|Q61\w")
+            braf, braf_mutation = _mutation_status(report_text, "BRAF", r"V600E|V600K")
+            met, met_alteration = _mutation_status(report_text, "MET", r"exon\s*14\s*skipping|amplification")
+            pdl1, pdl1_percentage = extract_pdl1(report_text)
+            fields.update({
+                "EGFR": egfr, "ALK": _status_after(report_text, r"\bALK\b"),
+                "ROS1": _status_after(report_text, r"\bROS1\b"), "KRAS": kras,
+                "BRAF": braf, "MET": met, "PD_L1": pdl1,
+            })
+            biomarkers.update({
+                "EGFR": {"status": egfr.value, "mutation": egfr_mutation, "confidence": egfr.confidence},
+                "ALK": {"value": fields["ALK"].value, "confidence": fields["ALK"].confidence},
+                "ROS1": {"value": fields["ROS1"].value, "confidence": fields["ROS1"].confidence},
+                "KRAS": {"status": kras.value, "mutation": kras_mutation, "confidence": kras.confidence},
+                "BRAF": {"status": braf.value, "mutation": braf_mutation, "confidence": braf.confidence},
+                "MET": {"status": met.value, "alteration": met_alteration, "confidence": met.confidence},
+                "PD_L1": {"status": pdl1.value, "percentage": pdl1_percentage, "confidence": pdl1.confidence},
+            })
+
+        data = {
+            "cancer_type": detected,
+            "stage": fields["stage"].value,
+            "ecog": fields["ecog"].value,
+            "age": fields["age"].value,
+            "sex": fields["sex"].value,
+            "current_treatment_status": fields["current_treatment_status"].value,
+            "biomarkers": biomarkers,
+            "prior_treatments": fields["prior_treatments"].value,
+            "field_confidence": {name: field.confidence for name, field in fields.items()},
+            "extraction_notes": "Extracted by deterministic rules",
+        }
+        return data, fields
+
+    @staticmethod
+    def unresolved_fields(fields: Dict[str, Field]) -> List[str]:
+        """
+        Fields the LLM should still look at
+
+        A field needs the LLM when the report mentions it but the rules left
+        it unknown or low-confidence. Fields the report never mentions stay
+        unknown; the LLM would not find them either.
+        """
+        return [
+            name for name, field in fields.items()
+            if field.mentioned and (not field.resolved or field.confidence == "low")
+        ]
+
+
+def merge_with_llm(rule_data: Dict[str, Any], rule_fields: Dict[str, Field], llm_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine rule and LLM results
+
+    High-confidence rule values win (they are read verbatim from the report);
+    everything else comes from the LLM.
+    """
+    merged = dict(llm_data)
+    merged["biomarkers"] = dict(llm_data.get("biomarkers") or {})
+    field_confidence = {}
+
+    for name, field in rule_fields.items():
+        use_rule = field.resolved and field.confidence == "high"
+        if name in CORE_FIELDS:
+            if use_rule or name not in llm_data:
+                merged[name] = rule_data[name]
+            field_confidence[name] = field.confidence if use_rule else "llm"
+        else:
+            if use_rule or name not in merged["biomarkers"]:
+                merged["biomarkers"][name] = rule_data["biomarkers"][name]
+            field_confidence[name] = field.confidence if use_rule else "llm"
+
+    merged["field_confidence"] = field_confidence
+    return merged
@@ -0,0 +1,209 @@
+"""
+Relevance-based slicing of report text before LLM extraction
+
+Pathology reports and oncology notes are mostly boilerplate for our
+purposes: medication lists, review of systems, disclaimers, signatures.
+The slicer splits a document into sections and paragraphs, scores each
+paragraph for biomarker, staging, ECOG, treatment-history and demographic
+content, and keeps the best-scoring paragraphs (with their section heading
+and neighbours as context) up to a fixed character budget, so the prompt
+size stays bounded no matter how long the document is. A document that
+already fits the budget is sent unchanged.
+
+Boilerplate sections still hold facts now and then (ECOG under vital
+signs, the current targeted therapy under medications), so their
+paragraphs are not dropped outright: they are cut down to the lines that
+match a relevance pattern and ranked below equally relevant clinical text.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from app.config import settings
+
+# Rough English average for Claude tokenization; only used for reporting
+CHARS_PER_TOKEN = 4
+
+# (weight, pattern) - a paragraph's score is the sum of weights of the patterns it matches
+RELEVANCE_PATTERNS: Tuple[Tuple[int, "re.Pattern"], ...] = tuple(
+    (weight, re.compile(pattern, re.IGNORECASE))
+    for weight, pattern in (
+        # Biomarkers
+        (5, r"\b(?:ER|PR|HER2|HER-2|Ki-?67|EGFR|ALK|ROS1|KRAS|BRAF|MET|RET|NTRK|PD-?L1|PIK3CA|BRCA[12]?|ESR1|TMB|MSI)\b"),
+        (4, r"estrogen receptor|progesterone receptor|\bIHC\b|\bFISH\b|\bISH\b|\bTPS\b|\bCPS\b"),
+        (3, r"positive|negative|detected|amplifi|mutation|deletion|rearrange|fusion|exon\s*\d+|\d+\s*\+"),
+        # Staging
+        (5, r"\bstage\s+[IV0]+[ABC]?\b|\b[cp]?T[0-4][a-d]?N[0-3][a-c]?M[01][a-c]?\b"),
+        (3, r"metasta|recurren|progress"),
+        # Performance status
+        (5, r"\bECOG\b|performance status|Karnofsky|\bKPS\b"),
+        # Treatment history
+        (3, r"treated with|status post|\bs/p\b|received|underwent|completed|started|discontinued|line of therapy"),
+        (3, r"chemotherapy|radiation|radiotherapy|surgery|mastectomy|lumpectomy|lobectomy|resection|immunotherapy"),
+        (3, r"inhibitor|mab\b|nib\b|ciclib|platin|taxel|letrozole|anastrozole|tamoxifen|fulvestrant"),
+        # Diagnosis and demographics
+        (3, r"carcinoma|adenocarcinoma|NSCLC|triple[\s-]negative|TNBC|histolog|grade\s+[1-3]"),
+        (3, r"\bAge:|\d+-year-old|\bSex:|\bDOB\b"),
+    )
+)
+
+# Sections that are mostly noise; only their matching lines are kept, at half score
+BOILERPLATE_SECTIONS = re.compile(
+    r"medications|allerg|review of systems|social history|family history|vital signs|"
+    r"electronically signed|signature|disclaimer|billing|cpt|icd|laboratory information|"
+    r"references|quality assurance|specimen handling|patient education",
+    re.IGNORECASE,
+)
+
+_RULE_LINE = re.compile(r"^\s*[=\-_*]{5,}\s*$")
+_HEADING_LINE = re.compile(r"^\s*(?:\d+\.\s*)?(?:\*\*)?([A-Z][A-Z0-9 /&(),'\-]{2,60}):?(?:\*\*)?\s*:?\s*$")
+
+# Paragraphs scoring at least this pull in their neighbours as context
+CONTEXT_SCORE = 8
+# Paragraphs longer than this are reduced to their matching lines (plus one line either side)
+MAX_BLOCK_CHARS = 1500
+
+
+@dataclass
+class Block:
+    """A paragraph of the source document"""
+    index: int
+    section: str
+    text: str
+    score: int = 0
+
+
+@dataclass
+class SliceResult:
+    """Sliced text plus the numbers needed to report savings"""
+    text: str
+    original_chars: int
+    kept_blocks: int
+    total_blocks: int
+    dropped_sections: List[str] = field(default_factory=list)
+
+    @property
+    def sliced_chars(self) -> int:
+        return len(self.text)
+
+    @property
+    def original_tokens(self) -> int:
+        return self.original_chars // CHARS_PER_TOKEN
+
+    @property
+    def sliced_tokens(self) -> int:
+        return self.sliced_chars // CHARS_PER_TOKEN
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.sliced_tokens)
+
+
+def split_blocks(text: str) -> List[Block]:
+    """Split a document into paragraphs, tagging each with its section heading"""
+    blocks: List[Block] = []
+    section = ""
+    current: List[str] = []
+
+    def flush():
+        if current:
+            body = "\n".join(current).strip()
+            if body:
+                blocks.append(Block(len(blocks), section, body))
+            current.clear()
+
+    for line in text.splitlines():
+        if _RULE_LINE.match(line):
+            flush()
+            continue
+        heading = _HEADING_LINE.match(line)
+        if heading:
+            flush()
+            section = heading.group(1).strip()
+            continue
+        if not line.strip():
+            flush()
+            continue
+        current.append(line.rstrip())
+    flush()
+    return blocks
+
+
+def score_text(text: str) -> int:
+    return sum(weight for weight, pattern in RELEVANCE_PATTERNS if pattern.search(text))
+
+
+def _condense(text: str, context: int = 1) -> str:
+    """Keep only the relevant lines of a paragraph, with context lines either side"""
+    lines = text.splitlines()
+    keep = set()
+    for i, line in enumerate(lines):
+        if score_text(line):
+            keep.update(range(i - context, i + context + 1))
+    kept = [lines[i] for i in sorted(keep) if 0 <= i < len(lines)]
+    return "\n".join(kept)[:MAX_BLOCK_CHARS]
+
+
+def slice_report(text: str, max_chars: Optional[int] = None) -> SliceResult:
+    """
+    Keep the relevant parts of a report within a character budget
+
+    Text within the budget is returned as is. Otherwise blocks are chosen
+    by score (ties keep document order) and emitted in document order,
+    under their section headings, with "..." marking gaps.
+    """
+    max_chars = max_chars or settings.extraction_prompt_max_chars
+    blocks = split_blocks(text)
+    if len(text) <= max_chars:
+        return SliceResult(text, len(text), len(blocks), len(blocks))
+
+    boilerplate = set()
+    for block in blocks:
+        if block.section and BOILERPLATE_SECTIONS.search(block.section):
+            boilerplate.add(block.index)
+            block.text = _condense(block.text, context=0)
+            block.score = (score_text(block.text) + 1) // 2
+            continue
+        if len(block.text) > MAX_BLOCK_CHARS:
+            block.text = _condense(block.text)
+        block.score = score_text(block.text)
+
+    selected = set()
+    budget = max_chars
+    for block in sorted(blocks, key=lambda b: (-b.score, b.index)):
+        if block.score <= 0 or budget <= 0:
+            break
+        candidates = [block]
+        if block.score >= CONTEXT_SCORE:
+            candidates += [
+                blocks[i] for i in (block.index - 1, block.index + 1)
+                if 0 <= i < len(blocks) and blocks[i].text
+            ]
+        for candidate in candidates:
+            cost = len(candidate.text) + len(candidate.section) + 8
+            if candidate.index not in selected and cost <= budget:
+                selected.add(candidate.index)
+                budget -= cost
+
+    parts: List[str] = []
+    last_index = -2
+    last_section = None
+    for index in sorted(selected):
+        block = blocks[index]
+        if index != last_index + 1 and parts:
+            parts.append("...")
+        if block.section and block.section != last_section:
+            parts.append(f"[{block.section}]")
+            last_section = block.section
+        parts.append(block.text)
+        last_index = index
+
+    return SliceResult(
+        text="\n".join(parts),
+        original_chars=len(text),
+        kept_blocks=len(selected),
+        total_blocks=len(blocks),
+        dropped_sections=sorted(
+            {blocks[i].section for i in boilerplate} - {blocks[i].section for i in selected}
+        ),
+    )
@@ -0,0 +1,22 @@
+"""Stable content hashes for cache and coalescing keys"""
+import hashlib
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize a value (or Pydantic model) to deterministic JSON"""
+    if isinstance(value, BaseModel):
+        value = value.model_dump(mode="json")
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def fingerprint(*parts: Any) -> str:
+    """SHA-256 hex digest over the canonical JSON of each part"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(canonical_json(part).encode("utf-8"))
+        digest.update(b"\x1e")  # record separator so ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
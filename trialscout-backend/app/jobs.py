@@ -0,0 +1,406 @@
+"""
+Asynchronous extraction jobs
+
+Uploads submitted to /api/v1/extraction-jobs are queued in the
+extraction_jobs table and processed by a fixed number of worker tasks per
+process. The uploaded bytes are kept out of the database, in one payload
+file per job under extraction_job_payload_dir, removed when the job
+finishes. Workers claim the oldest queued job with a conditional UPDATE, so
+several API processes can share one database without running a job twice,
+and a job whose worker died (no heartbeat for extraction_job_lease_seconds)
+is picked up again - queued work survives restarts.
+
+Idle workers sleep until a submission in their own process wakes them;
+they only re-check the table every extraction_job_idle_poll_seconds, for
+jobs submitted to another process.
+
+A job whose LLM call is refused (circuit open, upstream down) goes back
+to the queue with a not-before time instead of failing, up to
+extraction_job_max_requeues times.
+
+Every pipeline stage is appended to the job's event list; pollers read the
+job row and SSE subscribers are woken as soon as a local worker records a
+stage (and otherwise poll the row, for jobs running in another process).
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+
+from app.config import settings
+from app.database import SessionLocal
+from app.extractors.llm_client import LLMUnavailable
+from app.extractors.pipeline import extract_document
+from app.lanes import get_lane
+from app.metrics import counter
+from app.models.extraction_job_db import ExtractionJobDB, utc_now
+from app.ratelimit import AdmissionRejected
+from app.uploads import Upload
+import logging
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+extraction_jobs_total = counter(
+    "trialscout_extraction_jobs_total",
+    "Extraction jobs by lifecycle event",
+    ("event",),
+)
+
+
+_now = utc_now
+
+
+def _event(stage: str, **data) -> Dict[str, Any]:
+    return {"stage": stage, "at": _now().isoformat().replace("+00:00", "Z"), **data}
+
+
+def _payload_path(job_id: str) -> str:
+    return os.path.join(settings.extraction_job_payload_dir, job_id)
+
+
+def _store_payload(job_id: str, upload: Upload) -> None:
+    """Write an upload to the job's payload file (atomically; blocking)"""
+    directory = settings.extraction_job_payload_dir
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            upload.write_to(f)
+        os.replace(tmp_path, _payload_path(job_id))
+    except BaseException:
+        _remove(tmp_path)
+        raise
+
+
+def _load_payload(job_id: str) -> bytes:
+    try:
+        with open(_payload_path(job_id), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise ValueError("The uploaded document for this job is no longer available") from None
+
+
+def _remove_payload(job_id: str) -> None:
+    _remove(_payload_path(job_id))
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ExtractionJobQueue:
+    """SQLite-backed job queue with a bounded pool of async workers"""
+
+    def __init__(self):
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._updates: Dict[str, asyncio.Event] = {}
+        self._last_purge = 0.0
+
+    # -- database operations (blocking; run in lanes) --------------------
+
+    @staticmethod
+    def _count_queued() -> int:
+        db = SessionLocal()
+        try:
+            return db.query(ExtractionJobDB).filter(ExtractionJobDB.status == "queued").count()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _insert(job: ExtractionJobDB, upload: Upload) -> Dict[str, Any]:
+        """Store the payload file, then the row that makes it claimable"""
+        _store_payload(job.id, upload)
+        db = SessionLocal()
+        try:
+            db.add(job)
+            db.commit()
+            return job.to_dict()
+        except BaseException:
+            _remove_payload(job.id)
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _load(job_id: str) -> Optional[Dict[str, Any]]:
+        db = SessionLocal()
+        try:
+            job = db.get(ExtractionJobDB, job_id)
+            return job.to_dict() if job else None
+        finally:
+            db.close()
+
+    @staticmethod
+    def _claimable(now, stale_before):
+        return or_(
+            and_(
+                ExtractionJobDB.status == "queued",
+                or_(ExtractionJobDB.available_at.is_(None), ExtractionJobDB.available_at <= now),
+            ),
+            and_(ExtractionJobDB.status == "running", ExtractionJobDB.heartbeat_at < stale_before),
+        )
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest queued (or abandoned) job"""
+        db = SessionLocal()
+        try:
+            now = _now()
+            stale_before = now - timedelta(seconds=settings.extraction_job_lease_seconds)
+            candidates = (
+                db.query(ExtractionJobDB.id)
+                .filter(self._claimable(now, stale_before))
+                .order_by(ExtractionJobDB.created_at)
+                .limit(5)
+                .all()
+            )
+            for (job_id,) in candidates:
+                now = _now()
+                claimed = (
+                    db.query(ExtractionJobDB)
+                    .filter(ExtractionJobDB.id == job_id, self._claimable(now, stale_before))
+                    .update({"status": "running", "started_at": now, "heartbeat_at": now, "available_at": None},
+                            synchronize_session=False)
+                )
+                db.commit()
+                if claimed:
+                    job = db.get(ExtractionJobDB, job_id)
+                    job.events = list(job.events or []) + [_event("started")]
+                    job.stage = "started"
+                    db.commit()
+                    return {
+                        "id": job.id,
+                        "content_type": job.content_type,
+                        "filename": job.filename,
+                        "cancer_type": job.cancer_type,
+                        "requeues": job.requeues or 0,
+                    }
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def _record(job_id: str, event: Dict[str, Any], **fields) -> None:
+        """Append a progress event (and optionally update columns); refreshes the heartbeat"""
+        db = SessionLocal()
+        try:
+            job = db.get(ExtractionJobDB, job_id)
+            if job is None:
+                return
+            job.events = list(job.events or []) + [event]
+            job.stage = event["stage"]
+            job.heartbeat_at = _now()
+            for name, value in fields.items():
+                setattr(job, name, value)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _purge_finished() -> int:
+        db = SessionLocal()
+        try:
+            cutoff = _now() - timedelta(hours=settings.extraction_job_ttl_hours)
+            finished = db.query(ExtractionJobDB).filter(
+                ExtractionJobDB.status.in_(TERMINAL_STATUSES), ExtractionJobDB.finished_at < cutoff
+            )
+            job_ids = [job_id for (job_id,) in finished.with_entities(ExtractionJobDB.id)]
+            removed = finished.delete(synchronize_session=False)
+            db.commit()
+            for job_id in job_ids:
+                _remove_payload(job_id)  # normally already gone when the job finished
+            return removed
+        finally:
+            db.close()
+
+    # -- public API -------------------------------------------------------
+
+    async def submit(self, upload: Upload, cancer_type: Optional[str]) -> Dict[str, Any]:
+        """Persist a new job and wake this process's idle workers; rejects when the backlog is full"""
+        lane = get_lane("interactive")
+        queued = await lane.run(self._count_queued)
+        if queued >= settings.extraction_job_max_queued:
+            extraction_jobs_total.inc(event="rejected")
+            raise AdmissionRejected(30.0, "extraction job queue is full")
+
+        job = ExtractionJobDB(
+            id=uuid.uuid4().hex,
+            status="queued",
+            stage="queued",
+            filename=upload.filename,
+            content_type=upload.content_type,
+            cancer_type=cancer_type,
+            events=[_event("queued")],
+            created_at=_now(),
+        )
+        state = await lane.run(self._insert, job, upload)
+        extraction_jobs_total.inc(event="submitted")
+        self._wake()
+        return state
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await get_lane("interactive").run(self._load, job_id)
+
+    async def stream(self, job_id: str, last_event_id: int = -1) -> AsyncIterator[str]:
+        """
+        Server-sent events for one job
+
+        Each recorded stage is sent as `event: <stage>` with `id: <index>`
+        (so EventSource reconnects resume via Last-Event-ID); the stream ends
+        with `event: succeeded` or `event: failed` carrying the full job.
+        """
+        sent = last_event_id + 1
+        idle = 0.0
+        while True:
+            update = self._updates.setdefault(job_id, asyncio.Event())
+            job = await self.get(job_id)
+            if job is None:
+                self._updates.pop(job_id, None)
+                yield f"event: error\ndata: {json.dumps({'detail': 'Job not found'})}\n\n"
+                return
+
+            events = job["events"]
+            for index in range(sent, len(events)):
+                yield f"id: {index}\nevent: {events[index]['stage']}\ndata: {json.dumps(events[index])}\n\n"
+            sent = max(sent, len(events))
+
+            if job["status"] in TERMINAL_STATUSES:
+                self._updates.pop(job_id, None)
+                yield f"event: {job['status']}\ndata: {json.dumps(job)}\n\n"
+                return
+
+            try:
+                await asyncio.wait_for(update.wait(), timeout=settings.extraction_job_poll_seconds)
+                idle = 0.0
+            except asyncio.TimeoutError:
+                idle += settings.extraction_job_poll_seconds
+                if idle >= 15:
+                    yield ": keep-alive\n\n"
+                    idle = 0.0
+
+    # -- workers ----------------------------------------------------------
+
+    def _notify(self, job_id: str) -> None:
+        update = self._updates.pop(job_id, None)
+        if update is not None:
+            update.set()
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        lane = get_lane("extraction")
+        self._notify(job_id)
+
+        async def progress(stage: str, data: Dict[str, Any]) -> None:
+            await lane.run(self._record, job_id, _event(stage, **data))
+            self._notify(job_id)
+
+        try:
+            content = await lane.run(_load_payload, job_id)
+            upload = Upload.from_bytes(content, job["content_type"], job["filename"])
+            result = await extract_document(upload, job["cancer_type"], progress)
+        except LLMUnavailable as e:
+            requeues = job["requeues"] + 1
+            if requeues > settings.extraction_job_max_requeues:
+                logger.warning(f"Extraction job {job_id} failed: LLM unavailable after {job['requeues']} requeues")
+                await self._fail(job_id, f"{e.reason}; gave up after {job['requeues']} retries")
+                return
+            # Upstream is down: put the job back, held until the breaker's retry time,
+            # rather than failing it (this worker moves on to other jobs meanwhile)
+            await lane.run(
+                self._record, job_id, _event("requeued", reason=e.reason, retry_after=round(e.retry_after, 1)),
+                status="queued", started_at=None, requeues=requeues,
+                available_at=_now() + timedelta(seconds=e.retry_after),
+            )
+            self._notify(job_id)
+            extraction_jobs_total.inc(event="requeued")
+            asyncio.get_running_loop().call_later(e.retry_after, self._wake)
+            return
+        except Exception as e:
+            logger.error(f"Extraction job {job_id} failed: {e}", exc_info=not isinstance(e, ValueError))
+            await self._fail(job_id, str(e))
+            return
+
+        await lane.run(
+            self._record, job_id, _event("done", cache_hit=result["cache_hit"]),
+            status="succeeded", result=result, finished_at=_now(),
+        )
+        await lane.run(_remove_payload, job_id)
+        self._notify(job_id)
+        extraction_jobs_total.inc(event="succeeded")
+
+    async def _fail(self, job_id: str, error: str) -> None:
+        lane = get_lane("extraction")
+        await lane.run(
+            self._record, job_id, _event("failed", error=error),
+            status="failed", error=error, finished_at=_now(),
+        )
+        await lane.run(_remove_payload, job_id)
+        self._notify(job_id)
+        extraction_jobs_total.inc(event="failed")
+
+    async def _worker(self, index: int) -> None:
+        lane = get_lane("extraction")
+        while True:
+            try:
+                if time.monotonic() - self._last_purge > 600:
+                    self._last_purge = time.monotonic()
+                    removed = await lane.run(self._purge_finished)
+                    if removed:
+                        logger.info(f"Purged {removed} finished extraction jobs")
+
+                # Cleared before claiming, so a submission during the claim still wakes us
+                self._wakeup.clear()
+                job = await lane.run(self._claim)
+                if job is None:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=settings.extraction_job_idle_poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass  # look for jobs submitted to other processes
+                    continue
+                await self._process(job)
+            except asyncio.CancelledError:
+                raise
+            except AdmissionRejected as e:
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                logger.error(f"Extraction job worker {index} error: {e}", exc_info=True)
+                await asyncio.sleep(settings.extraction_job_poll_seconds)
+
+    def start(self) -> None:
+        """Start the worker tasks (call from the running event loop)"""
+        if self._workers:
+            return
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"extraction-job-worker-{i}")
+            for i in range(settings.extraction_job_workers)
+        ]
+        logger.info(f"Started {len(self._workers)} extraction job workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers; interrupted jobs are reclaimed after their lease expires"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> Dict[str, int]:
+        return {"workers": len(self._workers), "subscribers": len(self._updates)}
+
+
+extraction_jobs = ExtractionJobQueue()
@@ -0,0 +1,150 @@
+"""
+Execution lanes
+
+Blocking work runs in one of a few sized lanes instead of on the event
+loop or the shared default threadpool:
+
+- interactive: patient-facing matching and trial reads
+- extraction:  PDF text extraction and LLM biomarker calls
+- rendering:   clinician brief PDF rendering
+- bulk:        bulk catalog writes and seeding
+
+Each lane has its own executor (so a backlog in one lane never occupies
+another lane's threads) and its own bounded queue; a full queue raises
+AdmissionRejected, which the API turns into 429 + Retry-After.
+
+CPU-bound work that would hold the GIL (PDF parsing, brief rendering) is
+handed from a lane thread to the shared process pool, so the lane still
+bounds how much of it is admitted while the work itself runs on other cores.
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.metrics import counter
+from app.ratelimit import AdmissionRejected, ConcurrencyLimiter
+
+lane_tasks = counter(
+    "trialscout_lane_tasks_total",
+    "Tasks submitted to execution lanes, by outcome",
+    ("lane", "outcome"),
+)
+lane_queue_seconds = counter(
+    "trialscout_lane_queue_seconds_total",
+    "Total time tasks spent waiting for a lane slot",
+    ("lane",),
+)
+
+
+class Lane:
+    """A named executor with bounded concurrency and a bounded queue"""
+
+    def __init__(self, name: str, workers: int, max_queue: int, executor: Optional[Executor] = None):
+        self.name = name
+        self.workers = workers
+        self.limiter = ConcurrencyLimiter(workers, max_queue, name=f"{name} lane")
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"lane-{name}"
+        )
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in this lane and await its result
+
+        The slot is held until the callable finishes, not until the awaiter
+        stops waiting: a cancelled caller can't stop a running thread, so
+        the slot stays taken until the thread is free again.
+        """
+        queued_at = time.perf_counter()
+        try:
+            release = await self.limiter.acquire()
+            lane_queue_seconds.inc(time.perf_counter() - queued_at, lane=self.name)
+            loop = asyncio.get_running_loop()
+            try:
+                future = self.executor.submit(functools.partial(fn, *args, **kwargs))
+            except BaseException:
+                release()
+                raise
+            future.add_done_callback(lambda _: _call_on_loop(loop, release))
+            result = await asyncio.wrap_future(future, loop=loop)
+        except AdmissionRejected:
+            lane_tasks.inc(lane=self.name, outcome="rejected")
+            raise
+        except Exception:
+            lane_tasks.inc(lane=self.name, outcome="error")
+            raise
+        lane_tasks.inc(lane=self.name, outcome="ok")
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "active": self.limiter.active,
+            "waiting": self.limiter.waiting,
+        }
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _call_on_loop(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+    """Run callback on loop from any thread (dropped if the loop has closed)"""
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass
+
+
+def _build_lanes() -> Dict[str, Lane]:
+    return {
+        "interactive": Lane("interactive", settings.lane_interactive_workers, settings.lane_interactive_queue),
+        "extraction": Lane("extraction", settings.lane_extraction_workers, settings.lane_extraction_queue),
+        "rendering": Lane("rendering", settings.lane_rendering_workers, settings.lane_rendering_queue),
+        "bulk": Lane("bulk", settings.lane_bulk_workers, settings.lane_bulk_queue),
+    }
+
+
+LANES: Dict[str, Lane] = _build_lanes()
+
+
+def get_lane(name: str) -> Lane:
+    """Look up a lane by name"""
+    return LANES[name]
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def process_pool_workers() -> int:
+    return settings.process_pool_workers or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Shared worker processes for CPU-bound work, started on first use"""
+    global _process_pool
+    if _process_pool is None:
+        # spawn: forking a process that already runs lane threads is unsafe
+        _process_pool = ProcessPoolExecutor(
+            max_workers=process_pool_workers(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def reset_process_pool() -> None:
+    """Drop a broken pool (a worker died); the next caller starts a fresh one"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def shutdown_lanes() -> None:
+    for lane in LANES.values():
+        lane.shutdown()
+    reset_process_pool()
@@ -3,26 +3,46 @@ TrialScout Backend API
 FastAPI application for clinical trial matching
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
+from typing import Annotated, List, Optional
+import asyncio
 import logging
 import os
+from time import perf_counter
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, WrapValidator
 
 from app.models.patient import PatientProfile, CancerType
 from app.api.extraction import router as extraction_router
+from app.api.extraction_jobs import router as extraction_jobs_router
+from app.api.admin import router as admin_router
+from app.api.brief import BRIEF_HEADERS, router as brief_router
 from app.models.trial import Trial, TrialPartialUpdate
-from app.models.matching import MatchingResponse
+from app.models.matching import MatchingResponse, MatchPage
+from app.matching.matcher import match_stage_seconds
 from app.models.trial_db import TrialDB
+from app.models.extraction_job_db import ExtractionJobDB  # noqa: F401 - registers the table
 from app.database import get_db, engine, Base
 from app.data.constants import DATASET_VERSION
-
-# Create database tables on startup
-Base.metadata.create_all(bind=engine)
+from app.catalog import catalog
+from app.config import settings
+from app.compression import CompressionMiddleware
+from app.metrics import REGISTRY, Sampler
+from app.request_metrics import RequestMetricsMiddleware
+from app.fingerprint import fingerprint
+from app.singleflight import SingleFlight
+from app.ratelimit import RateLimitMiddleware, AdmissionRejected
+from app.uploads import UploadLimitMiddleware
+from app.lanes import LANES, get_lane, shutdown_lanes
+from app.extractors.llm_client import llm_client
+from app.jobs import extraction_jobs
+from app.briefs import brief_cache
+from app.match_store import match_store
 
 # Load environment variables
 load_dotenv()
@@ -31,15 +51,55 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup and shutdown
+
+    Importing this module only defines the app; tables are created, the
+    catalog is loaded and job workers start here, before the first request.
+    Heavy libraries (the LLM SDK, PDF parsers, ReportLab) are imported by the
+    code paths that use them.
+    """
+    Base.metadata.create_all(bind=engine)
+    try:
+        # Load and compile the trial catalog before serving traffic
+        catalog.warm()
+    except Exception as e:
+        # Readiness stays false; the cache loads lazily on the first request
+        logger.error(f"Catalog warmup failed: {e}")
+    # Jobs queued before a restart resume here
+    extraction_jobs.start()
+    # Optionally pick up catalog changes made outside the API (seed scripts, SQL)
+    catalog_watch = None
+    if settings.catalog_watch_interval_seconds > 0:
+        catalog_watch = asyncio.create_task(catalog.watch(settings.catalog_watch_interval_seconds))
+    yield
+    if catalog_watch is not None:
+        catalog_watch.cancel()
+    # Stop job workers, then release execution lane threads and the LLM connection pool
+    await extraction_jobs.stop()
+    shutdown_lanes()
+    await llm_client.aclose()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="TrialScout API",
     description="Clinical trial matching engine for cancer patients",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+# Rate limiting / admission control (added before CORS so 429s still carry CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
+# Oversized uploads get 413 before the body is parsed (and before taking an admission slot)
+app.add_middleware(UploadLimitMiddleware)
+
 # CORS middleware - Allow all localhost ports for development
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 if allowed_origins == ["*"]:
@@ -50,6 +110,7 @@ if allowed_origins == ["*"]:
         allow_credentials=False,  # Must be False when allow_origins is ["*"]
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=list(BRIEF_HEADERS),
     )
 else:
     # In production, use specific origins
@@ -59,10 +120,41 @@ else:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=list(BRIEF_HEADERS),
     )
 
+# Identical concurrent match requests share one computation
+match_flight = SingleFlight("match")
+
+# Match pipeline stages observed here (for sampled requests); the engine
+# stages are observed by the matcher
+STAGE_VALIDATION = match_stage_seconds.labels(stage="validation")
+STAGE_CATALOG = match_stage_seconds.labels(stage="catalog")
+STAGE_SERIALIZATION = match_stage_seconds.labels(stage="serialization")
+_sample_validation = Sampler(settings.match_stage_sample_every)
+_sample_handler = Sampler(settings.match_stage_sample_every)
+
+# Compress large JSON responses (match results embed full trial objects)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route request counts and latency (outermost, so 429s and 413s are counted too)
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include routers
 app.include_router(extraction_router)
+app.include_router(extraction_jobs_router)
+app.include_router(admin_router)
+app.include_router(brief_router)
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request, exc: AdmissionRejected):
+    """A full execution lane answers 429 instead of queueing without bound"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": f"Server busy: {exc.reason}"},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))}
+    )
 
 
 @app.get("/")
@@ -76,21 +168,66 @@ async def root():
 
 
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check():
     """
     Health check endpoint
     
-    Returns system status and dataset information
+    Returns system status and dataset information from the cached catalog
+    stats, so it adds no database load.
     """
-    total_trials = db.query(TrialDB).count()
+    if not catalog.is_warm:
+        # Cold cache means a full catalog load; keep it off the event loop
+        await get_lane("interactive").run(catalog.warm)
+    snapshot = catalog.current
     return {
         "status": "ok",
         "dataset_version": DATASET_VERSION,
-        "last_updated": datetime.now().isoformat(),
-        "total_trials": total_trials
+        "catalog_version": snapshot.version,
+        "last_updated": snapshot.stats["last_updated"],
+        "total_trials": snapshot.stats["total_trials"]
     }
 
 
+@app.get("/livez")
+async def liveness_probe():
+    """Liveness probe - the process is up and the event loop is responsive"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readiness_probe():
+    """
+    Readiness probe
+    
+    Ready once the trial catalog cache is compiled and warm. Never touches
+    the database.
+    """
+    snapshot = catalog.current
+    if snapshot is None:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "not_ready", "catalog_warm": False}
+        )
+    return {
+        "status": "ready",
+        "catalog_warm": True,
+        "catalog_version": snapshot.version,
+        "total_trials": snapshot.stats["total_trials"],
+        "lanes": {name: lane.stats() for name, lane in LANES.items()},
+        # Informational only: an open LLM breaker doesn't make the API unready
+        "llm": llm_client.stats(),
+        "extraction_jobs": extraction_jobs.stats(),
+        "brief_cache": brief_cache.stats(),
+        "match_store": match_store.stats()
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus-style metrics (text exposition format)"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/api/v1/trials")
 async def list_trials(
     cancer_type: Optional[CancerType] = None,
@@ -106,6 +243,20 @@ async def list_trials(
     - limit: Maximum number of records to return
     - offset: Number of records to skip (pagination)
     """
+    trials, total = await get_lane("interactive").run(
+        _query_trials_page, db, cancer_type, limit, offset
+    )
+    
+    return {
+        "trials": trials,
+        "total": total,
+        "limit": limit,
+        "offset": offset
+    }
+
+
+def _query_trials_page(db: Session, cancer_type: Optional[CancerType], limit: int, offset: int):
+    """Blocking DB query for one page of trials (runs in the interactive lane)"""
     # Build query
     query = db.query(TrialDB)
     
@@ -122,12 +273,7 @@ async def list_trials(
     # Convert to Trial Pydantic models
     trials = [Trial(**trial.to_dict()) for trial in db_trials]
     
-    return {
-        "trials": trials,
-        "total": total,
-        "limit": limit,
-        "offset": offset
-    }
+    return trials, total
 
 
 @app.get("/api/v1/trials/{nct_number}")
@@ -137,21 +283,40 @@ async def get_trial(nct_number: str, db: Session = Depends(get_db)):
     
     Returns complete trial information
     """
-    db_trial = db.query(TrialDB).filter(TrialDB.nct_number == nct_number).first()
-    if not db_trial:
+    if catalog.is_warm:
+        trial = catalog.get_trial(db, nct_number)
+    else:
+        # Cold cache means a full catalog load; keep it off the event loop
+        trial = await get_lane("interactive").run(catalog.get_trial, db, nct_number)
+    if not trial:
         raise HTTPException(status_code=404, detail=f"Trial {nct_number} not found")
     
-    trial = Trial(**db_trial.to_dict())
     return {"trial": trial}
 
 
+def _timed_validation(value, handler):
+    if not _sample_validation():
+        return handler(value)
+    started = perf_counter()
+    try:
+        return handler(value)
+    finally:
+        STAGE_VALIDATION.observe(perf_counter() - started)
+
+
+# The request body, with its validation observed as the "validation" match stage
+TimedPatientProfile = Annotated[PatientProfile, WrapValidator(_timed_validation)]
+
+
 @app.post("/api/v1/match", response_model=MatchingResponse)
-async def match_patient(patient: PatientProfile, db: Session = Depends(get_db)):
+async def match_patient(patient: TimedPatientProfile, db: Session = Depends(get_db)):
     """
     Match patient profile against available trials
     
     This endpoint implements the rule-based matching algorithm.
     Returns ranked trials with scores, reasons, and confidence levels.
+    The result is kept under the returned match_id (see
+    GET /api/v1/match/{match_id} and /api/brief).
     """
     try:
         logger.info(f"=== RECEIVED PATIENT PROFILE ===")
@@ -164,16 +329,39 @@ async def match_patient(patient: PatientProfile, db: Session = Depends(get_db)):
         # Import here to avoid circular dependency
         from app.matching.matcher import match_trials
         
-        # Get all trials from database (matching engine will filter by cancer type)
-        db_trials = db.query(TrialDB).all()
+        # Take one catalog snapshot for the whole request (matching engine will
+        # filter by cancer type); a reload meanwhile doesn't change what this
+        # request matches against, and dataset_version names this snapshot.
+        # Only a cold cache loads (in the lane, off the event loop)
+        timed = _sample_handler()
+        if timed:
+            started = perf_counter()
+        snapshot = catalog.current or await get_lane("interactive").run(catalog.snapshot, db)
+        if timed:
+            STAGE_CATALOG.observe(perf_counter() - started)
         
-        # Convert to Trial Pydantic models for matching engine
-        trial_objects = [Trial(**trial.to_dict()) for trial in db_trials]
+        # Run the matching engine in the interactive lane; concurrent requests
+        # for the same profile against the same catalog await a single run
+        # (and share one match_id)
+        async def run_and_store() -> MatchingResponse:
+            result = await get_lane("interactive").run(
+                match_trials, patient, trials=snapshot.trials, dataset_version=snapshot.version
+            )
+            result.match_id = match_store.put(result)
+            return result
         
-        # Call matching engine with database trials
-        result = match_trials(patient, trials=trial_objects)
+        key = fingerprint(patient, snapshot.version)
+        result = await match_flight.do(key, run_and_store)
         
-        return result
+        # Serialized here rather than by FastAPI (same bytes) so the stage can be timed
+        if timed:
+            started = perf_counter()
+        body = result.model_dump_json()
+        if timed:
+            STAGE_SERIALIZATION.observe(perf_counter() - started)
+        return Response(content=body, media_type="application/json")
+    except AdmissionRejected:
+        raise
     except Exception as e:
         logger.error(f"Matching error: {e}")
         logger.error(f"Error type: {type(e)}")
@@ -182,6 +370,39 @@ async def match_patient(patient: PatientProfile, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Matching engine error: {str(e)}")
 
 
+@app.get("/api/v1/match/{match_id}", response_model=MatchPage)
+async def get_match(
+    match_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Page through a stored match result without re-running matching
+    
+    match_id comes from POST /api/v1/match. Results expire after
+    MATCH_STORE_TTL_SECONDS; an unknown or expired id answers 404 and the
+    client should match again.
+    """
+    result = match_store.get(match_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Match result {match_id} not found or expired")
+    
+    return MatchPage(
+        match_id=match_id,
+        matches=result.matches[offset:offset + limit],
+        context=result.context,
+        stats=result.stats,
+        total=len(result.matches),
+        offset=offset,
+        limit=limit
+    )
+
+
+async def _refresh_catalog(db: Session) -> None:
+    """Rebuild the catalog after a trial write, in a worker thread (it reads every trial)"""
+    await run_in_threadpool(catalog.refresh, db)
+
+
 @app.post("/api/v1/trials", status_code=201)
 async def create_trial(trial: Trial, db: Session = Depends(get_db)):
     """
@@ -212,6 +433,7 @@ async def create_trial(trial: Trial, db: Session = Depends(get_db)):
     db.add(db_trial)
     db.commit()
     db.refresh(db_trial)
+    await _refresh_catalog(db)
     
     logger.info(f"Created trial: {trial.nct_number}")
     
@@ -248,6 +470,7 @@ async def update_trial(nct_number: str, updated_trial: Trial, db: Session = Depe
     
     db.commit()
     db.refresh(db_trial)
+    await _refresh_catalog(db)
     
     logger.info(f"Updated trial: {nct_number}")
     
@@ -277,6 +500,7 @@ async def partial_update_trial(nct_number: str, updates: TrialPartialUpdate, db:
     
     db.commit()
     db.refresh(db_trial)
+    await _refresh_catalog(db)
     
     logger.info(f"Partially updated trial: {nct_number}")
     
@@ -301,6 +525,7 @@ async def delete_trial(nct_number: str, db: Session = Depends(get_db)):
     
     db.delete(db_trial)
     db.commit()
+    await _refresh_catalog(db)
     
     logger.info(f"Deleted trial: {nct_number}")
     
@@ -319,13 +544,26 @@ async def bulk_import_trials(request: BulkImportRequest, db: Session = Depends(g
     """
     Bulk import trials
     
-    Imports multiple trials at once
+    Imports multiple trials at once. The writes run in the bulk lane so a
+    large import can't starve interactive matching.
     """
+    result = await get_lane("bulk").run(_bulk_import, request.trials, db)
+    
+    logger.info(f"Bulk import: {result['created']} created, {result['skipped']} skipped")
+    
+    return {
+        "message": "Bulk import completed",
+        **result
+    }
+
+
+def _bulk_import(trials: List[Trial], db: Session) -> dict:
+    """Insert trials that don't exist yet and refresh the catalog cache"""
     created = 0
     skipped = 0
     errors = []
     
-    for trial in request.trials:
+    for trial in trials:
         try:
             # Check if exists
             existing = db.query(TrialDB).filter(TrialDB.nct_number == trial.nct_number).first()
@@ -359,10 +597,10 @@ async def bulk_import_trials(request: BulkImportRequest, db: Session = Depends(g
         logger.error(f"Bulk import commit failed: {e}")
         raise HTTPException(status_code=500, detail=f"Bulk import failed: {str(e)}")
     
-    logger.info(f"Bulk import: {created} created, {skipped} skipped")
+    if created:
+        catalog.refresh(db)
     
     return {
-        "message": "Bulk import completed",
         "created": created,
         "skipped": skipped,
         "errors": errors
@@ -0,0 +1,76 @@
+"""
+Match result store
+
+/api/v1/match keeps each result under a random match_id for a while, so
+follow-up requests (clinician briefs, paging through results, the
+walkthrough) can reference the id instead of re-running matching or
+posting the whole profile and trial list back.
+
+Results live in process memory, bounded by entry count and expiring after
+a fixed TTL. With several server processes an id is only known to the one
+that matched; an unknown or expired id answers 404 and the client matches
+again.
+"""
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+from app.metrics import cache_hit_ratio, counter
+from app.models.matching import MatchingResponse
+
+match_store_requests = counter(
+    "trialscout_match_store_requests_total",
+    "Match result lookups by match_id, by result",
+    ("result",),
+)
+cache_hit_ratio.track("match_store", match_store_requests)
+
+
+class MatchStore:
+    """Bounded in-memory store of match results with a TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # match_id -> (expires at, result); insertion order is expiry order
+        self._entries: "OrderedDict[str, Tuple[float, MatchingResponse]]" = OrderedDict()
+
+    def _purge(self, now: float) -> None:
+        while self._entries:
+            match_id, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[match_id]
+
+    def put(self, result: MatchingResponse) -> str:
+        """Store a result and return its new match_id"""
+        match_id = secrets.token_urlsafe(16)
+        now = time.monotonic()
+        with self._lock:
+            self._entries[match_id] = (now + self.ttl_seconds, result)
+            self._purge(now)
+        return match_id
+
+    def get(self, match_id: str) -> Optional[MatchingResponse]:
+        """The stored result, or None if unknown, evicted or expired"""
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            entry = self._entries.get(match_id)
+        match_store_requests.inc(result="hit" if entry else "miss")
+        return entry[1] if entry else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+match_store = MatchStore(settings.match_store_max_entries, settings.match_store_ttl_seconds)
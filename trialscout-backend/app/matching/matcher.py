@@ -7,16 +7,40 @@ from app.data.constants import DATASET_VERSION
 from app.matching.rules import is_hard_excluded
 from app.matching.scorer import calculate_score, determine_confidence
 from app.matching.reason_generator import generate_why_matched, generate_what_to_confirm
+from app.config import settings
+from app.metrics import Sampler, histogram
 from datetime import datetime
+from time import perf_counter
 
+# Per-request stage timings of the match pipeline, recorded for 1 in
+# MATCH_STAGE_SAMPLE_EVERY requests (request counts come from
+# trialscout_http_requests_total). The matcher observes the engine stages;
+# the API observes catalog, validation and serialization.
+match_stage_seconds = histogram(
+    "trialscout_match_stage_seconds",
+    "Time spent per sampled match request in each stage of the match pipeline",
+    ("stage",),
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1),
+)
+STAGE_HARD_EXCLUSION = match_stage_seconds.labels(stage="hard_exclusion")
+STAGE_SCORING = match_stage_seconds.labels(stage="scoring")
+STAGE_REASONS = match_stage_seconds.labels(stage="reasons")
+_sample_engine = Sampler(settings.match_stage_sample_every)
 
-def match_trials(patient: PatientProfile, trials: List[Trial] = None) -> MatchingResponse:
+
+def match_trials(
+    patient: PatientProfile,
+    trials: List[Trial] = None,
+    dataset_version: str = DATASET_VERSION,
+) -> MatchingResponse:
     """
     Match patient to clinical trials using rule-based logic.
     
     Args:
         patient: Patient profile to match
         trials: List of trials to match against (if None, uses mock data for backward compatibility)
+        dataset_version: Version of the trials, reported in the response context
+            (the API passes the catalog snapshot version, e.g. "1.0+r3")
     
     Returns trials sorted by:
     1. Eligibility score (possibly_eligible first)
@@ -30,7 +54,20 @@ def match_trials(patient: PatientProfile, trials: List[Trial] = None) -> Matchin
     matches = []
     hard_excluded_count = 0
     
-    for trial in trials:
+    # A memory-mapped catalog (app/catalog_file.py) can pick out the patient's
+    # cancer type without decoding the other trials
+    candidates = trials
+    if hasattr(trials, "of_cancer_type"):
+        candidates = trials.of_cancer_type(patient.cancer_type.value)
+        hard_excluded_count = len(trials) - len(candidates)
+    
+    # The three stages run as separate passes so a sampled request is timed
+    # with four clock reads rather than per trial; the others skip the clock
+    timed = _sample_engine()
+    if timed:
+        started = perf_counter()
+    eligible = []
+    for trial in candidates:
         # Skip if wrong cancer type
         if trial.cancer_type != patient.cancer_type:
             hard_excluded_count += 1
@@ -41,22 +78,32 @@ def match_trials(patient: PatientProfile, trials: List[Trial] = None) -> Matchin
         if exclusion_reason:
             hard_excluded_count += 1
             continue
-        
-        # Calculate match score
+        eligible.append(trial)
+    if timed:
+        excluded_at = perf_counter()
+    
+    # Calculate match scores
+    scored = []
+    for trial in eligible:
         score = calculate_score(patient, trial)
-        confidence = determine_confidence(score, patient, trial)
-        
-        # Generate reasons
-        why_matched = generate_why_matched(patient, trial)
-        what_to_confirm = generate_what_to_confirm(patient, trial)
-        
+        scored.append((trial, score, determine_confidence(score, patient, trial)))
+    if timed:
+        scored_at = perf_counter()
+    
+    # Generate reasons
+    for trial, score, confidence in scored:
         matches.append(MatchResult(
             trial=trial,
             score=score,
             confidence=confidence,
-            why_matched=why_matched,
-            what_to_confirm=what_to_confirm
+            why_matched=generate_why_matched(patient, trial),
+            what_to_confirm=generate_what_to_confirm(patient, trial)
         ))
+    if timed:
+        reasons_at = perf_counter()
+        STAGE_HARD_EXCLUSION.observe(excluded_at - started)
+        STAGE_SCORING.observe(scored_at - excluded_at)
+        STAGE_REASONS.observe(reasons_at - scored_at)
     
     # Sort: possibly_eligible first, then by score descending
     matches.sort(
@@ -74,7 +121,7 @@ def match_trials(patient: PatientProfile, trials: List[Trial] = None) -> Matchin
         matches=matches,
         context=MatchingContext(
             patient=patient,
-            dataset_version=DATASET_VERSION,
+            dataset_version=dataset_version,
             matched_at=datetime.utcnow().isoformat() + "Z",
             total_trials=len(trials)
         ),
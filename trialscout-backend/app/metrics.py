@@ -0,0 +1,242 @@
+"""
+Lightweight in-process metrics
+
+A minimal Prometheus-compatible registry so we can expose counters and
+histograms without pulling in the prometheus_client dependency. Rendered by
+GET /metrics.
+
+Hot paths bind their labels once with .labels() (counters and histograms),
+so recording is an increment, or a bisect and two increments, under a
+lock. A Sampler picks 1 in N calls where even that costs too much.
+"""
+import itertools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Prometheus client defaults: request latencies from 5 ms to 10 s
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """Monotonically increasing counter with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def labels(self, **labels) -> "_CounterSeries":
+        """The series for one label set; keep it to skip the label lookup on hot paths"""
+        return _CounterSeries(self, tuple(str(labels.get(name, "")) for name in self.labelnames))
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def collect(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class _CounterSeries:
+    """One label set of a Counter"""
+    __slots__ = ("_values", "_lock", "_key")
+
+    def __init__(self, counter: Counter, key: Tuple[str, ...]):
+        self._values = counter._values
+        self._lock = counter._lock
+        self._key = key
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._values[self._key] = self._values.get(self._key, 0) + amount
+
+
+class _HistogramSeries:
+    """Bucket counts for one label set"""
+    __slots__ = ("_upper_bounds", "_lock", "counts", "sum")
+
+    def __init__(self, upper_bounds: Tuple[float, ...], lock: threading.Lock):
+        self._upper_bounds = upper_bounds
+        self._lock = lock
+        self.counts = [0] * (len(upper_bounds) + 1)  # per bucket, the last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram:
+    """Distribution of observed values (e.g. seconds) in fixed buckets, with optional labels"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels) -> _HistogramSeries:
+        """The series for one label set; keep it to skip the label lookup on hot paths"""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, _HistogramSeries(self.buckets, self._lock))
+        return series
+
+    def observe(self, value: float, **labels) -> None:
+        self.labels(**labels).observe(value)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the with-block in seconds (also when it raises)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(str(labels.get(name, "")) for name in self.labelnames))
+        return sum(series.counts) if series else 0
+
+    def collect(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            items = sorted((key, list(series.counts), series.sum) for key, series in self._series.items())
+        for key, counts, total in items:
+            cumulative = 0
+            for upper, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if upper == float("inf") else _format_value(upper)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), key + (le,))} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class HitRatio:
+    """Gauge: hits / (hits + misses) per cache, read from counters labelled result=hit|miss"""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._sources: Dict[str, Counter] = {}
+
+    def track(self, cache: str, requests: Counter) -> None:
+        self._sources[cache] = requests
+
+    def collect(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+        ]
+        for cache, requests in sorted(self._sources.items()):
+            hits = requests.value(result="hit")
+            lookups = hits + requests.value(result="miss")
+            if lookups:
+                lines.append(f"{self.name}{_format_labels(('cache',), (cache,))} {_format_value(hits / lookups)}")
+        return lines
+
+
+class Sampler:
+    """True for 1 in `every` calls; hot paths time only the sampled calls"""
+    __slots__ = ("every", "_calls")
+
+    def __init__(self, every: int):
+        self.every = max(1, every)
+        self._calls = itertools.count()  # next() is atomic, no lock needed
+
+    def __call__(self) -> bool:
+        return next(self._calls) % self.every == 0
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, "Counter | Histogram | HitRatio"] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            # Re-registering returns the existing metric so module reloads are harmless
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not labelnames:
+        return ""
+    pairs = []
+    for name, value in zip(labelnames, values):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    """Create (or fetch) a counter registered with the global registry"""
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Tuple[str, ...] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Create (or fetch) a histogram registered with the global registry"""
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+cache_hit_ratio: HitRatio = REGISTRY.register(HitRatio(
+    "trialscout_cache_hit_ratio",
+    "Share of cache lookups that were hits, by cache (since process start)",
+))
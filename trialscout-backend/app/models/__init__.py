@@ -9,8 +9,9 @@ from app.models.trial import (
     TranslatedInfo, TrialPartialUpdate
 )
 from app.models.matching import (
-    MatchResult, MatchingContext, MatchingStats, MatchingResponse
+    MatchResult, MatchingContext, MatchingStats, MatchingResponse, MatchPage
 )
+from app.models.brief import ClinicianBriefRequest, ClinicianBriefResponse, BulkBriefItem, BulkBriefRequest
 
 __all__ = [
     # Patient models
@@ -21,5 +22,7 @@ __all__ = [
     "Trial", "EligibilityCriterion", "PatientBurden", "ExclusionRisks",
     "TranslatedInfo", "TrialPartialUpdate",
     # Matching models
-    "MatchResult", "MatchingContext", "MatchingStats", "MatchingResponse"
+    "MatchResult", "MatchingContext", "MatchingStats", "MatchingResponse", "MatchPage",
+    # Brief models
+    "ClinicianBriefRequest", "ClinicianBriefResponse", "BulkBriefItem", "BulkBriefRequest"
 ]
\ No newline at end of file
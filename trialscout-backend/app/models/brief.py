@@ -0,0 +1,35 @@
+"""Clinician brief models"""
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from app.models.patient import PatientProfile
+from app.models.matching import MatchResult
+
+
+class ClinicianBriefRequest(BaseModel):
+    # Either a stored match result...
+    match_id: Optional[str] = Field(None, description="match_id from POST /api/v1/match")
+    # ...or the profile and results themselves
+    patient_profile: Optional[PatientProfile] = None
+    matched_trials: Optional[List[MatchResult]] = Field(None, description="Match results, best first")
+    top_n: int = Field(default=5, ge=1, le=10, description="Number of top trials to include")
+
+    @model_validator(mode='after')
+    def require_source(self):
+        if self.match_id is None and (self.patient_profile is None or self.matched_trials is None):
+            raise ValueError("Provide match_id, or patient_profile and matched_trials")
+        return self
+
+
+class ClinicianBriefResponse(BaseModel):
+    pdf_base64: str
+    filename: str
+    generated_at: str = Field(..., description="ISO timestamp of the render")
+    cache_hit: bool = False
+
+
+class BulkBriefItem(ClinicianBriefRequest):
+    label: Optional[str] = Field(None, max_length=80, description="Clinic list reference, used in the file name")
+
+
+class BulkBriefRequest(BaseModel):
+    briefs: List[BulkBriefItem] = Field(..., min_length=1, description="One entry per patient")
@@ -0,0 +1,42 @@
+"""Trial catalog change counter"""
+from sqlalchemy import Column, Integer, event, text
+from app.database import Base
+
+# SQLite triggers bump the counter in the same transaction as any change to
+# the trials table, whoever makes it (API, seed scripts, direct SQL)
+_SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trials_bump_catalog_revision_{operation.lower()}
+    AFTER {operation} ON trials
+    BEGIN
+        UPDATE catalog_revision SET revision = revision + 1 WHERE id = 1;
+    END
+    """
+    for operation in ("INSERT", "UPDATE", "DELETE")
+]
+
+
+class CatalogRevisionDB(Base):
+    """One row counting changes to the trials table; other tables never touch it"""
+    __tablename__ = "catalog_revision"
+
+    id = Column(Integer, primary_key=True)  # always 1
+    revision = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CatalogRevision(revision={self.revision})>"
+
+
+def read_revision(connection) -> int:
+    """Current trial revision (0 if the counter row doesn't exist yet)"""
+    return connection.execute(text("SELECT revision FROM catalog_revision WHERE id = 1")).scalar() or 0
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_revision_tracking(target, connection, **kw):
+    # Runs on every create_all, so databases created before the counter existed get it too
+    if connection.dialect.name != "sqlite":
+        return
+    connection.execute(text("INSERT OR IGNORE INTO catalog_revision (id, revision) VALUES (1, 0)"))
+    for trigger in _SQLITE_TRIGGERS:
+        connection.execute(text(trigger))
@@ -0,0 +1,80 @@
+"""SQLAlchemy model for asynchronous extraction jobs"""
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, String, DateTime, Integer, Text, JSON, event, inspect, text
+from app.database import Base
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ExtractionJobDB(Base):
+    """A queued, running or finished document extraction"""
+    __tablename__ = "extraction_jobs"
+
+    id = Column(String, primary_key=True)  # uuid4 hex
+    status = Column(String, nullable=False, index=True)  # queued | running | succeeded | failed
+    stage = Column(String, nullable=False)  # last progress stage, e.g. "text_extracted"
+
+    # Upload (the bytes are in a payload file outside the database, see app.jobs)
+    filename = Column(String, nullable=True)
+    content_type = Column(String, nullable=False)
+    cancer_type = Column(String, nullable=True)
+
+    # Outcome
+    result = Column(JSON, nullable=True)  # same shape as /extract-biomarkers minus timing
+    error = Column(Text, nullable=True)
+    events = Column(JSON, nullable=False, default=list)  # [{"stage", "at", ...}]
+
+    # Requeues after the LLM was unavailable; the job fails after extraction_job_max_requeues
+    requeues = Column(Integer, nullable=False, default=0, server_default="0")
+    available_at = Column(DateTime, nullable=True)  # a requeued job isn't claimed before this
+
+    # Timestamps (Python-side so ordering has sub-second resolution on SQLite)
+    created_at = Column(DateTime, nullable=False, default=utc_now, index=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # refreshed on every stage; stale = abandoned
+
+    def __repr__(self):
+        return f"<ExtractionJob(id='{self.id}', status='{self.status}', stage='{self.stage}')>"
+
+    def to_dict(self):
+        """Public job state (never includes the uploaded bytes)"""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "filename": self.filename,
+            "cancer_type": self.cancer_type,
+            "created_at": _iso(self.created_at),
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+            "events": list(self.events or []),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+def _iso(value):
+    """UTC timestamp as ISO 8601 with a Z suffix (SQLite hands back naive UTC datetimes)"""
+    return value.replace(tzinfo=None).isoformat() + "Z" if value else None
+
+
+# Columns added after the table first shipped: create_all doesn't alter existing tables
+_ADDED_COLUMNS = ("requeues", "available_at")
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _add_missing_columns(target, connection, **kw):
+    table = ExtractionJobDB.__table__
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    for name in _ADDED_COLUMNS:
+        if name in existing:
+            continue
+        column = table.c[name]
+        ddl = f"{name} {column.type.compile(dialect=connection.dialect)}"
+        if column.server_default is not None:
+            ddl += f" DEFAULT {column.server_default.arg} NOT NULL"
+        connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
@@ -32,6 +32,7 @@ class MatchingResponse(BaseModel):
     matches: List[MatchResult] = Field(..., description="Sorted: possibly_eligible first, then by score")
     context: MatchingContext
     stats: MatchingStats
+    match_id: Optional[str] = Field(None, description="Reference for GET /api/v1/match/{match_id} and /api/brief")
 
     class Config:
         json_schema_extra = {
@@ -65,4 +66,14 @@ class MatchingResponse(BaseModel):
                     "hard_excluded": 5
                 }
             }
-        }
\ No newline at end of file
+        }
+
+class MatchPage(BaseModel):
+    """One page of a stored match result"""
+    match_id: str
+    matches: List[MatchResult]
+    context: MatchingContext
+    stats: MatchingStats
+    total: int = Field(..., description="Number of matches in the full result")
+    offset: int
+    limit: int
@@ -40,6 +40,7 @@ class Sex(str, Enum):
 class LineOfTherapy(str, Enum):
     FIRST = "first"
     POST_TARGETED = "post_targeted"
+    POST_CHEMO_IMMUNO = "post_chemo_immuno"
     LATER_LINE = "later_line"
 
 
@@ -164,10 +165,12 @@ class PatientProfile(BaseModel):
                 return "first"
             elif v_lower in ['post_targeted', 'posttargeted', 'post_cdk46', 'second_line']:
                 return "post_targeted"
+            elif v_lower in ['post_chemo_immuno', 'post_chemo', 'post_immuno', 'chemo_refractory']:
+                return "post_chemo_immuno"
             elif v_lower in ['later_line', 'laterline', 'third_line', 'later']:
                 return "later_line"
             # If it's already a valid value, return it
-            if v_lower in ['first', 'post_targeted', 'later_line']:
+            if v_lower in ['first', 'post_targeted', 'post_chemo_immuno', 'later_line']:
                 return v_lower
         
         # Default to later_line for any unrecognized value
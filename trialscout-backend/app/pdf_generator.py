@@ -1,93 +1,272 @@
 """
 PDF generation for clinician briefs
 Based on TrialScout PRD v1.0 specifications
+
+The ReportLab style sheet is built once per process (STYLES) and shared by
+every generator; render_brief() is the entry point used by the process pool.
+
+A trial's title, details, location and burden lines read the same in every
+brief that lists it, so they are kept per process in TRIAL_FRAGMENTS, keyed
+by catalog version and NCT number, already parsed and line-broken; only the
+patient-specific parts (score, reasons, what to confirm) are built fresh.
 """
 
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
+from reportlab.lib.enums import TA_CENTER
 from io import BytesIO
-from datetime import datetime
+from collections import OrderedDict
+from datetime import date
+from xml.sax.saxutils import escape
 import base64
+import copy
+import threading
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.models.patient import PatientProfile
+from app.models.matching import MatchResult
+from app.models.trial import Trial
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def build_styles() -> StyleSheet1:
+    """Sample style sheet plus the brief's custom paragraph styles"""
+    styles = getSampleStyleSheet()
+
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=6,
+        alignment=TA_CENTER
+    ))
+
+    # Subtitle style
+    styles.add(ParagraphStyle(
+        name='CustomSubtitle',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#666666'),
+        spaceAfter=20,
+        alignment=TA_CENTER
+    ))
+
+    # Section header style
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=12,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=8,
+        spaceBefore=12
+    ))
+
+    # Footer version line
+    styles.add(ParagraphStyle(
+        name='SmallText',
+        parent=styles['BodyText'],
+        fontSize=7,
+        textColor=colors.HexColor('#999999')
+    ))
+    return styles
+
+
+# Built once per process; ParagraphStyles are only read while rendering
+STYLES = build_styles()
 
-from app.schemas import PatientProfile, MatchedTrial
-from typing import List
+# Detail shown next to a biomarker's status, e.g. EGFR present (L858R)
+_BIOMARKER_DETAILS = ("mutation", "alteration", "percentage")
+
+
+def _label(value: Any) -> str:
+    """Display text for an enum or snake_case value"""
+    text = value.value if hasattr(value, "value") else str(value)
+    return text.replace("_", " ").title()
+
+
+def format_biomarkers(biomarkers: Any) -> List[str]:
+    """'NAME: Status (detail)' for each reported biomarker"""
+    data = biomarkers.model_dump(mode="json") if isinstance(biomarkers, BaseModel) else dict(biomarkers or {})
+    formatted = []
+    for name, value in data.items():
+        if value is None:
+            continue
+        if isinstance(value, dict):
+            text = _label(value.get("status", "unknown"))
+            for field in _BIOMARKER_DETAILS:
+                if value.get(field) is not None:
+                    detail = f"{value[field]}%" if field == "percentage" else value[field]
+                    text += f" ({detail})"
+                    break
+        elif isinstance(value, int):
+            text = f"{value}%"  # Ki67
+        else:
+            text = _label(value)
+        formatted.append(f"{name}: {text}")
+    return formatted
+
+
+class CachedParagraph(Paragraph):
+    """
+    A Paragraph kept across briefs: its markup is parsed once and its lines
+    are broken once per available width. Each brief lays out its own
+    shallow copy (use()), so flags platypus sets on a flowable during
+    layout (e.g. _postponed) never leak into the next brief.
+    """
+    _source = None
+    _layout = None  # (availWidth, width, height, blPara, _wrapWidths) of the last wrap
+
+    def use(self) -> "CachedParagraph":
+        handle = copy.copy(self)
+        handle._source = self
+        return handle
+
+    def wrap(self, availWidth, availHeight):
+        source = self._source or self
+        layout = source._layout
+        if layout is not None and layout[0] == availWidth:
+            _, self.width, self.height, self.blPara, self._wrapWidths = layout
+            return self.width, self.height
+        size = Paragraph.wrap(self, availWidth, availHeight)
+        if size[1] < 0x7fffffff:  # not the "can't fit at this width" answer
+            source._layout = (availWidth, self.width, self.height, self.blPara, self._wrapWidths)
+        return size
+
+
+class TrialFragments:
+    """The trial-invariant flowables of one trial's entry in a brief"""
+
+    def __init__(self, trial: Trial, styles: StyleSheet1):
+        self._style = styles['BodyText']
+        self._title_markup = f"{escape(trial.title)}</b> (NCT: {trial.nct_number})"
+        self._titles: Dict[int, CachedParagraph] = {}  # by position in the brief
+
+        # Trial details
+        self.details = CachedParagraph(
+            f"{trial.phase} | {escape(trial.sponsor)} | {_label(trial.status)}", self._style
+        )
+
+        # Location
+        self.location = None
+        if trial.location:
+            location_text = f"<b>Location:</b> {escape(trial.location)}"
+            if trial.distance:
+                location_text += f", {trial.distance} miles"
+            self.location = CachedParagraph(location_text, self._style)
+
+        # Patient burden
+        burden = trial.burden
+        burden_parts = []
+        if burden.visits_per_month:
+            burden_parts.append(f"{burden.visits_per_month} visits/month")
+        if burden.imaging_frequency:
+            burden_parts.append(f"Imaging: {burden.imaging_frequency}")
+        if burden.biopsy_required:
+            burden_parts.append("Biopsy required")
+        if burden.hospital_stays:
+            burden_parts.append("Hospital stays required")
+        self.burden = None
+        if burden_parts:
+            self.burden = CachedParagraph(
+                f"<b>Patient Burden:</b> {escape(', '.join(burden_parts))}", self._style
+            )
+
+    def title(self, position: int) -> CachedParagraph:
+        """Numbered title line ("3. Title (NCT: ...)")"""
+        paragraph = self._titles.get(position)
+        if paragraph is None:
+            paragraph = self._titles[position] = CachedParagraph(
+                f"<b>{position}. {self._title_markup}", self._style
+            )
+        return paragraph
+
+
+def _trial_signature(trial: Trial) -> Tuple:
+    """The trial fields the fragments are built from"""
+    return (
+        trial.title, trial.phase, trial.sponsor, trial.status,
+        trial.location, trial.distance, trial.burden,
+    )
+
+
+class TrialFragmentCache:
+    """Per-process LRU of TrialFragments by (catalog version, NCT number)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple, TrialFragments]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, trial: Trial, catalog_version: str, styles: StyleSheet1) -> TrialFragments:
+        key = (catalog_version, trial.nct_number)
+        # Trials in a brief request come from the client; only reuse fragments built from the same content
+        signature = _trial_signature(trial)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        fragments = TrialFragments(trial, styles)
+        with self._lock:
+            self._entries[key] = (signature, fragments)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fragments
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+TRIAL_FRAGMENTS = TrialFragmentCache(settings.brief_fragment_cache_size)
 
 
 class ClinicianBriefGenerator:
     """Generate PDF clinician briefs"""
-    
-    def __init__(self):
-        """Initialize PDF generator"""
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-    
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        # Title style
-        if 'CustomTitle' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='CustomTitle',
-                parent=self.styles['Heading1'],
-                fontSize=18,
-                textColor=colors.HexColor('#1a1a1a'),
-                spaceAfter=6,
-                alignment=TA_CENTER
-            ))
-        
-        # Subtitle style
-        if 'CustomSubtitle' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='CustomSubtitle',
-                parent=self.styles['Normal'],
-                fontSize=10,
-                textColor=colors.HexColor('#666666'),
-                spaceAfter=20,
-                alignment=TA_CENTER
-            ))
-        
-        # Section header style
-        if 'SectionHeader' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='SectionHeader',
-                parent=self.styles['Heading2'],
-                fontSize=12,
-                textColor=colors.HexColor('#2c3e50'),
-                spaceAfter=8,
-                spaceBefore=12
-            ))
-        
-        # Body text style - use existing BodyText if available
-        if 'BodyText' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='BodyText',
-                parent=self.styles['Normal'],
-                fontSize=9,
-                leading=12
-            ))
-    
+
+    def __init__(self, styles: Optional[StyleSheet1] = None):
+        """Initialize PDF generator (shares the process-wide style sheet by default)"""
+        self.styles = styles or STYLES
+
     def generate_brief(
         self,
         patient_profile: PatientProfile,
-        matched_trials: List[MatchedTrial],
+        matched_trials: List[MatchResult],
         top_n: int = 5,
-        dataset_version: str = "1.0"
+        dataset_version: str = "1.0",
+        generated_on: Optional[date] = None,
+        catalog_version: Optional[str] = None
     ) -> bytes:
         """
         Generate clinician brief PDF
-        
+
         Args:
             patient_profile: Patient's clinical profile
-            matched_trials: List of matched trials
+            matched_trials: Match results, best first
             top_n: Number of top trials to include
             dataset_version: Version of trial dataset
-            
+            generated_on: Date printed on the brief (default: today)
+            catalog_version: Catalog the trials come from; when given,
+                trial fragments are reused from TRIAL_FRAGMENTS
+
         Returns:
             PDF bytes
         """
+        generated_on = generated_on or date.today()
         buffer = BytesIO()
         doc = SimpleDocTemplate(
             buffer,
@@ -97,107 +276,109 @@ class ClinicianBriefGenerator:
             topMargin=0.75*inch,
             bottomMargin=0.75*inch
         )
-        
+
         # Build document content
         story = []
-        
+
         # Header
-        story.extend(self._build_header())
-        
+        story.extend(self._build_header(generated_on))
+
         # Patient profile section
         story.extend(self._build_patient_profile(patient_profile))
-        
+
         # Matched trials section
-        story.extend(self._build_matched_trials(matched_trials[:top_n]))
-        
+        story.extend(self._build_matched_trials(matched_trials[:top_n], catalog_version))
+
         # Footer
-        story.extend(self._build_footer(dataset_version))
-        
+        story.extend(self._build_footer(dataset_version, generated_on))
+
         # Build PDF
         doc.build(story)
-        
+
         # Get PDF bytes
         pdf_bytes = buffer.getvalue()
         buffer.close()
-        
+
         return pdf_bytes
-    
-    def _build_header(self) -> List:
+
+    def _build_header(self, generated_on: date) -> List:
         """Build document header"""
         elements = []
-        
+
         # Title
         title = Paragraph(
             "Clinical Trial Matching Report",
             self.styles['CustomTitle']
         )
         elements.append(title)
-        
+
         # Subtitle
         subtitle = Paragraph(
-            f"Generated by TrialScout | {datetime.now().strftime('%B %d, %Y')}",
+            f"Generated by TrialScout | {generated_on.strftime('%B %d, %Y')}",
             self.styles['CustomSubtitle']
         )
         elements.append(subtitle)
-        
+
         return elements
-    
+
     def _build_patient_profile(self, patient: PatientProfile) -> List:
         """Build patient profile section"""
         elements = []
-        
+
         # Section header
         header = Paragraph("Patient Profile", self.styles['SectionHeader'])
         elements.append(header)
-        
+
         # Demographics
-        demographics = f"<b>Demographics:</b> Age {patient.age or 'Not provided'}, {patient.sex or 'Not provided'}"
+        demographics = f"<b>Demographics:</b> Age {patient.age}, {_label(patient.sex)}"
         elements.append(Paragraph(demographics, self.styles['BodyText']))
         elements.append(Spacer(1, 6))
-        
+
         # Diagnosis
-        diagnosis = f"<b>Diagnosis:</b> {patient.cancer_type.title()} Cancer, Stage {patient.stage}"
+        diagnosis = f"<b>Diagnosis:</b> {_label(patient.cancer_type)} Cancer, Stage {patient.stage.value}"
         elements.append(Paragraph(diagnosis, self.styles['BodyText']))
         elements.append(Spacer(1, 6))
-        
+
         # ECOG
-        ecog_text = str(patient.ecog) if patient.ecog is not None else "Unknown"
-        ecog = f"<b>ECOG Performance Status:</b> {ecog_text}"
+        ecog = f"<b>ECOG Performance Status:</b> {_label(patient.ecog)}"
         elements.append(Paragraph(ecog, self.styles['BodyText']))
         elements.append(Spacer(1, 6))
-        
+
         # Biomarkers
-        if patient.biomarkers:
-            biomarker_list = []
-            for name, status in patient.biomarkers.items():
-                status_text = status.status.title()
-                if status.subtype:
-                    status_text += f" ({status.subtype})"
-                biomarker_list.append(f"{name}: {status_text}")
-            
-            biomarkers = f"<b>Key Biomarkers:</b> {', '.join(biomarker_list)}"
+        biomarker_list = format_biomarkers(patient.biomarkers)
+        if biomarker_list:
+            biomarkers = f"<b>Key Biomarkers:</b> {escape(', '.join(biomarker_list))}"
             elements.append(Paragraph(biomarkers, self.styles['BodyText']))
             elements.append(Spacer(1, 6))
-        
+
         # Prior treatments
-        if patient.prior_therapies:
-            therapies = f"<b>Prior Treatments:</b> {', '.join(patient.prior_therapies)}"
+        if patient.prior_treatments:
+            treatments = [
+                f"{t.name} ({_label(t.category)})" if t.name else _label(t.category)
+                for t in patient.prior_treatments
+            ]
+            therapies = f"<b>Prior Treatments:</b> {escape(', '.join(treatments))}"
             elements.append(Paragraph(therapies, self.styles['BodyText']))
             elements.append(Spacer(1, 6))
-        
+
         # Current line
-        if patient.current_line:
-            line = f"<b>Current Line of Therapy:</b> {patient.current_line.replace('-', ' ').title()}"
+        if patient.line_of_therapy:
+            line = f"<b>Current Line of Therapy:</b> {_label(patient.line_of_therapy)}"
             elements.append(Paragraph(line, self.styles['BodyText']))
-        
+
         elements.append(Spacer(1, 12))
-        
+
         return elements
-    
-    def _build_matched_trials(self, trials: List[MatchedTrial]) -> List:
+
+    def _trial_fragments(self, trial: Trial, catalog_version: Optional[str]) -> TrialFragments:
+        if catalog_version is None or self.styles is not STYLES or not settings.brief_fragment_cache_enabled:
+            return TrialFragments(trial, self.styles)
+        return TRIAL_FRAGMENTS.get(trial, catalog_version, self.styles)
+
+    def _build_matched_trials(self, trials: List[MatchResult], catalog_version: Optional[str] = None) -> List:
         """Build matched trials section"""
         elements = []
-        
+
         # Section header
         header = Paragraph(
             f"Matched Trials (Top {len(trials)})",
@@ -205,79 +386,59 @@ class ClinicianBriefGenerator:
         )
         elements.append(header)
         elements.append(Spacer(1, 6))
-        
+
         # Each trial
         for i, matched_trial in enumerate(trials, 1):
-            trial = matched_trial.trial
-            
+            fragments = self._trial_fragments(matched_trial.trial, catalog_version)
+
             # Trial title and NCT
-            title_text = f"<b>{i}. {trial.title}</b> (NCT: {trial.nct_number})"
-            elements.append(Paragraph(title_text, self.styles['BodyText']))
+            elements.append(fragments.title(i).use())
             elements.append(Spacer(1, 4))
-            
+
             # Trial details
-            details = f"Phase {trial.phase or 'N/A'} | {trial.sponsor or 'N/A'} | {trial.status.replace('_', ' ').title()}"
-            elements.append(Paragraph(details, self.styles['BodyText']))
+            elements.append(fragments.details.use())
             elements.append(Spacer(1, 4))
-            
+
             # Location
-            if trial.location:
-                location_text = f"<b>Location:</b> {trial.location}"
-                if trial.distance_miles:
-                    location_text += f", {trial.distance_miles} miles"
-                elements.append(Paragraph(location_text, self.styles['BodyText']))
+            if fragments.location:
+                elements.append(fragments.location.use())
                 elements.append(Spacer(1, 4))
-            
+
             # Match score and confidence
             score_text = f"<b>Match Score:</b> {matched_trial.score}/100 | <b>Confidence:</b> {matched_trial.confidence.title()}"
             elements.append(Paragraph(score_text, self.styles['BodyText']))
             elements.append(Spacer(1, 6))
-            
+
             # Why matched
             if matched_trial.why_matched:
                 elements.append(Paragraph("<b>Why Matched:</b>", self.styles['BodyText']))
                 for reason in matched_trial.why_matched:
-                    reason_text = f"• {reason.criterion}: {reason.description}"
-                    elements.append(Paragraph(reason_text, self.styles['BodyText']))
+                    elements.append(Paragraph(f"• {escape(reason)}", self.styles['BodyText']))
                 elements.append(Spacer(1, 4))
-            
+
             # What to confirm
             if matched_trial.what_to_confirm:
                 elements.append(Paragraph("<b>What to Confirm:</b>", self.styles['BodyText']))
                 for item in matched_trial.what_to_confirm:
-                    item_text = f"• {item.item}: {item.description}"
-                    elements.append(Paragraph(item_text, self.styles['BodyText']))
+                    elements.append(Paragraph(f"• {escape(item)}", self.styles['BodyText']))
                 elements.append(Spacer(1, 4))
-            
+
             # Patient burden
-            burden = matched_trial.patient_burden
-            if any(burden.values()):
-                burden_parts = []
-                if burden.get("visits_per_month"):
-                    burden_parts.append(f"{burden['visits_per_month']} visits/month")
-                if burden.get("imaging_frequency"):
-                    burden_parts.append(f"Imaging: {burden['imaging_frequency']}")
-                if burden.get("biopsy_required"):
-                    burden_parts.append("Biopsy required")
-                if burden.get("hospital_stays"):
-                    burden_parts.append("Hospital stays required")
-                
-                if burden_parts:
-                    burden_text = f"<b>Patient Burden:</b> {', '.join(burden_parts)}"
-                    elements.append(Paragraph(burden_text, self.styles['BodyText']))
-            
+            if fragments.burden:
+                elements.append(fragments.burden.use())
+
             # Separator between trials
             if i < len(trials):
                 elements.append(Spacer(1, 12))
-        
+
         return elements
-    
-    def _build_footer(self, dataset_version: str) -> List:
+
+    def _build_footer(self, dataset_version: str, generated_on: date) -> List:
         """Build document footer"""
         elements = []
-        
+
         elements.append(Spacer(1, 20))
-        
+
         # Disclaimer
         disclaimer = (
             "<b>Disclaimer:</b> This report is for educational purposes only and does not "
@@ -285,33 +446,27 @@ class ClinicianBriefGenerator:
         )
         elements.append(Paragraph(disclaimer, self.styles['BodyText']))
         elements.append(Spacer(1, 8))
-        
+
         # Version info
         version_info = (
-            f"Generated by TrialScout on {datetime.now().strftime('%B %d, %Y')} | "
+            f"Generated by TrialScout on {generated_on.strftime('%B %d, %Y')} | "
             f"Dataset version {dataset_version} | "
             "Learn more at trialscout.com"
         )
-        small_style = ParagraphStyle(
-            name='SmallText',
-            parent=self.styles['BodyText'],
-            fontSize=7,
-            textColor=colors.HexColor('#999999')
-        )
-        elements.append(Paragraph(version_info, small_style))
-        
+        elements.append(Paragraph(version_info, self.styles['SmallText']))
+
         return elements
-    
+
     def generate_brief_base64(
         self,
         patient_profile: PatientProfile,
-        matched_trials: List[MatchedTrial],
+        matched_trials: List[MatchResult],
         top_n: int = 5,
         dataset_version: str = "1.0"
     ) -> str:
         """
         Generate clinician brief and return as base64 string
-        
+
         Returns:
             Base64 encoded PDF string
         """
@@ -321,5 +476,19 @@ class ClinicianBriefGenerator:
             top_n,
             dataset_version
         )
-        
-        return base64.b64encode(pdf_bytes).decode('utf-8')
\ No newline at end of file
+
+        return base64.b64encode(pdf_bytes).decode('utf-8')
+
+
+def render_brief(
+    patient_profile: PatientProfile,
+    matched_trials: List[MatchResult],
+    top_n: int,
+    dataset_version: str,
+    generated_on: date,
+    catalog_version: Optional[str] = None
+) -> bytes:
+    """Render one brief; runs in a worker process"""
+    return ClinicianBriefGenerator().generate_brief(
+        patient_profile, matched_trials, top_n, dataset_version, generated_on, catalog_version
+    )
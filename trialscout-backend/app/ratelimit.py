@@ -0,0 +1,322 @@
+"""
+Rate limiting and admission control
+
+Token buckets per (client, route) with separate budgets for cheap reads and
+expensive routes (matching, extraction, bulk import), plus bounded
+concurrency queues for the expensive routes. Over-budget or over-capacity
+requests get 429 with Retry-After instead of queueing without bound.
+
+Bucket state is kept in process by default. Setting RATE_LIMIT_REDIS_URL
+shares it across workers through a Redis-compatible store (requires the
+optional `redis` package).
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import counter
+import logging
+
+logger = logging.getLogger(__name__)
+
+# POST routes that do real work per request
+EXPENSIVE_ROUTES = (
+    "/api/v1/extract-biomarkers",
+    "/api/v1/extraction-jobs",
+    "/api/v1/extract-patient-profile",
+    "/api/v1/trials/bulk",
+    "/api/v1/match",
+    "/api/brief",
+)
+
+# Probes and metrics are never limited
+EXEMPT_PATHS = ("/livez", "/readyz", "/health", "/metrics")
+
+ratelimit_decisions = counter(
+    "trialscout_ratelimit_decisions_total",
+    "Rate limiter decisions by route class and outcome",
+    ("route_class", "outcome"),
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request can't be admitted right now"""
+
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Token bucket parameters: refill rate (tokens/second) and burst size"""
+    rate: float
+    capacity: float
+
+
+class TokenBucket:
+    """Classic token bucket, refilled lazily on each take()"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, budget: Budget, now: float):
+        self.rate = budget.rate
+        self.capacity = budget.capacity
+        self.tokens = budget.capacity
+        self.updated_at = now
+
+    def take(self, now: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """Try to take `cost` tokens; returns (allowed, seconds until allowed)"""
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True, 0.0
+        return False, (cost - self.tokens) / self.rate
+
+
+class LocalBucketStore:
+    """In-process bucket store with LRU eviction of idle clients"""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    async def take(self, key: str, budget: Budget) -> Tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(budget, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take(now)
+
+
+# Atomic refill-and-take, so several workers can share one bucket
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry)}
+"""
+
+
+class RedisBucketStore:
+    """Bucket store shared across workers via a Redis-compatible server"""
+
+    def __init__(self, url: str, prefix: str = "trialscout:ratelimit:"):
+        import redis.asyncio as redis_asyncio
+
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+        self._prefix = prefix
+        self._fallback = LocalBucketStore()
+
+    async def take(self, key: str, budget: Budget) -> Tuple[bool, float]:
+        try:
+            allowed, retry = await self._script(
+                keys=[self._prefix + key],
+                args=[budget.rate, budget.capacity, time.time()],
+            )
+            return bool(int(allowed)), float(retry)
+        except Exception as e:
+            # Never fail requests because the shared store is down
+            logger.warning(f"Rate limit store unavailable, using local buckets: {e}")
+            return await self._fallback.take(key, budget)
+
+
+class ConcurrencyLimiter:
+    """
+    Bounded concurrency with a bounded wait queue
+
+    At most `limit` holders run at once and at most `max_queue` wait; anyone
+    beyond that is rejected immediately with an estimated Retry-After based
+    on the recent average service time.
+    """
+
+    def __init__(self, limit: int, max_queue: int, name: str = ""):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(limit)
+        self._waiting = 0
+        self._active = 0
+        self._avg_service_time = 1.0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def retry_after(self) -> float:
+        """Rough time until a queue slot frees up"""
+        backlog = self._waiting + self._active
+        return max(1.0, self._avg_service_time * backlog / max(self.limit, 1))
+
+    async def acquire(self) -> Callable[[], None]:
+        """Wait for a slot; returns the function that gives it back (call it on the event loop)"""
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            raise AdmissionRejected(self.retry_after(), f"{self.name or 'route'} is at capacity")
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._active += 1
+        started = time.monotonic()
+
+        def release() -> None:
+            self._active -= 1
+            # Exponentially weighted moving average of service time
+            self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * (time.monotonic() - started)
+            self._semaphore.release()
+
+        return release
+
+    @asynccontextmanager
+    async def slot(self):
+        release = await self.acquire()
+        try:
+            yield
+        finally:
+            release()
+
+
+def default_budgets() -> Dict[str, Budget]:
+    return {
+        "cheap": Budget(
+            rate=settings.rate_limit_cheap_per_minute / 60.0,
+            capacity=settings.rate_limit_cheap_burst,
+        ),
+        "expensive": Budget(
+            rate=settings.rate_limit_per_hour / 3600.0,
+            capacity=settings.rate_limit_expensive_burst,
+        ),
+    }
+
+
+def create_bucket_store():
+    """Local buckets unless a shared store is configured (and importable)"""
+    if settings.rate_limit_redis_url:
+        try:
+            return RedisBucketStore(settings.rate_limit_redis_url)
+        except ImportError:
+            logger.warning("RATE_LIMIT_REDIS_URL is set but the redis package is not installed; using local buckets")
+    return LocalBucketStore()
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing token buckets and admission queues"""
+
+    def __init__(self, app: ASGIApp, store=None, budgets: Optional[Dict[str, Budget]] = None):
+        self.app = app
+        self.enabled = settings.rate_limit_enabled
+        self.store = store or create_bucket_store()
+        self.budgets = budgets or default_budgets()
+        self.limiters = {
+            route: ConcurrencyLimiter(
+                settings.admission_max_concurrency,
+                settings.admission_max_queue,
+                name=route,
+            )
+            for route in EXPENSIVE_ROUTES
+        }
+
+    @staticmethod
+    def classify(method: str, path: str) -> Tuple[str, str]:
+        """Return (route_class, route_key) for a request"""
+        if method == "POST":
+            for route in EXPENSIVE_ROUTES:
+                if path == route or path.startswith(route + "/"):
+                    return "expensive", route
+        return "cheap", "cheap"
+
+    @staticmethod
+    def client_id(scope: Scope) -> str:
+        if settings.rate_limit_trust_forwarded:
+            forwarded = Headers(scope=scope).get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            not self.enabled
+            or scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        route_class, route_key = self.classify(scope["method"], scope["path"])
+        allowed, retry_after = await self.store.take(
+            f"{self.client_id(scope)}:{route_key}", self.budgets[route_class]
+        )
+        if not allowed:
+            ratelimit_decisions.inc(route_class=route_class, outcome="rate_limited")
+            await _too_many_requests(retry_after, "Rate limit exceeded")(scope, receive, send)
+            return
+
+        limiter = self.limiters.get(route_key)
+        if limiter is None:
+            ratelimit_decisions.inc(route_class=route_class, outcome="allowed")
+            await self.app(scope, receive, send)
+            return
+
+        slot = limiter.slot()
+        try:
+            await slot.__aenter__()
+        except AdmissionRejected as e:
+            ratelimit_decisions.inc(route_class=route_class, outcome="queue_full")
+            await _too_many_requests(e.retry_after, f"Server busy: {e.reason}")(scope, receive, send)
+            return
+
+        ratelimit_decisions.inc(route_class=route_class, outcome="allowed")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await slot.__aexit__(None, None, None)
+
+
+def _too_many_requests(retry_after: float, detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
@@ -0,0 +1,73 @@
+"""
+Per-route request metrics
+
+Counts requests and observes their latency per route template (e.g.
+/api/v1/trials/{nct_number}, never the raw path, so label cardinality stays
+bounded). The middleware sits outermost, so rate-limited and rejected
+requests are counted too; latency runs until the last body chunk is sent,
+which for streamed responses (SSE, bulk ZIPs) is the whole stream.
+
+Both are recorded for every request (unlike the sampled match stage
+timings), with their series bound once per method, route and status.
+"""
+from time import perf_counter
+from typing import Dict, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import counter, histogram
+
+http_requests = counter(
+    "trialscout_http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ("method", "route", "status"),
+)
+http_request_seconds = histogram(
+    "trialscout_http_request_duration_seconds",
+    "HTTP request latency by method and route template",
+    ("method", "route"),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+# Requests that matched no route share one label
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording trialscout_http_requests_total and request latency"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # (method, route, status) -> bound (request counter, latency histogram) series
+        self._series: Dict[Tuple[str, str, int], Tuple] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        status = 500  # if the app raises before starting a response
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router adds the matched route to the (shared) scope
+            route = scope.get("route")
+            key = (scope["method"], getattr(route, "path", None) or UNMATCHED_ROUTE, status)
+            series = self._series.get(key)
+            if series is None:
+                method, path, _ = key
+                series = self._series[key] = (
+                    http_requests.labels(method=method, route=path, status=status),
+                    http_request_seconds.labels(method=method, route=path),
+                )
+            requests, seconds = series
+            seconds.observe(perf_counter() - started)
+            requests.inc()
@@ -0,0 +1,43 @@
+"""
+Single-flight request coalescing
+
+Concurrent callers asking for the same key share one in-flight computation
+instead of each doing the work. The computation runs as its own task, so a
+caller disconnecting doesn't cancel the result other callers are awaiting.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+from app.metrics import counter
+
+T = TypeVar("T")
+
+singleflight_requests = counter(
+    "trialscout_singleflight_requests_total",
+    "Requests through single-flight groups, by whether they led or joined a computation",
+    ("group", "role"),
+)
+
+
+class SingleFlight:
+    """Deduplicates concurrent async computations by key"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() for key, or await the identical call already running"""
+        task = self._inflight.get(key)
+        if task is not None:
+            singleflight_requests.inc(group=self.name, role="coalesced")
+        else:
+            singleflight_requests.inc(group=self.name, role="leader")
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
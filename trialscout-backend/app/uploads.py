@@ -0,0 +1,198 @@
+"""
+Bounded-memory upload handling
+
+Two layers keep an upload from costing more than its size limit:
+
+- UploadLimitMiddleware rejects an upload request with 413 before the body
+  is parsed when Content-Length is already over the limit, and otherwise
+  counts body bytes as they arrive and aborts as soon as the limit is
+  crossed (chunked uploads without Content-Length).
+- read_upload() works on the temp file Starlette already spooled the
+  upload to: the size is checked with seek/tell before anything is read,
+  then the file is hashed in chunks. Small files are read into memory;
+  larger ones stay in the spool, which PDF parsing memory-maps (worker
+  processes get a path to it, not a copy of the bytes).
+"""
+import hashlib
+import io
+import os
+import shutil
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import counter
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10MB per file
+MAX_BATCH_FILES = 5  # Documents per /extract-patient-profile request
+READ_CHUNK_BYTES = 256 * 1024
+MULTIPART_OVERHEAD_BYTES = 64 * 1024  # boundaries, headers and form fields
+
+# Request body limits for upload routes (POST)
+UPLOAD_ROUTES: Dict[str, int] = {
+    "/api/v1/extract-biomarkers": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    "/api/v1/extract-text-only": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    "/api/v1/extraction-jobs": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    "/api/v1/extract-patient-profile": MAX_BATCH_FILES * MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+}
+
+TOO_LARGE_DETAIL = "File too large. Maximum size is 10MB"
+
+uploads_total = counter(
+    "trialscout_uploads_total",
+    "Uploaded files by outcome (memory, spooled, rejected_early, too_large)",
+    ("outcome",),
+)
+
+
+class Upload:
+    """One uploaded file: size-checked, hashed, and held in memory or in the request's spool file"""
+
+    def __init__(
+        self,
+        filename: Optional[str],
+        content_type: str,
+        size: int,
+        sha256: str,
+        data: Optional[bytes] = None,
+        file: Optional[BinaryIO] = None,
+    ):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = size
+        self.sha256 = sha256
+        self.data = data
+        self.file = file  # owned by the UploadFile, which closes it with the request
+
+    @classmethod
+    def from_bytes(cls, content: bytes, content_type: str, filename: Optional[str] = None) -> "Upload":
+        return cls(filename, content_type, len(content), hashlib.sha256(content).hexdigest(), data=content)
+
+    @property
+    def source(self):
+        """
+        What the text extractors read: the bytes, or the spool file
+
+        The spool is an unnamed temp file; on Linux it is passed by its
+        /proc/<pid>/fd path, which PDF worker processes can open and map.
+        Elsewhere the file object itself is passed (parsed in-process).
+        """
+        if self.data is not None:
+            return self.data
+        path = f"/proc/{os.getpid()}/fd/{self.file.fileno()}"
+        return path if os.path.exists(path) else self.file
+
+    def read_bytes(self) -> bytes:
+        """The full content (reads a spooled file; for storage and plain text)"""
+        if self.data is not None:
+            return self.data
+        self.file.seek(0)
+        return self.file.read()
+
+    def write_to(self, f: BinaryIO) -> None:
+        """Copy the content to f in chunks (blocking)"""
+        if self.data is not None:
+            f.write(self.data)
+            return
+        self.file.seek(0)
+        shutil.copyfileobj(self.file, f, READ_CHUNK_BYTES)
+
+    def close(self) -> None:
+        # The spool file itself is closed with the request's UploadFile
+        self.file = None
+        self.data = None
+
+    def __enter__(self) -> "Upload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _inspect(spool: BinaryIO, max_bytes: int) -> Optional[Tuple[int, str, Optional[bytes]]]:
+    """
+    (size, SHA-256, bytes if small enough to keep in memory) of a spool
+
+    None if it is over max_bytes, which is checked before reading anything.
+    Blocking (the spool may be on disk).
+    """
+    size = spool.seek(0, io.SEEK_END)
+    if size > max_bytes:
+        return None
+    spool.seek(0)
+    if size <= settings.upload_spool_bytes:
+        data = spool.read()
+        return size, hashlib.sha256(data).hexdigest(), data
+    digest = hashlib.sha256()
+    while True:
+        chunk = spool.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        digest.update(chunk)
+    spool.seek(0)
+    return size, digest.hexdigest(), None
+
+
+async def read_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> Upload:
+    """
+    Size-check and hash an UploadFile in place, without copying its spool
+
+    Raises HTTPException(413) when it is over max_bytes. Uploads up to
+    upload_spool_bytes are read into memory; larger ones are used from the
+    spool file. The caller should close() the returned Upload (or use it
+    as a context manager) when done with it.
+    """
+    inspected = await run_in_threadpool(_inspect, file.file, max_bytes)
+    if inspected is None:
+        uploads_total.inc(outcome="too_large")
+        raise HTTPException(status_code=413, detail=TOO_LARGE_DETAIL)
+    size, sha256, data = inspected
+    if data is not None:
+        uploads_total.inc(outcome="memory")
+        return Upload(file.filename, file.content_type, size, sha256, data=data)
+    uploads_total.inc(outcome="spooled")
+    return Upload(file.filename, file.content_type, size, sha256, file=file.file)
+
+
+class UploadLimitMiddleware:
+    """Reject oversized upload requests before (or while) the body is read"""
+
+    def __init__(self, app: ASGIApp, limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.limits = limits or UPLOAD_ROUTES
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        declared = Headers(scope=scope).get("content-length")
+        if declared and declared.isdigit() and int(declared) > limit:
+            uploads_total.inc(outcome="rejected_early")
+            response = JSONResponse(status_code=413, content={"detail": TOO_LARGE_DETAIL})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    uploads_total.inc(outcome="rejected_early")
+                    # Raised inside form parsing; FastAPI re-raises HTTPExceptions as-is
+                    raise HTTPException(status_code=413, detail=TOO_LARGE_DETAIL)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,80 @@
+"""
+Benchmark: clinician brief delivery, base64 JSON vs raw PDF
+
+Requests the same (cached) brief from POST /api/brief through the full
+middleware stack, in-process, with the default JSON envelope and with
+"Accept: application/pdf". Rendering is excluded - the brief is rendered
+once up front and every timed request is a cache hit - so the numbers are
+the cost of delivery alone: bytes on the wire, request latency and the peak
+heap allocated while serving one request (tracemalloc).
+
+Run with: python benchmarks/bench_brief_delivery.py [--requests 200] [--top-n 10]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from app.config import settings
+
+settings.rate_limit_enabled = False  # measuring delivery, not admission
+
+from app.lanes import shutdown_lanes
+from app.main import app
+
+PATIENT = {
+    "age": 61, "sex": "female", "cancer_type": "breast", "stage": "IV", "ecog": "0",
+    "biomarkers": {"ER": "present", "PR": "present", "HER2": "low"},
+    "prior_treatments": [{"category": "targeted_therapy", "name": "CDK4/6 inhibitor"}],
+    "line_of_therapy": "post_targeted",
+}
+
+MODES = {
+    "base64 JSON": {"Accept": "application/json"},
+    "raw PDF": {"Accept": "application/pdf"},
+}
+
+
+async def main_async(args):
+    transport = httpx.ASGITransport(app=app)  # doesn't run the lifespan; enter it here
+    async with app.router.lifespan_context(app), httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        match = (await client.post("/api/v1/match", json=PATIENT)).json()
+        body = {"match_id": match["match_id"], "top_n": args.top_n}
+        await client.post("/api/brief", json=body)  # render once; everything below is a cache hit
+
+        print(f"{args.requests} requests per mode for a cached {min(args.top_n, len(match['matches']))}-trial brief")
+        for name, headers in MODES.items():
+            latencies, peaks = [], []
+            for _ in range(args.requests):
+                tracemalloc.start()
+                started = time.perf_counter()
+                response = await client.post("/api/brief", json=body, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+                assert response.status_code == 200, response.text
+            print(f"   {name:12s} {len(response.content) / 1024:6.1f} KB on the wire  "
+                  f"median {statistics.median(latencies) * 1000:5.2f} ms  "
+                  f"peak heap per request {statistics.median(peaks) / 1024:6.1f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=10)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        shutdown_lanes()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: clinician brief rendering
+
+Renders 1, 5 and 10-trial briefs for a stream of distinct patients (so the
+whole-brief cache never applies) over the seed catalog, in-process:
+
+1. fresh:      every trial's title, details, location and burden
+               paragraphs parsed and line-broken on every brief
+2. fragments:  those trial-invariant paragraphs taken from the per-process
+               fragment cache (TRIAL_FRAGMENTS); only the score, reasons and
+               what-to-confirm lines are built per patient
+
+Reports median and p95 render time and briefs/s per size, and checks that
+both modes produce byte-identical PDFs.
+
+Run with: python benchmarks/bench_brief_rendering.py [--briefs 200]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from reportlab import rl_config
+
+rl_config.invariant = 1  # no timestamps or random ids, so outputs can be compared
+
+from app.config import settings
+from app.data.mock_trials import TRIALS
+from app.matching.matcher import match_trials
+from app.models.matching import MatchResult
+from app.models.patient import PatientProfile
+from app.pdf_generator import TRIAL_FRAGMENTS, ClinicianBriefGenerator
+
+PATIENTS = [
+    {
+        "age": 61, "sex": "female", "cancer_type": "breast", "stage": "IV", "ecog": "0",
+        "biomarkers": {"ER": "present", "PR": "present", "HER2": "low"},
+        "prior_treatments": [{"category": "targeted_therapy", "name": "CDK4/6 inhibitor"}],
+        "line_of_therapy": "post_targeted",
+    },
+    {
+        "age": 58, "sex": "male", "cancer_type": "lung", "stage": "IV", "ecog": "1",
+        "biomarkers": {
+            "EGFR": {"status": "present", "mutation": "Exon 19 deletion"}, "ALK": "absent", "ROS1": "absent",
+            "KRAS": {"status": "absent"}, "MET": {"status": "absent"}, "BRAF": "absent",
+            "PDL1": {"status": "unknown"},
+        },
+        "prior_treatments": [{"category": "targeted_therapy", "name": "Osimertinib"}],
+        "line_of_therapy": "post_targeted",
+    },
+]
+
+
+def workload(briefs: int, trials_per_brief: int, seed: int = 0):
+    """(profile, results) pairs: distinct patients, popular trials, real match reasons"""
+    rng = random.Random(seed)
+    reasons, confirms = [], []
+    for patient in PATIENTS:
+        for match in match_trials(PatientProfile(**patient), trials=TRIALS).matches:
+            reasons.extend(match.why_matched)
+            confirms.extend(match.what_to_confirm)
+    popular = TRIALS[:12]  # most briefs list the same handful of trials
+    cases = []
+    for i in range(briefs):
+        patient = dict(rng.choice(PATIENTS), age=30 + i % 60)
+        results = [
+            MatchResult(
+                trial=trial,
+                score=rng.randint(85, 99),
+                confidence=rng.choice(["high", "medium", "low"]),
+                why_matched=rng.sample(reasons, 3),
+                what_to_confirm=rng.sample(confirms, 2),
+            )
+            for trial in rng.sample(popular, trials_per_brief)
+        ]
+        cases.append((PatientProfile(**patient), results))
+    return cases
+
+
+def render_all(generator, cases, catalog_version):
+    seconds, outputs = [], []
+    for profile, results in cases:
+        started = time.perf_counter()
+        outputs.append(generator.generate_brief(profile, results, 10, "1.0", date(2026, 1, 1), catalog_version))
+        seconds.append(time.perf_counter() - started)
+    return seconds, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--briefs", type=int, default=200, help="briefs per size")
+    args = parser.parse_args()
+
+    generator = ClinicianBriefGenerator()
+    render_all(generator, workload(5, 5, seed=99), None)  # import/font warm-up outside the timings
+    print(f"{args.briefs} briefs per size, distinct patients, {len(TRIALS[:12])} popular trials")
+    for size in (1, 5, 10):
+        cases = workload(args.briefs, size, seed=size)
+        results = {}
+        for name, enabled in (("fresh", False), ("fragments", True)):
+            settings.brief_fragment_cache_enabled = enabled
+            TRIAL_FRAGMENTS.clear()
+            results[name] = render_all(generator, cases, "bench")
+        same = "identical PDFs" if results["fresh"][1] == results["fragments"][1] else "PDFs DIFFER"
+        print(f"\n{size}-trial briefs ({same}; fragment hits {TRIAL_FRAGMENTS.hits}, misses {TRIAL_FRAGMENTS.misses})")
+        baseline = statistics.median(results["fresh"][0])
+        for name, (seconds, _) in results.items():
+            median = statistics.median(seconds)
+            p95 = sorted(seconds)[int(0.95 * (len(seconds) - 1))]
+            print(f"   {name:10s} median {median * 1000:6.1f} ms  p95 {p95 * 1000:6.1f} ms  "
+                  f"{1 / statistics.mean(seconds):6.0f} briefs/s  ({median / baseline:4.0%} of fresh)")
+
+
+if __name__ == "__main__":
+    main()
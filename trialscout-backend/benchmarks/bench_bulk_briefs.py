@@ -0,0 +1,118 @@
+"""
+Benchmark: bulk clinician briefs for a clinic list
+
+Renders briefs for a list of distinct patients (so the brief cache never
+applies) two ways:
+
+1. one by one:  a get_brief() call per patient, awaited in turn - what a
+                client looping over POST /api/brief does
+2. bulk ZIP:    stream_bulk_briefs(), the generator behind
+                POST /api/brief/bulk, with renders spread over the process
+                pool and each PDF streamed as it finishes
+
+Reports time to the first finished brief, total time and the peak heap of
+the API process (tracemalloc; the worker processes are not counted), and
+checks that the archive holds every brief.
+
+Run with: python benchmarks/bench_bulk_briefs.py [--patients 100] [--top-n 5]
+"""
+import argparse
+import asyncio
+import io
+import sys
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.briefs import BulkBriefSource, brief_cache, get_brief, stream_bulk_briefs
+from app.config import settings
+from app.data.mock_trials import TRIALS
+from app.lanes import get_process_pool, process_pool_workers, shutdown_lanes
+from app.matching.matcher import match_trials
+from app.models.patient import PatientProfile
+
+PATIENTS = [
+    {
+        "age": 61, "sex": "female", "cancer_type": "breast", "stage": "IV", "ecog": "0",
+        "biomarkers": {"ER": "present", "PR": "present", "HER2": "low"},
+        "prior_treatments": [{"category": "targeted_therapy", "name": "CDK4/6 inhibitor"}],
+        "line_of_therapy": "post_targeted",
+    },
+    {
+        "age": 58, "sex": "male", "cancer_type": "lung", "stage": "IV", "ecog": "1",
+        "biomarkers": {
+            "EGFR": {"status": "present", "mutation": "Exon 19 deletion"}, "ALK": "absent", "ROS1": "absent",
+            "KRAS": {"status": "absent"}, "MET": {"status": "absent"}, "BRAF": "absent",
+            "PDL1": {"status": "unknown"},
+        },
+        "prior_treatments": [{"category": "targeted_therapy", "name": "Osimertinib"}],
+        "line_of_therapy": "post_targeted",
+    },
+]
+
+
+def clinic_list(patients: int, top_n: int):
+    """Distinct patients (ages differ), each with its real match results"""
+    sources = []
+    for i in range(patients):
+        profile = PatientProfile(**dict(PATIENTS[i % len(PATIENTS)], age=30 + i % 60 + i // 60))
+        matches = match_trials(profile, trials=TRIALS).matches
+        sources.append(BulkBriefSource(f"patient {i + 1}", None, profile, matches, top_n))
+    return sources
+
+
+async def one_by_one(sources):
+    started = time.perf_counter()
+    first = None
+    for source in sources:
+        await get_brief(source.patient_profile, source.matched_trials, source.top_n)
+        first = first or time.perf_counter() - started
+    return first, time.perf_counter() - started, len(sources)
+
+
+async def bulk_zip(sources):
+    started = time.perf_counter()
+    first = None
+    archive = io.BytesIO()
+    async for chunk in stream_bulk_briefs(sources):
+        first = first or time.perf_counter() - started
+        archive.write(chunk)
+    elapsed = time.perf_counter() - started
+    names = zipfile.ZipFile(archive).namelist()
+    return first, elapsed, sum(name.endswith(".pdf") for name in names)
+
+
+def measure(run, sources):
+    brief_cache.clear()
+    tracemalloc.start()
+    first, elapsed, briefs = asyncio.run(run(sources))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, elapsed, briefs, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--patients", type=int, default=100)
+    parser.add_argument("--top-n", type=int, default=5)
+    args = parser.parse_args()
+
+    sources = clinic_list(args.patients, args.top_n)
+    # Start the worker processes outside the timings
+    list(get_process_pool().map(abs, range(process_pool_workers())))
+    print(f"{args.patients} patients, top {args.top_n} trials each; {process_pool_workers()} worker processes, "
+          f"bulk window {settings.brief_bulk_concurrency or process_pool_workers()}")
+    try:
+        for name, run in (("one by one", one_by_one), ("bulk ZIP", bulk_zip)):
+            first, elapsed, briefs, peak = measure(run, sources)
+            print(f"   {name:10s}  first brief {first * 1000:6.0f} ms  total {elapsed:6.2f} s  "
+                  f"{briefs / elapsed:5.1f} briefs/s  peak heap {peak / 1024 / 1024:6.1f} MB  ({briefs} briefs)")
+    finally:
+        shutdown_lanes()
+
+
+if __name__ == "__main__":
+    main()
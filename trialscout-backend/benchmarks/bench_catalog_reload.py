@@ -0,0 +1,105 @@
+"""
+Benchmark: matching latency while the catalog is hot-reloaded
+
+Sends POST /api/v1/match requests through the full app (in-process, with
+the lifespan running) at a fixed concurrency, first with a steady catalog
+and then while POST /api/v1/admin/catalog/reload rebuilds and swaps the
+snapshot every --reload-every-ms. Reports match latency percentiles, failed
+requests, how many snapshots the responses were served from, and how long a
+rebuild takes.
+
+Run with: python benchmarks/bench_catalog_reload.py [--requests 400] [--concurrency 8] [--reload-every-ms 50]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from app.config import settings
+
+settings.rate_limit_enabled = False  # measuring reloads, not admission
+settings.admin_token = settings.admin_token or "bench"  # the reload endpoint needs one
+
+from app.lanes import shutdown_lanes
+from app.main import app
+
+PATIENT = {
+    "age": 61, "sex": "female", "cancer_type": "breast", "stage": "IV", "ecog": "0",
+    "biomarkers": {"ER": "present", "PR": "present", "HER2": "low"},
+    "prior_treatments": [{"category": "targeted_therapy", "name": "CDK4/6 inhibitor"}],
+    "line_of_therapy": "post_targeted",
+}
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def run_load(client, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, versions, failures = [], set(), 0
+
+    async def one(i: int):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            # distinct ages, so single-flight never merges requests
+            response = await client.post("/api/v1/match", json=dict(PATIENT, age=20 + i % 70 + i // 70))
+            latencies.append(time.perf_counter() - started)
+            if response.status_code == 200:
+                versions.add(response.json()["context"]["dataset_version"])
+            else:
+                failures += 1
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies, versions, failures
+
+
+async def reload_loop(client, every: float, durations):
+    while True:
+        await asyncio.sleep(every)
+        started = time.perf_counter()
+        response = await client.post("/api/v1/admin/catalog/reload", headers={"X-Admin-Token": settings.admin_token})
+        response.raise_for_status()
+        durations.append(time.perf_counter() - started)
+
+
+async def main_async(args):
+    transport = httpx.ASGITransport(app=app)  # doesn't run the lifespan; enter it here
+    async with app.router.lifespan_context(app), httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await run_load(client, 20, args.concurrency)  # warm-up
+        print(f"{args.requests} matches at concurrency {args.concurrency}")
+        for name, reloading in (("steady catalog", False), (f"reload every {args.reload_every_ms:g} ms", True)):
+            durations = []
+            reloader = asyncio.create_task(reload_loop(client, args.reload_every_ms / 1000, durations)) if reloading else None
+            latencies, versions, failures = await run_load(client, args.requests, args.concurrency)
+            if reloader:
+                reloader.cancel()
+            line = (f"   {name:24s} p50 {percentile(latencies, 50) * 1000:6.1f} ms  "
+                    f"p99 {percentile(latencies, 99) * 1000:6.1f} ms  failed {failures}  snapshots seen {len(versions)}")
+            if durations:
+                line += f"  ({len(durations)} reloads, median rebuild {statistics.median(durations) * 1000:.1f} ms)"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--reload-every-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        shutdown_lanes()
+
+
+if __name__ == "__main__":
+    main()
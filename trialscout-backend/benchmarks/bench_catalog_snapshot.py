@@ -0,0 +1,132 @@
+"""
+Benchmark: how fast a fresh worker is serving, with and without the shared catalog snapshot
+
+Builds a throwaway SQLite database holding --trials synthetic trials (the
+seed catalog cloned under new NCT numbers), then starts fresh worker
+processes against it, the way uvicorn --workers N does:
+
+    database    CATALOG_SNAPSHOT_ENABLED=false: every worker reads and
+                validates the trials table
+    mapped      a snapshot file already exists (another worker built it):
+                the worker maps it
+
+Each worker reports the time to warm the catalog, the first and a steady
+match, an NCT lookup, and its peak RSS. Medians over --runs workers.
+
+Run with: python benchmarks/bench_catalog_snapshot.py [--trials 2000] [--runs 5]
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND))
+
+PATIENT = {
+    "age": 61, "sex": "female", "cancer_type": "breast", "stage": "IV", "ecog": "0",
+    "biomarkers": {"ER": "present", "PR": "present", "HER2": "low"},
+    "prior_treatments": [{"category": "targeted_therapy", "name": "CDK4/6 inhibitor"}],
+    "line_of_therapy": "post_targeted",
+}
+
+
+def build_database(path: str, count: int) -> None:
+    """Fill a new SQLite database with count trials cloned from the seed catalog"""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}")
+    script = f"""
+from app.database import Base, SessionLocal, engine
+from app.data.mock_trials import load_seed_trials
+from app.models.catalog_revision_db import CatalogRevisionDB  # trial revision counter + triggers
+from app.models.trial_db import TrialDB
+Base.metadata.create_all(bind=engine)
+seed = load_seed_trials()
+db = SessionLocal()
+for i in range({count}):
+    trial = seed[i % len(seed)].model_dump()
+    trial.update(id=f"synthetic_{{i:06d}}", nct_number=f"NCT{{90000000 + i:08d}}")
+    db.add(TrialDB(**trial))
+db.commit()
+db.close()
+"""
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND, env=env, check=True)
+
+
+def worker(nct_number: str) -> None:
+    """Child process: one freshly started worker"""
+    from app.catalog import catalog
+    from app.matching.matcher import match_trials
+    from app.models.patient import PatientProfile
+
+    patient = PatientProfile(**PATIENT)
+    timings = {}
+    started = time.perf_counter()
+    catalog.warm()
+    timings["warm"] = time.perf_counter() - started
+
+    snapshot = catalog.current
+    for name in ("first_match", "steady_match"):
+        started = time.perf_counter()
+        match_trials(patient, trials=snapshot.trials, dataset_version=snapshot.version)
+        timings[name] = time.perf_counter() - started
+    started = time.perf_counter()
+    assert snapshot.by_nct.get(nct_number) is not None
+    timings["lookup"] = time.perf_counter() - started
+    timings["rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(timings))
+
+
+def start_worker(env, nct_number: str):
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", nct_number],
+        cwd=BACKEND, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trials", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--worker", metavar="NCT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(args.worker)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_database(db_path, args.trials)
+        base_env = dict(
+            os.environ, DATABASE_URL=f"sqlite:///{db_path}", CATALOG_WATCH_INTERVAL_SECONDS="0",
+            CATALOG_SNAPSHOT_PATH=os.path.join(tmp, "bench.catalog"),
+        )
+        nct_number = f"NCT{90000000 + args.trials - 1:08d}"
+
+        start_worker(base_env, nct_number)  # the first worker builds the snapshot file
+        size = os.path.getsize(base_env["CATALOG_SNAPSHOT_PATH"])
+        print(f"{args.trials} trials, snapshot file {size / 1024:.0f} KiB; medians over {args.runs} fresh workers")
+        print(f"   {'':10s} {'warm':>10s} {'1st match':>10s} {'match':>10s} {'lookup':>10s} {'peak RSS':>10s}")
+        modes = (
+            ("database", dict(base_env, CATALOG_SNAPSHOT_ENABLED="false")),
+            ("mapped", base_env),
+        )
+        for name, env in modes:
+            runs = [start_worker(env, nct_number) for _ in range(args.runs)]
+
+            def median(key):
+                return statistics.median(run[key] for run in runs)
+
+            print(f"   {name:10s} {median('warm') * 1000:8.1f}ms {median('first_match') * 1000:8.1f}ms "
+                  f"{median('steady_match') * 1000:8.1f}ms {median('lookup') * 1000:8.2f}ms "
+                  f"{median('rss_mb'):8.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
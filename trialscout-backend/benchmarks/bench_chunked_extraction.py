@@ -0,0 +1,104 @@
+"""
+Benchmark: single-call vs map-reduce chunked LLM extraction
+
+Builds a long multi-record document (patient C's pathology report and
+oncology note preceded by N outside records), starts the local stand-in LLM
+server, and times the LLM extraction path (through the shared async LLM
+client, as the API runs it) with one prompt vs overlapping chunks
+extracted concurrently. Slicing is turned off so both modes see the
+whole document.
+
+The stand-in's latency model is base + per-input-token + per-output-token;
+chunking pays off when prompt processing dominates (very long documents),
+not when output generation does, so try a few --ms-per-input-token values.
+
+Run with: python benchmarks/bench_chunked_extraction.py [--records 10] [--ms-per-input-token 0.2]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.extractors.biomarker_extractor import BiomarkerExtractor
+from app.extractors.chunked_extractor import split_chunks
+from app.extractors.llm_client import llm_client
+from app.lanes import shutdown_lanes
+from benchmarks.fake_llm_server import FakeLLMServer
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent.parent
+KEY_FIELDS = ("cancer_type", "stage", "ecog", "age", "sex")
+
+
+def build_document(records: int) -> str:
+    """Patient C's pathology report and note, with older copies as outside records"""
+    pathology = (FIXTURE_DIR / "patient_c_her2pos_pathology.txt").read_text()
+    note = (FIXTURE_DIR / "patient_c_her2pos_oncology_note.txt").read_text()
+    parts = [
+        f"\n=== OUTSIDE RECORD {i + 1} ===\n" + (pathology if i % 2 else note)
+        for i in range(records)
+    ]
+    # Most recent documents last, as in a chronological record
+    return "\n".join(parts + [pathology, note])
+
+
+async def run(extractor: BiomarkerExtractor, text: str, chunking: bool):
+    settings.extraction_chunking_enabled = chunking
+    started = time.perf_counter()
+    data = await extractor._extract_with_llm_async(text, "breast")
+    return time.perf_counter() - started, data
+
+
+async def compare(extractor: BiomarkerExtractor, text: str, server: FakeLLMServer):
+    try:
+        single_time, single = await run(extractor, text, chunking=False)
+        requests_before = server.requests
+        chunked_time, chunked = await run(extractor, text, chunking=True)
+        return single_time, single, chunked_time, chunked, server.requests - requests_before
+    finally:
+        await llm_client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=10, help="outside records in the document")
+    parser.add_argument("--ms-per-input-token", type=float, default=0.2, help="stand-in prompt processing cost")
+    args = parser.parse_args()
+
+    server = FakeLLMServer(ms_per_input_token=args.ms_per_input_token).start()
+    settings.anthropic_base_url = server.url
+    settings.anthropic_api_key = settings.anthropic_api_key or "fake-key"
+    settings.extraction_slicing_enabled = False  # the single-call baseline sends the whole record too
+    extractor = BiomarkerExtractor()
+
+    text = build_document(args.records)
+    chunks = split_chunks(text, settings.extraction_chunk_chars, settings.extraction_chunk_overlap_chars)
+    print(f"document: {len(text)} chars (~{len(text) // 4} tokens), "
+          f"{len(chunks)} chunks of <= {settings.extraction_chunk_chars} chars, "
+          f"parallelism {settings.extraction_chunk_parallelism}\n")
+
+    try:
+        single_time, single, chunked_time, chunked, chunk_requests = asyncio.run(compare(extractor, text, server))
+    finally:
+        shutdown_lanes()
+
+    print(f"single call: {single_time:6.2f} s  (1 request)")
+    print(f"chunked:     {chunked_time:6.2f} s  ({chunk_requests} requests)")
+    print(f"speedup:     {single_time / chunked_time:6.2f}x\n")
+
+    print(f"{'field':16s} {'single':>14s} {'chunked':>14s}")
+    for field in KEY_FIELDS:
+        print(f"{field:16s} {str(single.get(field)):>14s} {str(chunked.get(field)):>14s}")
+    for name in ("ER", "PR", "HER2", "Ki67_percentage"):
+        a = single["biomarkers"].get(name, {}).get("value")
+        b = chunked["biomarkers"].get(name, {}).get("value")
+        print(f"{name:16s} {str(a):>14s} {str(b):>14s}")
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
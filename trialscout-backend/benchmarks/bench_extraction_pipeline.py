@@ -0,0 +1,107 @@
+"""
+Benchmark: end-to-end extraction pipeline throughput and latency
+
+Runs extract_document() - the pipeline behind /api/v1/extract-biomarkers
+and the extraction job workers - over the patient fixture documents, with
+the backend pointed at the local stand-in LLM server through
+settings.anthropic_base_url (no network access or API key needed). Each
+concurrency level sends the same number of documents, with at most that
+many in flight, and reports throughput, p50/p95/p99 latency, outcomes
+(extraction method or error) and LLM calls, including hedged attempts.
+
+The extraction cache is off so every document takes the full path. Both
+extraction modes are measured: rules first with the LLM only for unresolved
+fields (the default), and LLM only (extraction_fast_path=false).
+
+Run with: python benchmarks/bench_extraction_pipeline.py [--documents 100] [--concurrency 1 4 16 32]
+          [--latency-distribution lognormal] [--error-rate 0.01]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.extractors.pipeline import extract_document
+from app.lanes import shutdown_lanes
+from app.uploads import Upload
+from benchmarks.fake_llm_server import FIXTURE_DIR, LATENCY_DISTRIBUTIONS, FakeLLMServer
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def run_level(documents, count: int, concurrency: int):
+    """Extract `count` documents with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    outcomes = Counter()
+
+    async def one(index: int):
+        name, content = documents[index % len(documents)]
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await extract_document(Upload.from_bytes(content, "text/plain", name))
+                outcomes[result["biomarker_data"].get("extraction_method", "llm")] += 1
+            except Exception as e:
+                outcomes[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return time.perf_counter() - started, latencies, outcomes
+
+
+async def main_async(args):
+    server = FakeLLMServer(
+        base_latency_ms=args.base_latency_ms,
+        latency_distribution=args.latency_distribution,
+        error_rate=args.error_rate,
+    ).start()
+    settings.anthropic_base_url = server.url
+    settings.anthropic_api_key = settings.anthropic_api_key or "fake-key"
+    settings.extraction_cache_enabled = False
+
+    documents = [(path.name, path.read_bytes()) for path in sorted(FIXTURE_DIR.glob("patient_*.txt"))]
+    print(f"{len(documents)} fixture documents, {args.documents} per level; stand-in LLM: "
+          f"{args.base_latency_ms:.0f} ms base, {args.latency_distribution} latency, "
+          f"{args.error_rate:.1%} 529 errors; {settings.llm_max_concurrency} LLM slots")
+
+    for name, fast_path in (("rules first, LLM for the rest", True), ("LLM only", False)):
+        settings.extraction_fast_path = fast_path
+        print(f"\n{name}")
+        for concurrency in args.concurrency:
+            requests_before, canned_before = server.requests, server.canned_hits
+            elapsed, latencies, outcomes = await run_level(documents, args.documents, concurrency)
+            print(f"   concurrency {concurrency:3d}  {len(latencies) / elapsed:6.1f} docs/s  "
+                  f"p50 {percentile(latencies, 50) * 1000:6.0f} ms  p95 {percentile(latencies, 95) * 1000:6.0f} ms  "
+                  f"p99 {percentile(latencies, 99) * 1000:6.0f} ms  "
+                  f"LLM calls incl. hedges {server.requests - requests_before:4d} (canned {server.canned_hits - canned_before:4d})  "
+                  f"{dict(outcomes)}")
+
+    server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=100, help="documents per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--base-latency-ms", type=float, default=300.0)
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of LLM calls failing with 529")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        shutdown_lanes()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: interactive match latency under mixed load
+
+Runs a steady stream of match requests while bulk catalog writes (SQLite
+inserts of the full catalog, repeated) hammer the same process, first with
+everything sharing one threadpool and then with separate execution lanes.
+Reports interactive p50/p95/p99 against INTERACTIVE_LATENCY_SLO_MS.
+
+Run with: python benchmarks/bench_lanes.py [--duration 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.data.mock_trials import TRIALS
+from app.lanes import Lane
+from app.matching.matcher import match_trials
+from app.models.patient import PatientProfile
+
+PATIENT = PatientProfile(
+    age=61, sex="female", cancer_type="breast", stage="IV", ecog="0",
+    biomarkers={"ER": "present", "PR": "present", "HER2": "low"},
+    line_of_therapy="post_targeted",
+)
+
+
+def bulk_write(db_path: str, copies: int = 25) -> None:
+    """One bulk import: insert the serialized catalog `copies` times and commit"""
+    rows = [json.dumps(t.model_dump(mode="json")) for t in TRIALS] * copies
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("CREATE TABLE IF NOT EXISTS trials (body TEXT)")
+        conn.executemany("INSERT INTO trials (body) VALUES (?)", [(r,) for r in rows])
+        conn.commit()
+        conn.execute("DELETE FROM trials")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(interactive: Lane, bulk: Lane, duration: float, db_path: str):
+    latencies = []
+    stop_at = time.perf_counter() + duration
+
+    async def interactive_client():
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            await interactive.run(match_trials, PATIENT, trials=TRIALS)
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.01)
+
+    async def bulk_client():
+        while time.perf_counter() < stop_at:
+            try:
+                await bulk.run(bulk_write, db_path)
+            except Exception:
+                await asyncio.sleep(0.05)
+
+    await asyncio.gather(
+        *[interactive_client() for _ in range(4)],
+        *[bulk_client() for _ in range(8)],
+    )
+    return latencies
+
+
+def report(name, latencies):
+    slo = settings.interactive_latency_slo_ms
+    p95 = percentile(latencies, 95)
+    print(
+        f"{name:<14} n={len(latencies):<5} p50={statistics.median(latencies):7.1f}ms "
+        f"p95={p95:7.1f}ms p99={percentile(latencies, 99):7.1f}ms "
+        f"SLO {slo}ms: {'met' if p95 <= slo else 'MISSED'}"
+    )
+
+
+async def main(duration: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+
+        # Baseline: one shared pool, like run_in_threadpool for everything
+        shared = Lane("shared", workers=4, max_queue=1000)
+        report("shared pool", await run_scenario(shared, shared, duration, db_path))
+        shared.shutdown()
+
+        # Separate lanes sized from settings
+        interactive = Lane("interactive", settings.lane_interactive_workers, settings.lane_interactive_queue)
+        bulk = Lane("bulk", settings.lane_bulk_workers, settings.lane_bulk_queue)
+        report("lanes", await run_scenario(interactive, bulk, duration, db_path))
+        interactive.shutdown()
+        bulk.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    args = parser.parse_args()
+    asyncio.run(main(args.duration))
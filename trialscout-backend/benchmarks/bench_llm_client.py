@@ -0,0 +1,141 @@
+"""
+Benchmark: shared async LLM client (pooling, hedging, circuit breaking)
+
+Drives the shared LLMClient against the local stand-in LLM server:
+
+1. pooling:  a new client per request (the old per-request BiomarkerExtractor)
+             vs one shared keep-alive client - wall time and TCP connections
+2. hedging:  a 2% slow tail, with and without hedged second attempts -
+             p50/p95/p99 latency and hedges launched/won
+3. breaker:  a full upstream outage - how many calls still reach the
+             upstream, how fast callers fail, and recovery after the cool-down
+
+Run with: python benchmarks/bench_llm_client.py [--requests 200]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import anthropic
+
+from app.config import settings
+from app.extractors.biomarker_extractor import BiomarkerExtractor
+from app.extractors.llm_client import LLMClient, LLMUnavailable, llm_hedges
+from benchmarks.fake_llm_server import FakeLLMServer
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def run_load(call, requests: int, concurrency: int):
+    """Run `requests` calls with at most `concurrency` in flight; returns latencies"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+async def bench_pooling(server, params, requests):
+    print("1. connection pooling")
+
+    async def per_request_client():
+        client = anthropic.AsyncAnthropic(api_key="fake-key", base_url=server.url, max_retries=0)
+        try:
+            await client.messages.create(**params)
+        finally:
+            await client.close()
+
+    for name, call in (("client per request", per_request_client), ("shared client", None)):
+        shared = LLMClient()
+        connections_before = server.connections
+        started = time.perf_counter()
+        await run_load(call or (lambda: shared.create_message(**params)), requests, 8)
+        elapsed = time.perf_counter() - started
+        print(f"   {name:20s} {elapsed:6.2f} s  {server.connections - connections_before:4d} TCP connections")
+        await shared.aclose()
+
+
+async def bench_hedging(server, params, requests):
+    print("\n2. hedging (2% of calls +1.5 s, 4 callers, 8 LLM slots)")
+    server.tail_fraction, server.tail_latency_ms = 0.02, 1500
+    settings.llm_hedge_min_delay_seconds = 0.2
+    for enabled in (False, True):
+        settings.llm_hedge_enabled = enabled
+        client = LLMClient()
+        await run_load(lambda: client.create_message(**params), settings.llm_hedge_min_samples, 4)  # calibrate
+        launched = llm_hedges.value(result="launched")
+        won = llm_hedges.value(result="won")
+        latencies = await run_load(lambda: client.create_message(**params), requests, 4)
+        print(f"   hedging {'on ' if enabled else 'off'}  p50 {percentile(latencies, 50) * 1000:6.0f} ms  "
+              f"p95 {percentile(latencies, 95) * 1000:6.0f} ms  p99 {percentile(latencies, 99) * 1000:6.0f} ms  "
+              f"hedges {int(llm_hedges.value(result='launched') - launched)} "
+              f"(won {int(llm_hedges.value(result='won') - won)})")
+        await client.aclose()
+    server.tail_fraction = 0.0
+
+
+async def bench_breaker(server, params):
+    print("\n3. circuit breaker (upstream outage)")
+    settings.llm_breaker_reset_seconds = 1.0
+    client = LLMClient()
+    server.outage = True
+    upstream_before = server.requests
+    failed_fast = errors = 0
+    fast_latencies = []
+    for _ in range(50):
+        started = time.perf_counter()
+        try:
+            await client.create_message(**params)
+        except LLMUnavailable:
+            failed_fast += 1
+            fast_latencies.append(time.perf_counter() - started)
+        except anthropic.APIStatusError:
+            errors += 1
+    print(f"   50 calls: {errors} reached the upstream and failed, {failed_fast} failed fast "
+          f"(mean {statistics.mean(fast_latencies) * 1e6:.0f} us), upstream saw {server.requests - upstream_before}")
+
+    server.outage = False
+    await asyncio.sleep(settings.llm_breaker_reset_seconds)
+    await client.create_message(**params)
+    print(f"   after {settings.llm_breaker_reset_seconds:.0f} s cool-down and upstream recovery: breaker {client.breaker.state}")
+    await client.aclose()
+
+
+async def main_async(requests: int):
+    server = FakeLLMServer(base_latency_ms=100, ms_per_input_token=0.01, ms_per_output_token=0.2).start()
+    settings.anthropic_base_url = server.url
+    settings.anthropic_api_key = settings.anthropic_api_key or "fake-key"
+    text = (FIXTURE_DIR / "patient_a_breast_pathology.txt").read_text()
+    params = BiomarkerExtractor()._message_params(text, "breast")
+
+    await bench_pooling(server, params, min(requests, 100))
+    await bench_hedging(server, params, requests)
+    await bench_breaker(server, params)
+    server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.requests))
+
+
+if __name__ == "__main__":
+    main()
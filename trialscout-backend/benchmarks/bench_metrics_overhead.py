@@ -0,0 +1,195 @@
+"""
+Benchmark: cost of the /metrics instrumentation on the match hot path
+
+Measures the median match_trials() time (the engine, the budget's
+denominator) and the median POST /api/v1/match latency through the full
+app (in-process, lifespan running), then the cost of exactly the
+instrumentation one match request executes, amortized per request:
+
+    stages       the match stage timers: three sample decisions, and for
+                 1 in MATCH_STAGE_SAMPLE_EVERY requests 10 clock reads and
+                 6 histogram observations
+    validation   the wrap validator around the request body
+    middleware   RequestMetricsMiddleware around one request (counter +
+                 histogram, recorded for every request)
+
+The match stage instrumentation (stages + validation) must stay within
+--budget-pct of the engine time; the exit status says whether it does.
+The middleware is reported against both the engine and the request,
+with a plain statement of whether the total is within budget. Each cost
+is timed over many iterations in isolation, because a 1% difference is
+below the run-to-run noise of an end-to-end A/B. An interleaved A/B of
+match_trials with stage sampling switched off is printed as a cross-check.
+
+Run with: python benchmarks/bench_metrics_overhead.py [--requests 500] [--budget-pct 1.0]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from app.config import settings
+
+settings.rate_limit_enabled = False  # measuring instrumentation, not admission
+
+from app.catalog import catalog
+from app.lanes import shutdown_lanes
+from app.main import _timed_validation, app
+from app.matching import matcher
+from app.metrics import Histogram, Sampler
+from app.models.patient import PatientProfile
+from app.request_metrics import RequestMetricsMiddleware
+
+PATIENT = json.loads((Path(__file__).parent.parent.parent / "test_patient_a.json").read_text())
+
+
+def per_call(fn, iterations: int) -> float:
+    """Median seconds per call of fn over 5 batches"""
+    batches = []
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        batches.append((time.perf_counter() - started) / iterations)
+    return statistics.median(batches)
+
+
+def stage_timer_cost(iterations: int) -> float:
+    scratch = Histogram("scratch_seconds", "", ("stage",), buckets=matcher.match_stage_seconds.buckets)
+    exclusion, scoring, reasons, catalog_stage, serialization = (scratch.labels(stage=str(i)) for i in range(5))
+    sample_engine = Sampler(settings.match_stage_sample_every)
+    sample_handler = Sampler(settings.match_stage_sample_every)
+    clock = time.perf_counter
+
+    def stages():
+        # what one match request does in the matcher (4 clock reads) and the handler (catalog, serialization)
+        if sample_engine():
+            started = clock()
+            excluded_at = clock()
+            scored_at = clock()
+            reasons_at = clock()
+            exclusion.observe(excluded_at - started)
+            scoring.observe(scored_at - excluded_at)
+            reasons.observe(reasons_at - scored_at)
+        if sample_handler():
+            started = clock()
+            catalog_stage.observe(clock() - started)
+            started = clock()
+            serialization.observe(clock() - started)
+
+    return per_call(stages, iterations)
+
+
+def validation_cost(iterations: int) -> float:
+    identity = lambda value: value  # noqa: E731
+    return per_call(lambda: _timed_validation(None, identity), iterations) - per_call(lambda: identity(None), iterations)
+
+
+async def middleware_cost(iterations: int) -> float:
+    scope = {"type": "http", "method": "POST", "path": "/api/v1/match"}
+
+    async def endpoint(scope, receive, send):
+        scope["route"] = app.router.routes[-1]
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    wrapped = RequestMetricsMiddleware(endpoint)
+
+    async def timed(target):
+        batches = []
+        for _ in range(5):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await target(dict(scope), receive, send)
+            batches.append((time.perf_counter() - started) / iterations)
+        return statistics.median(batches)
+
+    return await timed(wrapped) - await timed(endpoint)
+
+
+def engine_ab(trials, rounds: int):
+    """Median match_trials() seconds with stage sampling on and never sampling, interleaved"""
+    patient = PatientProfile(**PATIENT)
+    real = matcher._sample_engine
+    timings = {"instrumented": [], "no-op": []}
+    for _ in range(rounds):
+        for name in timings:
+            matcher._sample_engine = real if name == "instrumented" else (lambda: False)
+            started = time.perf_counter()
+            for _ in range(20):
+                matcher.match_trials(patient, trials=trials)
+            timings[name].append((time.perf_counter() - started) / 20)
+    matcher._sample_engine = real
+    return {name: statistics.median(values) for name, values in timings.items()}
+
+
+async def main_async(args) -> bool:
+    transport = httpx.ASGITransport(app=app)  # doesn't run the lifespan; enter it here
+    async with app.router.lifespan_context(app), httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies = []
+        for i in range(args.requests + 20):
+            started = time.perf_counter()
+            # distinct ages, so every request runs the engine
+            response = await client.post("/api/v1/match", json=dict(PATIENT, age=20 + i % 70))
+            response.raise_for_status()
+            if i >= 20:  # warm-up
+                latencies.append(time.perf_counter() - started)
+        request_time = statistics.median(latencies)
+        trials = catalog.current.trials
+        engine = engine_ab(trials, args.rounds)
+        mw_cost = await middleware_cost(args.iterations)
+
+    stage_costs = {
+        "stages": stage_timer_cost(args.iterations),
+        "validation": validation_cost(args.iterations),
+    }
+    engine_time = engine["no-op"]
+    stage_total = sum(stage_costs.values())
+    stage_share = stage_total / engine_time * 100
+    total = stage_total + mw_cost
+    total_share = total / engine_time * 100
+
+    print(f"match_trials() median     {engine_time * 1e6:8.1f} us  "
+          f"(sampled 1 in {settings.match_stage_sample_every}: {engine['instrumented'] * 1e6:.1f} us, A/B cross-check)")
+    print(f"POST /api/v1/match median {request_time * 1e6:8.1f} us  ({args.requests} sequential requests)")
+    print("instrumentation per match request, as a share of the engine time:")
+    for name, cost in stage_costs.items():
+        print(f"   {name:12s} {cost * 1e6:6.2f} us")
+    print(f"   {'match stages':12s} {stage_total * 1e6:6.2f} us  = {stage_share:.2f}% "
+          f"({'within' if stage_share <= args.budget_pct else 'OVER'} the {args.budget_pct:g}% budget)")
+    print(f"   {'middleware':12s} {mw_cost * 1e6:6.2f} us  = {mw_cost / engine_time * 100:.2f}% "
+          f"({mw_cost / request_time * 100:.2f}% of the request)")
+    print(f"   {'total':12s} {total * 1e6:6.2f} us  = {total_share:.2f}% "
+          f"({'within' if total_share <= args.budget_pct else 'NOT within'} the {args.budget_pct:g}% budget)")
+    return stage_share <= args.budget_pct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=30, help="interleaved rounds for the engine A/B")
+    parser.add_argument("--iterations", type=int, default=20000, help="iterations per isolated cost measurement")
+    parser.add_argument("--budget-pct", type=float, default=1.0)
+    args = parser.parse_args()
+    try:
+        within_budget = asyncio.run(main_async(args))
+    finally:
+        shutdown_lanes()
+    sys.exit(0 if within_budget else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark: PDF text extraction
+
+Builds synthetic 50-200 page text PDFs (pages of the sample patient notes)
+and extracts them three ways:
+
+1. whole-document: the previous DocumentExtractor - PyPDF2 over the whole
+   file with string concatenation, pdfplumber over the whole file again if
+   the result was short
+2. per-page, in-process: one PyPDF2 pass, pdfplumber only for pages that
+   draw text PyPDF2 could not read (pdf_process_pool_enabled=false)
+3. per-page, process pool: the same, as page ranges in worker processes
+
+For each it reports wall time, the slowest and median page, and the worst
+event-loop stall seen by a ticker coroutine while the extraction runs in a
+lane thread - the cost PDF parsing imposes on every other request.
+
+Run with: python benchmarks/bench_pdf_extraction.py [--pages 50 100 200] [--workers N]
+"""
+import argparse
+import asyncio
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import PyPDF2
+import pdfplumber
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from app.config import settings
+from app.extractors import pdf_text
+from app.lanes import get_lane, get_process_pool, reset_process_pool
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent.parent
+LINES_PER_PAGE = 48
+
+
+def build_pdf(pages: int, blank_every: int = 0) -> bytes:
+    """A text PDF cycling through the sample notes; optionally every Nth page blank"""
+    lines = []
+    for path in sorted(FIXTURE_DIR.glob("patient_*.txt")):
+        lines.extend(line[:95] for line in path.read_text().splitlines())
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    cursor = 0
+    for page in range(pages):
+        if not (blank_every and page % blank_every == blank_every - 1):
+            y = 750
+            for _ in range(LINES_PER_PAGE):
+                pdf.drawString(40, y, lines[cursor % len(lines)])
+                cursor += 1
+                y -= 15
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def whole_document(content: bytes) -> str:
+    """The previous implementation, kept here for comparison"""
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    text = ""
+    for page in reader.pages:
+        page_text = page.extract_text()
+        if page_text:
+            text += page_text + "\n"
+    text = text.strip()
+    if len(text) < 50:
+        text = ""
+        with pdfplumber.open(io.BytesIO(content)) as pdf:
+            for page in pdf.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text += page_text + "\n"
+        text = text.strip()
+    return text
+
+
+async def measure(fn, content: bytes):
+    """Run fn(content) in the extraction lane; returns (seconds, result, worst loop stall)"""
+    worst_stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst_stall
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.005)
+            worst_stall = max(worst_stall, time.perf_counter() - before - 0.005)
+
+    ticking = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    result = await get_lane("extraction").run(fn, content)
+    elapsed = time.perf_counter() - started
+    done = True
+    await ticking
+    return elapsed, result, worst_stall
+
+
+def per_page(content: bytes):
+    return pdf_text.extract_pdf_text(content)
+
+
+async def main_async(page_counts, blank_every):
+    print(f"process pool workers: {settings.process_pool_workers or 'one per CPU'}, "
+          f"pages per task: >= {settings.pdf_pages_per_task}")
+    get_process_pool().submit(int).result()  # start workers outside the timings
+    get_process_pool().submit(pdf_text.page_count, build_pdf(1)).result()
+
+    for pages in page_counts:
+        content = build_pdf(pages, blank_every)
+        print(f"\n{pages} pages ({len(content) / 1024:.0f} KB"
+              f"{f', every {blank_every}th page blank' if blank_every else ''})")
+
+        elapsed, text, stall = await measure(whole_document, content)
+        print(f"   whole-document        {elapsed:6.2f} s  loop stall {stall * 1000:6.0f} ms  {len(text):7d} chars")
+        reference = text
+
+        for name, pooled in (("per-page, in-process", False), ("per-page, process pool", True)):
+            settings.pdf_process_pool_enabled = pooled
+            elapsed, (text, page_results), stall = await measure(per_page, content)
+            seconds = [page.seconds for page in page_results]
+            fallbacks = sum(page.extractor == "pdfplumber" for page in page_results)
+            empty = sum(page.extractor == "none" for page in page_results)
+            same = "same text" if text.split() == reference.split() else "TEXT DIFFERS"
+            print(f"   {name:22s}{elapsed:6.2f} s  loop stall {stall * 1000:6.0f} ms  {len(text):7d} chars  "
+                  f"page median {statistics.median(seconds) * 1000:4.0f} ms  max {max(seconds) * 1000:4.0f} ms  "
+                  f"pdfplumber/empty pages {fallbacks}/{empty}  {same}")
+
+    reset_process_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--workers", type=int, default=0, help="process pool size (0 = one per CPU)")
+    parser.add_argument("--blank-every", type=int, default=0, help="make every Nth page blank")
+    args = parser.parse_args()
+    settings.process_pool_workers = args.workers
+    asyncio.run(main_async(args.pages, args.blank_every))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: deterministic fast-path biomarker extraction
+
+Runs the rule-based extractor over the sample patient documents in the
+repository root (patient_*_pathology.txt, *_oncology_note.txt, ...) and
+compares against hand-checked expected values. Reports per-field accuracy
+on the fields the rules resolved, how many fields were deferred to the
+LLM, the share of documents that needed no LLM call at all, and the
+per-document extraction time.
+
+Run with: python benchmarks/bench_rule_extractor.py [--repeat 200]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.extractors.rule_extractor import RuleBasedExtractor
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Hand-checked values per document; "unknown" means the document doesn't state it
+EXPECTED = {
+    "patient_a_breast_pathology.txt": {
+        "cancer_type": "breast", "age": 61, "sex": "female", "stage": "IV",
+        "ER": "present", "PR": "present", "HER2": "low", "Ki67_percentage": 28,
+    },
+    "patient_a_oncology_note.txt": {
+        "cancer_type": "breast", "age": 61, "sex": "female", "stage": "IV", "ecog": "1",
+        "current_treatment_status": "progressed_on_targeted",
+        "ER": "present", "PR": "present", "HER2": "low", "Ki67_percentage": 22,
+    },
+    "patient_b_tnbc_pathology.txt": {
+        "cancer_type": "breast", "age": 56, "sex": "female", "stage": "unknown",
+        "ER": "absent", "PR": "absent", "HER2": "negative", "Ki67_percentage": 78,
+    },
+    "patient_b_tnbc_oncology_note.txt": {
+        "cancer_type": "breast", "age": 56, "sex": "female", "stage": "IV", "ecog": "1",
+        "current_treatment_status": "newly_diagnosed",
+        "ER": "absent", "PR": "absent", "HER2": "negative", "Ki67_percentage": 78,
+    },
+    "patient_c_her2pos_pathology.txt": {
+        "cancer_type": "breast", "age": 62, "sex": "female", "stage": "IV",
+        "ER": "present", "PR": "present", "HER2": "positive", "Ki67_percentage": 42,
+    },
+    "patient_c_her2pos_oncology_note.txt": {
+        "cancer_type": "breast", "age": 62, "sex": "female", "stage": "IV", "ecog": "1",
+        "current_treatment_status": "progressed_on_targeted",
+        "ER": "present", "PR": "present", "HER2": "positive", "Ki67_percentage": 42,
+    },
+    "patient_d_lung_molecular.txt": {
+        "cancer_type": "lung", "age": 58, "sex": "male", "stage": "IV",
+        "current_treatment_status": "newly_diagnosed",
+        "EGFR": "present", "ALK": "absent", "ROS1": "absent", "KRAS": "absent",
+        "BRAF": "absent", "MET": "absent", "PD_L1": "present",
+    },
+    "patient_d_oncology_note.txt": {
+        "cancer_type": "lung", "age": 58, "sex": "male", "stage": "IV", "ecog": "1",
+        "current_treatment_status": "progressed_on_targeted",
+        "EGFR": "present", "ALK": "absent", "ROS1": "absent", "KRAS": "absent", "PD_L1": "present",
+    },
+}
+
+
+def actual_value(data, field):
+    if field in data["biomarkers"]:
+        entry = data["biomarkers"][field]
+        return entry.get("value", entry.get("status"))
+    value = data.get(field)
+    if field == "stage" and isinstance(value, str) and value.startswith("IV"):
+        return "IV"  # compare stage groups, not substages
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200, help="timing iterations per document")
+    args = parser.parse_args()
+
+    extractor = RuleBasedExtractor()
+    correct = wrong = deferred = 0
+    rules_only = 0
+    timings_ms = []
+
+    for name, expected in EXPECTED.items():
+        path = FIXTURE_DIR / name
+        if not path.exists():
+            print(f"skip {name}: not found")
+            continue
+        text = path.read_text()
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            data, fields = extractor.extract(text)
+        timings_ms.append((time.perf_counter() - started) * 1000 / args.repeat)
+
+        unresolved = extractor.unresolved_fields(fields)
+        if not unresolved:
+            rules_only += 1
+
+        misses = []
+        for field, want in expected.items():
+            if field in unresolved:
+                deferred += 1
+                continue
+            got = actual_value(data, field)
+            if got == want:
+                correct += 1
+            else:
+                wrong += 1
+                misses.append(f"{field}: got {got!r}, want {want!r}")
+
+        print(f"{name:40s} {timings_ms[-1]:6.2f} ms  "
+              f"llm={'yes' if unresolved else 'no ':3s} deferred={unresolved or '-'}")
+        for miss in misses:
+            print(f"    MISMATCH {miss}")
+
+    checked = correct + wrong
+    print()
+    print(f"documents:              {len(timings_ms)}")
+    print(f"LLM calls avoided:      {rules_only}/{len(timings_ms)} ({100 * rules_only / max(len(timings_ms), 1):.0f}%)")
+    print(f"rule accuracy:          {correct}/{checked} ({100 * correct / max(checked, 1):.1f}%) of resolved fields")
+    print(f"fields deferred to LLM: {deferred}")
+    print(f"extraction time:        mean {statistics.mean(timings_ms):.2f} ms, max {max(timings_ms):.2f} ms per document")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: API cold start
+
+Imports app.main in fresh interpreters under `python -X importtime` and
+reports:
+
+- the median cumulative import time of app.main, checked against a budget
+- the heaviest packages it pulls in
+- whether any of the libraries that should load on first use (the LLM SDK,
+  PDF parsers, ReportLab, the seed trials) were imported anyway
+- how long the lifespan startup (tables, catalog warmup, job workers) takes
+  before the first request can be served
+
+Exits non-zero if the budget is exceeded or a lazy library is imported, so
+it can guard startup time in CI.
+
+Run with: python benchmarks/bench_startup.py [--runs 5] [--budget-ms 1500]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Loaded by the code paths that use them, never by importing the app
+LAZY_MODULES = ("anthropic", "PyPDF2", "pdfplumber", "reportlab", "app.data.mock_trials")
+
+LIFESPAN_SNIPPET = """
+import asyncio, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        print(imported - started, time.perf_counter() - imported)
+
+asyncio.run(startup())
+"""
+
+
+def import_profile():
+    """{module: cumulative microseconds} for one cold `import app.main`"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.setdefault(name.strip(), int(cumulative))
+    return modules
+
+
+def lifespan_timings():
+    """(import seconds, lifespan startup seconds) in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, "-c", LIFESPAN_SNIPPET],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    imported, started = completed.stdout.split()[-2:]
+    return float(imported), float(started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="median import time of app.main")
+    parser.add_argument("--top", type=int, default=10, help="heaviest packages to list")
+    args = parser.parse_args()
+
+    totals = []
+    packages = defaultdict(list)
+    lazy_imported = set()
+    for _ in range(args.runs):
+        modules = import_profile()
+        totals.append(modules["app.main"] / 1000)
+        for name, cumulative in modules.items():
+            if "." not in name and name != "app":
+                packages[name].append(cumulative / 1000)
+        lazy_imported.update(module for module in LAZY_MODULES if module in modules)
+
+    median = statistics.median(totals)
+    print(f"import app.main: median {median:.0f} ms over {args.runs} cold runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}; budget {args.budget_ms:.0f} ms)")
+    print(f"\nheaviest top-level packages (median cumulative ms):")
+    heaviest = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))[:args.top]
+    for name, samples in heaviest:
+        print(f"   {name:24s} {statistics.median(samples):7.1f}")
+    print(f"\nlazy libraries imported at startup: {', '.join(sorted(lazy_imported)) or 'none'}")
+
+    imported, started = lifespan_timings()
+    print(f"lifespan startup (tables, catalog warmup, job workers): {started * 1000:.0f} ms "
+          f"after a {imported * 1000:.0f} ms import")
+
+    if median > args.budget_ms or lazy_imported:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
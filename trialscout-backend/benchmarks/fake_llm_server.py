@@ -0,0 +1,291 @@
+"""
+Local stand-in for the Anthropic Messages API
+
+Answers POST /v1/messages with an extraction-shaped JSON response, so the
+LLM extraction paths can be exercised and timed without network access or
+an API key. Responses are canned per patient fixture (the repo's
+patient_*.txt files, answered from <name>.response.json next to a fixture
+when present, else from the rule extractor over the whole fixture) and
+picked by line overlap with the REPORT TEXT in the prompt; other prompts are
+answered by the rule extractor over the report text itself.
+
+Latency grows with prompt size to mimic a real model: base latency plus a
+per-input-token and per-output-token cost, scaled by a random factor from
+the chosen distribution (fixed, lognormal or exponential, mean 1), with an
+optional slow tail. Errors are injected at configurable rates (429 rate
+limited, 500 api error, 529 overloaded) and there is a full-outage switch.
+
+Run standalone:
+    python benchmarks/fake_llm_server.py --port 8089 --latency-distribution lognormal --error-rate 0.01
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8089 ANTHROPIC_API_KEY=fake uvicorn app.main:app
+
+or start it in-process from a benchmark with FakeLLMServer(...).start().
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.extractors.rule_extractor import RuleBasedExtractor
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent.parent
+LATENCY_DISTRIBUTIONS = ("fixed", "lognormal", "exponential")
+CANNED_MIN_OVERLAP = 0.5  # share of a report's lines that must come from one fixture
+
+# Prompt sections that follow the report text
+_REPORT_END_MARKERS = ("\nFor BREAST CANCER", "\nFor LUNG CANCER", "\nDetect cancer type from the report", "\nALSO EXTRACT:")
+
+
+def report_from_prompt(prompt: str) -> str:
+    """Pull the report text back out of an extraction prompt"""
+    start = prompt.find("REPORT TEXT:")
+    text = prompt[start + len("REPORT TEXT:"):] if start != -1 else prompt
+    ends = [text.find(marker) for marker in _REPORT_END_MARKERS if marker in text]
+    return text[:min(ends)] if ends else text
+
+
+def _lines(text: str) -> FrozenSet[str]:
+    return frozenset(line.strip() for line in text.splitlines() if len(line.strip()) > 3)
+
+
+def _rule_response(rules: RuleBasedExtractor, text: str) -> str:
+    data, _ = rules.extract(text)
+    data.pop("field_confidence", None)
+    data["extraction_notes"] = "Generated by the local stand-in LLM server"
+    return json.dumps(data)
+
+
+def load_canned_responses(fixture_dir: Path = FIXTURE_DIR) -> Dict[str, Tuple[FrozenSet[str], str]]:
+    """{fixture name: (its lines, response text)} for every patient_*.txt fixture"""
+    rules = RuleBasedExtractor()
+    canned = {}
+    for path in sorted(fixture_dir.glob("patient_*.txt")):
+        text = path.read_text()
+        override = path.with_suffix(".response.json")
+        response = override.read_text() if override.exists() else _rule_response(rules, text)
+        canned[path.stem] = (_lines(text), response)
+    return canned
+
+
+_ERROR_TYPES = {429: "rate_limit_error", 500: "api_error", 529: "overloaded_error"}
+
+
+class FakeLLMServer:
+    """Threaded HTTP server speaking just enough of the Messages API"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        base_latency_ms: float = 300.0,
+        ms_per_input_token: float = 0.05,
+        ms_per_output_token: float = 8.0,
+        tail_fraction: float = 0.0,
+        tail_latency_ms: float = 0.0,
+        latency_distribution: str = "fixed",
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        fixture_dir: Optional[Path] = FIXTURE_DIR,
+        seed: int = 0,
+    ):
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of {LATENCY_DISTRIBUTIONS}")
+        self.base_latency_ms = base_latency_ms
+        self.ms_per_input_token = ms_per_input_token
+        self.ms_per_output_token = ms_per_output_token
+        self.tail_fraction = tail_fraction  # share of requests that take tail_latency_ms extra
+        self.tail_latency_ms = tail_latency_ms
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma  # lognormal spread
+        self.error_rate = error_rate  # share of requests answered with 529 overloaded
+        self.rate_limit_rate = rate_limit_rate  # ... with 429 rate limited
+        self.server_error_rate = server_error_rate  # ... with 500 api error
+        self.outage = False  # when set, every request fails with 500
+        self._random = random.Random(seed)
+        self.requests = 0
+        self.connections = 0
+        self.canned_hits = 0
+        self.errors: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._rules = RuleBasedExtractor()
+        self.canned = load_canned_responses(fixture_dir) if fixture_dir else {}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, body: dict) -> dict:
+        """Build a Messages API response for a request body"""
+        prompt = "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for message in body.get("messages", [])
+            for part in ([message["content"]] if isinstance(message["content"], str) else message["content"])
+        )
+        report = report_from_prompt(prompt)
+        text = self._canned(report)
+        if text is None:
+            text = _rule_response(self._rules, report)
+
+        input_tokens = len(prompt) // 4
+        output_tokens = min(len(text) // 4, body.get("max_tokens", 4096))
+        latency_ms = (
+            self.base_latency_ms
+            + input_tokens * self.ms_per_input_token
+            + output_tokens * self.ms_per_output_token
+        )
+        with self._lock:
+            latency_ms *= self._latency_factor()
+            if self._random.random() < self.tail_fraction:
+                latency_ms += self.tail_latency_ms
+        time.sleep(latency_ms / 1000)
+
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+        }
+
+    def _canned(self, report: str) -> Optional[str]:
+        """The canned response of the fixture the report was taken from, if any"""
+        lines = _lines(report)
+        if not lines or not self.canned:
+            return None
+        overlap, response = max((len(lines & fixture), response) for fixture, response in self.canned.values())
+        if overlap < CANNED_MIN_OVERLAP * len(lines):
+            return None
+        with self._lock:
+            self.canned_hits += 1
+        return response
+
+    def _latency_factor(self) -> float:
+        # Mean 1, so the configured costs stay the average latency
+        if self.latency_distribution == "lognormal":
+            return self._random.lognormvariate(-self.latency_sigma ** 2 / 2, self.latency_sigma)
+        if self.latency_distribution == "exponential":
+            return self._random.expovariate(1.0)
+        return 1.0
+
+    def _failure(self) -> Optional[int]:
+        """Status code to fail the next request with, if any (call under _lock)"""
+        if self.outage:
+            return 500
+        draw = self._random.random()
+        for status, rate in ((429, self.rate_limit_rate), (500, self.server_error_rate), (529, self.error_rate)):
+            if draw < rate:
+                return status
+            draw -= rate
+        return None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self):
+                if not self.path.startswith("/v1/messages"):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("content-length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                    status = server._failure()
+                    if status is not None:
+                        server.errors[status] = server.errors.get(status, 0) + 1
+                if status is not None:
+                    error_type = _ERROR_TYPES[status]
+                    headers = {"retry-after": "1"} if status == 429 else {}
+                    self._send_json(status, {"type": "error", "error": {"type": error_type, "message": "stand-in failure"}}, headers)
+                    return
+                self._send_json(200, server.respond(body))
+
+            def _send_json(self, status, body, headers=None):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("content-length", str(len(payload)))
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up (e.g. a hedged attempt was cancelled)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Anthropic Messages API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--base-latency-ms", type=float, default=300.0)
+    parser.add_argument("--tail-fraction", type=float, default=0.0, help="share of slow requests")
+    parser.add_argument("--tail-latency-ms", type=float, default=0.0, help="extra latency for slow requests")
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="lognormal spread")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 529")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests failing with 429")
+    parser.add_argument("--server-error-rate", type=float, default=0.0, help="share of requests failing with 500")
+    parser.add_argument("--fixture-dir", type=Path, default=FIXTURE_DIR, help="directory of patient_*.txt fixtures")
+    parser.add_argument("--no-canned", action="store_true", help="always answer with the rule extractor")
+    args = parser.parse_args()
+
+    server = FakeLLMServer(
+        args.host, args.port,
+        base_latency_ms=args.base_latency_ms,
+        tail_fraction=args.tail_fraction,
+        tail_latency_ms=args.tail_latency_ms,
+        latency_distribution=args.latency_distribution,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        fixture_dir=None if args.no_canned else args.fixture_dir,
+    )
+    print(f"Fake LLM server listening on {server.url} ({len(server.canned)} canned fixture responses)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
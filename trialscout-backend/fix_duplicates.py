@@ -1,57 +1,52 @@
 #!/usr/bin/env python3
-"""Fix duplicate NCT numbers in mock_trials.py"""
+"""Fix duplicate NCT numbers in the seed catalog (app/data/seed_trials.json)"""
 
-import re
+import json
+from collections import Counter
+
+SEED_FILE = 'app/data/seed_trials.json'
+
+# trial id -> (duplicated NCT number, replacement)
+FIXES = {
+    "lung_trial_002": ("NCT05123456", "NCT05123457"),
+    "lung_trial_008": ("NCT05789234", "NCT05789235"),
+}
 
 # Read the file
-with open('app/data/mock_trials.py', 'r', encoding='utf-8') as f:
-    content = f.read()
+with open(SEED_FILE, 'r', encoding='utf-8') as f:
+    seed = json.load(f)
 
+counts = Counter(trial["nct_number"] for trial in seed["trials"])
 print("Before changes:")
-print(f"  NCT05123456 count: {content.count('NCT05123456')}")
-print(f"  NCT05789234 count: {content.count('NCT05789234')}")
-
-# Replace lung_trial_002 NCT number
-content = re.sub(
-    r'(id="lung_trial_002",\s+nct_number=")NCT05123456(")',
-    r'\1NCT05123457\2',
-    content,
-    flags=re.DOTALL
-)
-
-# Replace lung_trial_008 NCT number  
-content = re.sub(
-    r'(id="lung_trial_008",\s+nct_number=")NCT05789234(")',
-    r'\1NCT05789235\2',
-    content,
-    flags=re.DOTALL
-)
+for old, new in FIXES.values():
+    print(f"  {old} count: {counts[old]}")
+
+# Replace the NCT numbers of the listed trials
+for trial in seed["trials"]:
+    fix = FIXES.get(trial["id"])
+    if fix and trial["nct_number"] == fix[0]:
+        trial["nct_number"] = fix[1]
 
 # Write back
-with open('app/data/mock_trials.py', 'w', encoding='utf-8') as f:
-    f.write(content)
+with open(SEED_FILE, 'w', encoding='utf-8') as f:
+    json.dump(seed, f, indent=2, ensure_ascii=False)
+    f.write("\n")
 
 # Verify
-with open('app/data/mock_trials.py', 'r', encoding='utf-8') as f:
-    new_content = f.read()
-
+counts = Counter(trial["nct_number"] for trial in seed["trials"])
 print("\nAfter changes:")
-print(f"  NCT05123456 count: {new_content.count('NCT05123456')}")
-print(f"  NCT05123457 count: {new_content.count('NCT05123457')}")
-print(f"  NCT05789234 count: {new_content.count('NCT05789234')}")
-print(f"  NCT05789235 count: {new_content.count('NCT05789235')}")
+for old, new in FIXES.values():
+    print(f"  {old} count: {counts[old]}")
+    print(f"  {new} count: {counts[new]}")
 
 # Validate
-nct_numbers = re.findall(r'nct_number="(NCT\d+)"', new_content)
-print(f"\nTotal trials: {len(nct_numbers)}")
-print(f"Unique NCT numbers: {len(set(nct_numbers))}")
+print(f"\nTotal trials: {len(seed['trials'])}")
+print(f"Unique NCT numbers: {len(counts)}")
 
-if len(nct_numbers) == len(set(nct_numbers)):
+if len(seed["trials"]) == len(counts):
     print("✓ All NCT numbers are unique!")
 else:
-    from collections import Counter
-    counts = Counter(nct_numbers)
     print("✗ Duplicates found:")
     for nct, count in counts.items():
         if count > 1:
-            print(f"  {nct}: {count} times")
\ No newline at end of file
+            print(f"  {nct}: {count} times")
@@ -1,4 +1,4 @@
-"""Seed database with trials from mock_trials.py"""
+"""Seed database with trials from the seed catalog (app/data/seed_trials.json)"""
 from app.database import SessionLocal
 from app.models.trial_db import TrialDB
 from app.data.mock_trials import TRIALS
@@ -0,0 +1,19 @@
+"""
+Shared test setup
+
+Tests import the app from trialscout-backend and run against a throwaway
+SQLite database, never the checked-in trialscout.db.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+_TMP = tempfile.mkdtemp(prefix="trialscout-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TMP, 'test.db')}")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("CATALOG_WATCH_INTERVAL_SECONDS", "0")
+os.environ.setdefault("EXTRACTION_CACHE_DIR", os.path.join(_TMP, "extraction-cache"))
+os.environ.setdefault("EXTRACTION_JOB_PAYLOAD_DIR", os.path.join(_TMP, "extraction-jobs"))
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,37 @@
+"""Admin API authentication fails closed"""
+import pytest
+from fastapi import HTTPException
+
+from app.api.admin import require_admin
+from app.config import settings
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    def configure(token):
+        monkeypatch.setattr(settings, "admin_token", token)
+    return configure
+
+
+@pytest.mark.parametrize("header", [None, "", "anything"])
+def test_admin_api_is_closed_without_a_configured_token(admin_token, header):
+    admin_token("")
+
+    with pytest.raises(HTTPException) as error:
+        require_admin(header)
+    assert error.value.status_code == 403
+
+
+@pytest.mark.parametrize("header", [None, "", "wrong"])
+def test_admin_api_rejects_a_wrong_token(admin_token, header):
+    admin_token("s3cret")
+
+    with pytest.raises(HTTPException) as error:
+        require_admin(header)
+    assert error.value.status_code == 403
+
+
+def test_admin_api_accepts_the_configured_token(admin_token):
+    admin_token("s3cret")
+
+    assert require_admin("s3cret") is None
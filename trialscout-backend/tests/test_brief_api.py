@@ -0,0 +1,69 @@
+"""POST /api/brief: Accept negotiation between the JSON envelope and raw PDF"""
+import asyncio
+import base64
+
+import pytest
+from fastapi.responses import Response
+
+from app.api import brief as brief_api
+from app.api.brief import generate_clinician_brief, wants_pdf
+from app.briefs import RenderedBrief
+from app.data.mock_trials import load_seed_trials
+from app.models.brief import ClinicianBriefRequest, ClinicianBriefResponse
+from app.models.matching import MatchResult
+from app.models.patient import PatientProfile
+
+PDF = b"%PDF-1.4 brief"
+
+
+@pytest.mark.parametrize("accept, pdf", [
+    (None, False),
+    ("*/*", False),
+    ("application/json", False),
+    ("application/pdf", True),
+    ("application/pdf, application/json;q=0.5", True),
+    ("application/json, application/pdf;q=0.5", False),
+    ("application/pdf;q=0", False),
+    ("application/*, application/pdf", True),
+])
+def test_only_an_explicit_pdf_preference_gets_raw_pdf(accept, pdf):
+    assert wants_pdf(accept) is pdf
+
+
+@pytest.fixture
+def request_body(monkeypatch):
+    async def get_brief(patient_profile, matched_trials, top_n):
+        return RenderedBrief(PDF, "2026-10-19T09:30:00"), True
+
+    monkeypatch.setattr(brief_api, "get_brief", get_brief)
+    trial = load_seed_trials()[0]
+    return ClinicianBriefRequest(
+        patient_profile=PatientProfile(age=58, sex="female", cancer_type="breast", stage="IV", ecog="1",
+                                       biomarkers={"ER": "present", "PR": "present", "HER2": "negative"},
+                                       prior_treatments=[], line_of_therapy="first"),
+        matched_trials=[MatchResult(trial=trial, score=90, confidence="high",
+                                    why_matched=["ER positive"], what_to_confirm=["ECOG"])],
+    )
+
+
+def test_pdf_accept_returns_the_raw_bytes(request_body):
+    response = asyncio.run(generate_clinician_brief(request_body, accept="application/pdf"))
+
+    assert isinstance(response, Response)
+    assert response.media_type == "application/pdf"
+    assert response.body == PDF
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="TrialScout_Clinician_Brief_2026-10-19.pdf"'
+    )
+    assert response.headers["x-brief-generated-at"] == "2026-10-19T09:30:00"
+    assert response.headers["x-brief-cache"] == "hit"
+    assert response.headers["vary"] == "Accept"
+
+
+def test_default_accept_keeps_the_json_envelope(request_body):
+    response = asyncio.run(generate_clinician_brief(request_body, accept=None))
+
+    assert isinstance(response, ClinicianBriefResponse)
+    assert base64.b64decode(response.pdf_base64) == PDF
+    assert response.filename == "TrialScout_Clinician_Brief_2026-10-19.pdf"
+    assert response.cache_hit
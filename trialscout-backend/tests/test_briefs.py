@@ -0,0 +1,133 @@
+"""Clinician briefs: the render cache, shared renders and bulk ZIP archives"""
+import asyncio
+import io
+import json
+import zipfile
+
+import pytest
+
+from app import briefs
+from app.briefs import BriefCache, BulkBriefSource, RenderedBrief, brief_cache, get_brief, stream_bulk_briefs
+from app.config import settings
+from app.data.mock_trials import load_seed_trials
+from app.models.matching import MatchResult
+from app.models.patient import PatientProfile
+
+PROFILE = PatientProfile(
+    age=58, sex="female", cancer_type="breast", stage="IV", ecog="1",
+    biomarkers={"ER": "present", "PR": "present", "HER2": "negative"},
+    prior_treatments=[], line_of_therapy="first",
+)
+MATCHES = [
+    MatchResult(trial=trial, score=90, confidence="high",
+                why_matched=["ER positive"], what_to_confirm=["ECOG on the day"])
+    for trial in load_seed_trials()[:2]
+]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(settings, "brief_process_pool_enabled", False)  # render in the lane thread
+    brief_cache.clear()
+    yield
+    brief_cache.clear()
+
+
+def test_repeated_brief_is_served_from_the_cache():
+    async def run():
+        return await get_brief(PROFILE, MATCHES, 2), await get_brief(PROFILE, MATCHES, 2)
+
+    (first, first_hit), (second, second_hit) = asyncio.run(run())
+
+    assert first.pdf.startswith(b"%PDF")
+    assert (first_hit, second_hit) == (False, True)
+    assert second.pdf == first.pdf
+
+
+def test_a_different_selection_is_a_different_brief(monkeypatch):
+    monkeypatch.setattr(briefs, "render_brief_pdf", lambda profile, trials, *args: b"%%PDF %d" % len(trials))
+
+    async def run():
+        return await get_brief(PROFILE, MATCHES, 2), await get_brief(PROFILE, MATCHES, 1)
+
+    (two, _), (one, hit) = asyncio.run(run())
+
+    assert not hit
+    assert (two.pdf, one.pdf) == (b"%PDF 2", b"%PDF 1")
+
+
+def test_identical_concurrent_requests_share_one_render(monkeypatch):
+    renders = []
+
+    def render(*args):
+        renders.append(1)
+        return b"%PDF shared"
+
+    monkeypatch.setattr(briefs, "render_brief_pdf", render)
+
+    async def run():
+        return await asyncio.gather(*(get_brief(PROFILE, MATCHES, 2) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert len(renders) == 1
+    assert {brief.pdf for brief, _ in results} == {b"%PDF shared"}
+
+
+def test_bulk_renders_do_not_fill_the_cache(monkeypatch):
+    async def render_bulk(*args):
+        return b"%PDF bulk"
+
+    monkeypatch.setattr(briefs, "render_brief_pdf_bulk", render_bulk)
+
+    asyncio.run(get_brief(PROFILE, MATCHES, 2, bulk=True))
+
+    assert brief_cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_briefs_are_evicted():
+    cache = BriefCache(max_bytes=250)
+    for key in ("a", "b"):
+        cache.put(key, RenderedBrief(b"x" * 100, "2026-01-01T00:00:00"))
+    cache.get("a")
+    cache.put("c", RenderedBrief(b"x" * 100, "2026-01-01T00:00:00"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["total_bytes"] == 200
+
+
+def test_bulk_archive_keeps_the_list_order_and_records_failures(monkeypatch):
+    monkeypatch.setattr(settings, "brief_bulk_concurrency", 3)
+    labels = ["Ada", "Bea", "Cy"]
+    delays = [0.05, 0.0, 0.02]  # Bea finishes first, Ada last
+
+    async def fake_get_brief(profile, trials, top_n, bulk=False):
+        index = profile.age - 60
+        label = labels[index]
+        await asyncio.sleep(delays[index])
+        if label == "Cy":
+            raise ValueError("no trials selected")
+        return RenderedBrief(f"%PDF {label}".encode(), "2026-01-01T00:00:00"), False
+
+    monkeypatch.setattr(briefs, "get_brief", fake_get_brief)
+    items = [
+        BulkBriefSource(label, f"m{i}", PROFILE.model_copy(update={"age": 60 + i}), MATCHES, 2)
+        for i, label in enumerate(labels)
+    ]
+
+    async def run():
+        return [chunk async for chunk in stream_bulk_briefs(items)]
+
+    chunks = asyncio.run(run())
+
+    assert len(chunks) == len(items) + 1  # one per finished brief, then the manifest
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.namelist() == ["2_Bea.pdf", "1_Ada.pdf", "manifest.json"]  # completion order
+    assert archive.read("1_Ada.pdf") == b"%PDF Ada"
+
+    manifest = json.loads(archive.read("manifest.json"))["briefs"]
+    assert [entry["index"] for entry in manifest] == [1, 2, 3]  # input order
+    assert manifest[0]["filename"] == "1_Ada.pdf"
+    assert manifest[0]["match_id"] == "m0"
+    assert manifest[2] == {"index": 3, "label": "Cy", "match_id": "m2", "error": "no trials selected"}
@@ -0,0 +1,95 @@
+"""Catalog staleness: only writes to the trials table make the catalog stale"""
+import asyncio
+import threading
+
+import pytest
+
+from app.catalog import CatalogCache, trial_revision
+from app.data.mock_trials import load_seed_trials
+from app.database import Base, SessionLocal, engine
+from app.models.extraction_job_db import ExtractionJobDB
+from app.models.trial_db import TrialDB
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    session.query(TrialDB).delete()
+    session.query(ExtractionJobDB).delete()
+    for trial in load_seed_trials()[:3]:
+        session.add(TrialDB(**trial.model_dump()))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_trial_writes_bump_the_revision(db):
+    before = trial_revision()
+    trial = db.query(TrialDB).first()
+    trial.location = "Elsewhere"
+    db.commit()
+    db.delete(trial)
+    db.commit()
+
+    assert trial_revision() == before + 2
+
+
+def test_extraction_job_writes_do_not_make_the_catalog_stale(db):
+    cache = CatalogCache()
+    snapshot = cache.refresh(db, "test")
+
+    db.add(ExtractionJobDB(id="job1", status="queued", stage="queued", content_type="text/plain"))
+    db.commit()
+    job = db.get(ExtractionJobDB, "job1")
+    job.status, job.stage = "succeeded", "done"
+    db.commit()
+
+    assert not cache.is_stale()
+    assert cache.current is snapshot
+
+
+def test_trial_write_makes_the_catalog_stale(db):
+    cache = CatalogCache()
+    first = cache.refresh(db, "test")
+    db.query(TrialDB).first().distance += 1
+    db.commit()
+
+    assert cache.is_stale()
+    assert cache.refresh(db, "test").revision == first.revision + 1
+    assert not cache.is_stale()
+
+
+def test_other_workers_map_the_snapshot_file_after_job_writes(db):
+    from app.catalog import catalog_reloads, snapshot_path
+
+    assert snapshot_path() is not None
+    first = CatalogCache().refresh(db, "worker_a")
+    db.add(ExtractionJobDB(id="job2", status="queued", stage="queued", content_type="text/plain"))
+    db.commit()
+
+    second = CatalogCache().refresh(db, "worker_b")
+
+    assert catalog_reloads.value(trigger="worker_b", outcome="mapped") == 1
+    assert second.version == first.version
+
+
+def test_watch_checks_the_database_off_the_event_loop(db, monkeypatch):
+    cache = CatalogCache()
+    cache.refresh(db, "test")
+    threads = []
+
+    def is_stale():
+        threads.append(threading.current_thread())
+        return False
+
+    monkeypatch.setattr(cache, "is_stale", is_stale)
+
+    async def run():
+        watcher = asyncio.create_task(cache.watch(0.01))
+        while not threads:
+            await asyncio.sleep(0.01)
+        watcher.cancel()
+
+    asyncio.run(run())
+    assert threading.main_thread() not in threads
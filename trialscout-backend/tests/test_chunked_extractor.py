@@ -0,0 +1,65 @@
+"""Chunked extraction: split bounds and when chunking applies"""
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings, settings
+from app.extractors.biomarker_extractor import BiomarkerExtractor
+from app.extractors.chunked_extractor import split_chunks
+
+
+@pytest.mark.parametrize("chunk_chars, overlap_chars", [(100, 100), (100, 150), (100, -1), (0, 0)])
+def test_split_chunks_rejects_overlap_not_below_chunk(chunk_chars, overlap_chars):
+    with pytest.raises(ValueError):
+        split_chunks("x" * 500, chunk_chars, overlap_chars)
+
+
+@pytest.mark.parametrize("overlap_chars", [0, 10, 99])
+def test_split_chunks_hard_splits_long_lines_within_bounds(overlap_chars):
+    text = "".join(chr(ord("a") + i % 26) for i in range(1000))  # one line, no breaks
+
+    chunks = split_chunks(text, 100, overlap_chars)
+
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert chunks[0] == text[:100]
+    assert chunks[-1].endswith(text[-10:])
+
+
+def test_split_chunks_overlaps_on_line_boundaries():
+    lines = [f"line {i:03d} " + "." * 40 for i in range(40)]
+
+    chunks = split_chunks("\n".join(lines), 500, 120)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 500 for chunk in chunks)
+    for previous, following in zip(chunks, chunks[1:]):
+        assert following.split("\n")[0] in previous.split("\n")  # carried-over line
+    assert set("\n".join(chunks).split("\n")) == set(lines)
+
+
+def test_settings_reject_overlap_not_below_chunk():
+    with pytest.raises(ValidationError):
+        Settings(extraction_chunk_chars=1000, extraction_chunk_overlap_chars=1000)
+
+
+def test_long_reports_are_chunked_even_with_slicing_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "extraction_chunking_enabled", True)
+    monkeypatch.setattr(settings, "extraction_slicing_enabled", True)
+    monkeypatch.setattr(settings, "extraction_chunk_chars", 2000)
+    monkeypatch.setattr(settings, "extraction_chunk_overlap_chars", 100)
+    monkeypatch.setattr(settings, "extraction_prompt_max_chars", 1200)
+    extractor = BiomarkerExtractor()
+    sent = []
+
+    async def call_llm(text, cancer_type=None):
+        sent.append(text)
+        return {"biomarkers": {}, "prior_treatments": [], "extraction_notes": ""}
+
+    monkeypatch.setattr(extractor, "_call_llm_async", call_llm)
+    report = "\n\n".join(f"Visit {i}: ER positive, HER2 negative. " + "Narrative. " * 30 for i in range(30))
+
+    result = asyncio.run(extractor._extract_with_llm_async(report, "breast"))
+
+    assert len(sent) > 1
+    assert result["chunks"] == len(sent)
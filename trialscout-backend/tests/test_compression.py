@@ -0,0 +1,94 @@
+"""Response compression: Accept-Encoding negotiation and which bodies get compressed"""
+import asyncio
+import gzip
+
+import pytest
+from starlette.responses import Response, StreamingResponse
+
+from app import compression
+from app.compression import CompressionMiddleware, CompressionPolicy, negotiate_encoding
+
+POLICIES = {"": CompressionPolicy(min_size=500, gzip_level=6, brotli_quality=4)}
+JSON = b'{"trials": [' + b'{"nct_number": "NCT00000000", "phase": "II"}, ' * 100 + b"{}]}"
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip;q=0.5, identity", "gzip"),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("*;q=0", None),
+    ("", None),
+])
+def test_negotiation_honours_q_values(monkeypatch, header, expected):
+    monkeypatch.setattr(compression, "brotli", None)
+
+    assert negotiate_encoding(header) == expected
+
+
+def test_brotli_wins_a_tie_when_available():
+    if compression.brotli is None:
+        pytest.skip("brotli is not installed")
+
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0.5") == "gzip"
+
+
+def serve(response, accept_encoding: str = "gzip"):
+    """Send one GET through the middleware; returns (headers, body) as the client sees them"""
+    app = CompressionMiddleware(response, policies=POLICIES, offload_size=10_000_000)
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/trials",
+             "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    messages = []
+
+    async def receive():
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    headers = {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+    return headers, b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def test_large_json_is_gzipped():
+    headers, body = serve(Response(JSON, media_type="application/json"))
+
+    assert headers["content-encoding"] == "gzip"
+    assert int(headers["content-length"]) == len(body) < len(JSON)
+    assert headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(body) == JSON
+
+
+@pytest.mark.parametrize("response", [
+    Response(b'{"ok": true}', media_type="application/json"),  # under min_size
+    Response(b"%PDF-1.4" + b"\0" * 2000, media_type="application/pdf"),  # already compressed
+], ids=["small", "pdf"])
+def test_body_is_sent_as_is(response):
+    original = response.body
+
+    headers, body = serve(response)
+
+    assert "content-encoding" not in headers
+    assert body == original
+
+
+def test_streamed_body_is_sent_as_is():
+    chunks = [JSON[:1000], JSON[1000:]]
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    headers, body = serve(StreamingResponse(stream(), media_type="application/json"))
+
+    assert "content-encoding" not in headers
+    assert body == JSON
+
+
+def test_client_without_gzip_gets_identity():
+    headers, body = serve(Response(JSON, media_type="application/json"), accept_encoding="identity")
+
+    assert "content-encoding" not in headers
+    assert body == JSON
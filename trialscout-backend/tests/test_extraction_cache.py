@@ -0,0 +1,48 @@
+"""Extraction cache keys and storage"""
+import pytest
+
+from app.config import settings
+from app.extractors.biomarker_extractor import extraction_options
+from app.extractors.cache import ExtractionCache, cache_key
+
+
+@pytest.mark.parametrize("name, value", [
+    ("extraction_fast_path", False),
+    ("extraction_slicing_enabled", False),
+    ("extraction_prompt_max_chars", 6000),
+    ("extraction_chunking_enabled", True),
+    ("extraction_chunk_chars", 8000),
+])
+def test_settings_that_change_the_result_change_the_key(monkeypatch, name, value):
+    before = cache_key("sha", "breast", "model", "prompt", extraction_options())
+    monkeypatch.setattr(settings, name, value)
+
+    assert cache_key("sha", "breast", "model", "prompt", extraction_options()) != before
+
+
+def test_put_then_get_round_trips(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=1024 * 1024)
+    cache.put("k", {"biomarker_data": {"ER": "present"}, "raw_text": "text"})
+
+    assert cache.get("k")["biomarker_data"] == {"ER": "present"}
+    assert cache.get("missing") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=200)
+    cache.put("old", {"raw_text": "x" * 80})
+    cache.put("new", {"raw_text": "y" * 80})
+    cache.put("newest", {"raw_text": "z" * 80})
+
+    assert cache.get("old") is None
+    assert cache.get("newest") is not None
+
+
+def test_entry_written_by_another_process_is_found(tmp_path):
+    reader = ExtractionCache(str(tmp_path), max_bytes=1024 * 1024)
+    assert reader.get("k") is None  # index built while the entry didn't exist
+
+    ExtractionCache(str(tmp_path), max_bytes=1024 * 1024).put("k", {"raw_text": "text"})
+
+    assert reader.get("k") == {"raw_text": "text"}
+    assert reader.stats()["entries"] == 1
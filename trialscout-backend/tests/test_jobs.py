@@ -0,0 +1,203 @@
+"""Extraction job queue: in-process wakeups and payload files outside the database"""
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app import jobs
+from app.config import settings
+from app.extractors.llm_client import LLMUnavailable
+from app.database import Base, SessionLocal, engine
+from app.jobs import ExtractionJobQueue
+from app.models.extraction_job_db import ExtractionJobDB
+from app.uploads import Upload
+
+REPORT = b"ER positive 95%, PR positive 80%, HER2 IHC 1+."
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.query(ExtractionJobDB).delete()
+    db.commit()
+    db.close()
+    # Long enough that only a wakeup can explain a prompt claim
+    monkeypatch.setattr(settings, "extraction_job_idle_poll_seconds", 60.0)
+    monkeypatch.setattr(settings, "extraction_job_workers", 2)
+    return ExtractionJobQueue()
+
+
+@pytest.fixture
+def extracted(monkeypatch):
+    """Replaces the pipeline; records the bytes each job was run with"""
+    contents = []
+
+    async def extract_document(upload, cancer_type, progress):
+        contents.append(upload.read_bytes())
+        return {"biomarker_data": {}, "raw_text": "", "cache_hit": False}
+
+    monkeypatch.setattr(jobs, "extract_document", extract_document)
+    return contents
+
+
+async def _until(condition, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_submission_wakes_an_idle_worker(queue, extracted):
+    async def run():
+        queue.start()
+        try:
+            await asyncio.sleep(0.1)  # workers found nothing and are idle
+            job = await queue.submit(Upload.from_bytes(REPORT, "text/plain", "report.txt"), None)
+
+            async def finished():
+                return (await queue.get(job["job_id"]))["status"] == "succeeded"
+
+            await _until(finished, timeout=2.0)
+        finally:
+            await queue.stop()
+
+    asyncio.run(run())
+    assert extracted == [REPORT]
+
+
+def test_idle_workers_do_not_poll_the_database(queue, monkeypatch):
+    claims = []
+    claim = queue._claim
+    monkeypatch.setattr(queue, "_claim", lambda: claims.append(1) or claim())
+
+    async def run():
+        queue.start()
+        try:
+            await asyncio.sleep(0.5)
+        finally:
+            await queue.stop()
+
+    asyncio.run(run())
+    assert len(claims) == settings.extraction_job_workers  # one look each at startup
+
+
+def test_payload_is_kept_outside_the_database_until_the_job_finishes(queue, extracted):
+    async def run():
+        job = await queue.submit(Upload.from_bytes(REPORT, "text/plain", "report.txt"), None)
+        path = jobs._payload_path(job["job_id"])
+        with open(path, "rb") as f:
+            assert f.read() == REPORT
+
+        queue.start()
+        try:
+            async def finished():
+                done = (await queue.get(job["job_id"]))["status"] == "succeeded"
+                return done and not os.path.exists(path)  # removed right after the final stage
+
+            await _until(finished)
+        finally:
+            await queue.stop()
+
+    asyncio.run(run())
+    assert "content" not in {column.name for column in ExtractionJobDB.__table__.columns}
+
+
+def test_missing_payload_fails_the_job(queue, extracted):
+    async def run():
+        job = await queue.submit(Upload.from_bytes(REPORT, "text/plain", "report.txt"), None)
+        os.remove(jobs._payload_path(job["job_id"]))
+        queue.start()
+        try:
+            async def failed():
+                return (await queue.get(job["job_id"]))["status"] == "failed"
+
+            await _until(failed)
+        finally:
+            await queue.stop()
+
+    asyncio.run(run())
+    assert extracted == []
+
+
+@pytest.fixture
+def unavailable(monkeypatch):
+    """Replaces the pipeline with one whose LLM calls are always refused"""
+    calls = []
+
+    async def extract_document(upload, cancer_type, progress):
+        calls.append(1)
+        raise LLMUnavailable(retry_after=0.2, reason="circuit open")
+
+    monkeypatch.setattr(jobs, "extract_document", extract_document)
+    return calls
+
+
+def _row(job_id: str) -> ExtractionJobDB:
+    db = SessionLocal()
+    try:
+        return db.query(ExtractionJobDB).filter(ExtractionJobDB.id == job_id).one()
+    finally:
+        db.close()
+
+
+def test_requeued_job_is_held_back_until_the_retry_time(queue, unavailable):
+    async def run():
+        job = await queue.submit(Upload.from_bytes(REPORT, "text/plain", "report.txt"), None)
+        claimed = queue._claim()
+        await queue._process(claimed)
+
+        row = _row(job["job_id"])
+        assert row.status == "queued"
+        assert row.started_at is None
+        assert row.requeues == 1
+        assert row.available_at is not None
+        assert queue._claim() is None  # not before available_at
+
+        await asyncio.sleep(0.3)
+        assert queue._claim()["id"] == job["job_id"]
+
+    asyncio.run(run())
+
+
+def test_job_fails_after_too_many_requeues(queue, unavailable, monkeypatch):
+    monkeypatch.setattr(settings, "extraction_job_max_requeues", 2)
+
+    async def run():
+        job = await queue.submit(Upload.from_bytes(REPORT, "text/plain", "report.txt"), None)
+        queue.start()
+        try:
+            async def failed():
+                return (await queue.get(job["job_id"]))["status"] == "failed"
+
+            await _until(failed)
+        finally:
+            await queue.stop()
+        return job["job_id"]
+
+    job_id = asyncio.run(run())
+    assert len(unavailable) == 3
+    row = _row(job_id)
+    assert [e["stage"] for e in row.events].count("requeued") == 2
+    assert "circuit open" in row.error
+    assert not os.path.exists(jobs._payload_path(job_id))
+
+
+def test_columns_are_added_to_an_existing_jobs_table(tmp_path):
+    old = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with old.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE extraction_jobs (id VARCHAR PRIMARY KEY, status VARCHAR NOT NULL, "
+            "events JSON NOT NULL, created_at DATETIME NOT NULL)"
+        ))
+        connection.execute(text(
+            "INSERT INTO extraction_jobs VALUES ('old', 'queued', '[]', '2026-01-01 00:00:00')"
+        ))
+
+    Base.metadata.create_all(bind=old)
+
+    columns = {column["name"] for column in inspect(old).get_columns("extraction_jobs")}
+    assert {"requeues", "available_at"} <= columns
+    with old.connect() as connection:
+        assert connection.execute(text("SELECT requeues FROM extraction_jobs")).scalar() == 0
@@ -0,0 +1,29 @@
+"""Execution lanes: a slot is held for as long as its thread runs"""
+import asyncio
+import threading
+
+from app.lanes import Lane
+
+
+def test_cancelled_caller_does_not_free_the_slot_of_a_running_thread():
+    lane = Lane("test", workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def run():
+        task = asyncio.create_task(lane.run(release.wait, 5))
+        while lane.stats()["active"] == 0:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.sleep(0.05)
+        assert lane.stats()["active"] == 1  # the thread is still blocked
+
+        release.set()
+        while lane.stats()["active"]:
+            await asyncio.sleep(0.01)
+        assert await lane.run(lambda: "next") == "next"
+
+    try:
+        asyncio.run(run())
+    finally:
+        release.set()
+        lane.shutdown()
@@ -0,0 +1,127 @@
+"""LLM circuit breaker: only the half-open probe moves it on, and cancelling the probe must not wedge it"""
+import asyncio
+
+import pytest
+
+from app.extractors.llm_client import CircuitBreaker, LLMClient, LLMUnavailable
+
+
+def half_open_client() -> LLMClient:
+    client = LLMClient()
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    client.breaker.state = "open"  # cool-down already over: the next call is the probe
+    return client
+
+
+def test_breaker_allows_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    breaker.record_failure(upstream=True)
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(LLMUnavailable):
+        breaker.before_call()
+
+
+def test_cancelled_probe_releases_the_breaker():
+    client = half_open_client()
+    started = asyncio.Event()
+
+    async def hangs(params):
+        started.set()
+        await asyncio.sleep(3600)
+
+    client._attempt = hangs
+
+    async def run():
+        probe = asyncio.ensure_future(client.create_message(model="m", max_tokens=1, messages=[]))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(run())
+
+    assert client.breaker.state == "half_open"
+    client.breaker.before_call()  # the next call may probe
+
+
+def test_probe_cancelled_while_waiting_for_a_slot_releases_the_breaker(monkeypatch):
+    monkeypatch.setattr("app.extractors.llm_client.settings.llm_max_concurrency", 1)
+    client = half_open_client()
+
+    async def run():
+        await client.semaphore.acquire()  # every slot taken
+        probe = asyncio.ensure_future(client.create_message(model="m", max_tokens=1, messages=[]))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        client.semaphore.release()
+
+    asyncio.run(run())
+
+    client.breaker.before_call()
+
+
+def test_successful_probe_closes_the_breaker():
+    client = half_open_client()
+
+    async def answers(params):
+        return "message"
+
+    client._attempt = answers
+
+    assert asyncio.run(client.create_message(model="m", max_tokens=1, messages=[])) == "message"
+    assert client.breaker.state == "closed"
+
+
+def test_straggler_finishing_does_not_release_the_probe():
+    client = LLMClient()
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    release = {"straggler": asyncio.Event(), "probe": asyncio.Event()}
+    probing = asyncio.Event()
+
+    async def attempt(params):
+        if params["model"] == "probe":
+            probing.set()
+        await release[params["model"]].wait()
+        if params["model"] == "straggler":
+            raise ValueError("bad request")
+        return "message"
+
+    client._attempt = attempt
+
+    async def run():
+        # Starts while the breaker is closed, then the breaker opens under it
+        straggler = asyncio.ensure_future(client.create_message(model="straggler", max_tokens=1, messages=[]))
+        await asyncio.sleep(0)
+        client.breaker.record_failure(upstream=True)
+        probe = asyncio.ensure_future(client.create_message(model="probe", max_tokens=1, messages=[]))
+        await probing.wait()
+
+        release["straggler"].set()
+        with pytest.raises(ValueError):
+            await straggler
+        # The probe is still in flight and still the only call allowed through
+        assert client.breaker.state == "half_open"
+        with pytest.raises(LLMUnavailable):
+            client.breaker.before_call()
+
+        release["probe"].set()
+        return await probe
+
+    assert asyncio.run(run()) == "message"
+    assert client.breaker.state == "closed"
+
+
+def test_straggler_success_leaves_the_probe_in_charge():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    breaker.record_failure(upstream=True)
+    assert breaker.before_call() is True
+
+    breaker.record_success()  # a call that started before the breaker opened
+
+    assert breaker.state == "half_open"
+    with pytest.raises(LLMUnavailable):
+        breaker.before_call()
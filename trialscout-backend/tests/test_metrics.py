@@ -0,0 +1,25 @@
+"""Metrics primitives used on the match hot path"""
+from app.metrics import Counter, Sampler
+
+
+def test_sampler_picks_one_in_every():
+    sample = Sampler(4)
+
+    assert [sample() for _ in range(8)] == [True, False, False, False] * 2
+
+
+def test_sampler_every_one_picks_every_call():
+    sample = Sampler(0)
+
+    assert all(sample() for _ in range(5))
+
+
+def test_bound_counter_series_adds_to_the_counter():
+    requests = Counter("test_requests_total", "", ("route", "status"))
+    series = requests.labels(route="/x", status=200)
+    series.inc()
+    series.inc(2)
+    requests.inc(route="/x", status=200)
+
+    assert requests.value(route="/x", status=200) == 4
+    assert requests.value(route="/x", status=500) == 0
@@ -0,0 +1,34 @@
+"""Candidate profiles built from merged extractions"""
+import pytest
+
+from app.extractors.profile_builder import to_profile
+from app.models.patient import PatientProfile
+
+MERGED = {
+    "age": 58,
+    "sex": "female",
+    "cancer_type": "breast",
+    "stage": "IV",
+    "ecog": "1",
+    "biomarkers": {"ER": "present", "PR": "present", "HER2": "negative"},
+}
+
+
+@pytest.mark.parametrize("status, line", [
+    ("newly_diagnosed", "first"),
+    ("on_treatment", "first"),
+    ("progressed_on_targeted", "post_targeted"),
+    ("progressed_on_chemo", "post_chemo_immuno"),
+    ("unknown", "later_line"),
+])
+def test_treatment_status_sets_the_line_of_therapy(status, line):
+    profile, missing, errors = to_profile(dict(MERGED, current_treatment_status=status))
+
+    assert missing == [] and errors == []
+    assert profile["line_of_therapy"] == line
+
+
+def test_chemo_refractory_line_survives_validation():
+    profile = PatientProfile(**dict(MERGED, prior_treatments=[], line_of_therapy="post_chemo_immuno"))
+
+    assert profile.line_of_therapy == "post_chemo_immuno"
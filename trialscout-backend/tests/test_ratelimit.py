@@ -0,0 +1,93 @@
+"""Rate limiting: 429 + Retry-After for over-budget clients and full admission queues"""
+import asyncio
+
+import pytest
+from starlette.responses import PlainTextResponse
+
+from app.config import settings
+from app.ratelimit import Budget, LocalBucketStore, RateLimitMiddleware
+
+BUDGETS = {"cheap": Budget(rate=0.1, capacity=2), "expensive": Budget(rate=0.1, capacity=100)}
+
+
+async def ok(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+async def request(app, method: str, path: str, client: str = "10.0.0.1"):
+    """Drive one request through the ASGI app; returns (status, headers)"""
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "client": (client, 1234)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start = sent[0]
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_redis_url", "")
+
+
+def test_over_budget_client_gets_429_with_retry_after():
+    app = RateLimitMiddleware(ok, store=LocalBucketStore(), budgets=BUDGETS)
+
+    async def run():
+        return [await request(app, "GET", "/api/v1/trials") for _ in range(3)]
+
+    responses = asyncio.run(run())
+    assert [status for status, _ in responses] == [200, 200, 429]
+    assert int(responses[2][1]["retry-after"]) >= 1  # ~10s until the next token
+
+
+def test_budgets_are_per_client_and_probes_are_exempt():
+    app = RateLimitMiddleware(ok, store=LocalBucketStore(), budgets=BUDGETS)
+
+    async def run():
+        for _ in range(2):
+            await request(app, "GET", "/api/v1/trials")
+        return (
+            await request(app, "GET", "/api/v1/trials", client="10.0.0.2"),
+            await request(app, "GET", "/livez"),
+        )
+
+    other_client, probe = asyncio.run(run())
+    assert other_client[0] == 200
+    assert probe[0] == 200
+
+
+def test_expensive_route_beyond_its_queue_gets_429(monkeypatch):
+    monkeypatch.setattr(settings, "admission_max_concurrency", 1)
+    monkeypatch.setattr(settings, "admission_max_queue", 0)
+
+    async def run():
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow(scope, receive, send):
+            started.set()
+            await release.wait()
+            await ok(scope, receive, send)
+
+        app = RateLimitMiddleware(slow, store=LocalBucketStore(), budgets=BUDGETS)
+        first = asyncio.create_task(request(app, "POST", "/api/v1/match"))
+        await started.wait()
+
+        rejected = await request(app, "POST", "/api/v1/match", client="10.0.0.2")
+        other_route = asyncio.create_task(request(app, "POST", "/api/brief"))
+        await asyncio.sleep(0.01)
+        release.set()
+        return rejected, await first, await other_route, await request(app, "POST", "/api/v1/match")
+
+    rejected, first, other_route, after = asyncio.run(run())
+    assert rejected[0] == 429
+    assert int(rejected[1]["retry-after"]) >= 1
+    assert first[0] == 200
+    assert other_route[0] == 200  # each expensive route has its own slots
+    assert after[0] == 200  # the slot was given back
@@ -0,0 +1,92 @@
+"""Rule-based extractor: biomarker status windows and stage negation"""
+from pathlib import Path
+
+import pytest
+
+from app.extractors.rule_extractor import RuleBasedExtractor, extract_stage
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+def extract(text, cancer_type=None):
+    return RuleBasedExtractor().extract(text, cancer_type=cancer_type)
+
+
+def test_pending_genes_do_not_borrow_the_next_genes_status():
+    data, fields = extract("ALK and ROS1 testing pending; KRAS G12C mutation detected.", cancer_type="lung")
+
+    assert fields["ALK"].value == "unknown"
+    assert fields["ROS1"].value == "unknown"
+    assert data["biomarkers"]["KRAS"]["status"] == "present"
+    assert data["biomarkers"]["KRAS"]["mutation"] == "G12C"
+
+
+def test_status_window_stops_at_the_next_biomarker():
+    _, fields = extract("ALK FISH: no rearrangement. ROS1 by IHC not tested. KRAS wild-type.", cancer_type="lung")
+
+    assert fields["ALK"].value == "absent"
+    assert fields["ROS1"].value == "unknown"
+
+
+def test_status_window_stops_at_the_sentence_end():
+    _, fields = extract("ALK was sent out. The primary tumour was positive for TTF-1.", cancer_type="lung")
+
+    assert fields["ALK"].value == "unknown"
+
+
+@pytest.mark.parametrize("text", [
+    "Stage IIIA breast cancer. No evidence of metastatic disease.",
+    "Stage IIIA breast cancer. Not metastatic.",
+    "Stage IIIA breast cancer, non-metastatic.",
+    "Stage IIIA breast cancer. Staging CT negative for metastatic disease.",
+    "Stage IIIA breast cancer. Bone scan without metastatic lesions.",
+])
+def test_negated_metastatic_keeps_the_explicit_stage(text):
+    field = extract_stage(text)
+
+    assert field.value == "IIIA"
+    assert field.confidence == "high"
+
+
+@pytest.mark.parametrize("text", [
+    "No evidence of metastatic disease on staging CT.",
+    "Non-metastatic invasive ductal carcinoma.",
+])
+def test_negated_metastatic_alone_is_not_stage_iv(text):
+    assert extract_stage(text).value != "IV"
+
+
+def test_metastatic_without_a_stage_is_stage_iv():
+    field = extract_stage("Non-small cell lung cancer, non-squamous, metastatic to bone.")
+
+    assert field.value == "IV"
+    assert field.confidence == "medium"
+
+
+def test_explicit_stage_conflicting_with_metastatic_goes_to_the_llm():
+    text = "Original diagnosis 2019: Stage IIA invasive ductal carcinoma. Now recurrent metastatic breast cancer."
+    _, fields = extract(text, cancer_type="breast")
+
+    assert fields["stage"].value == "IIA"
+    assert fields["stage"].confidence == "low"
+    assert "stage" in RuleBasedExtractor.unresolved_fields(fields)
+
+
+def test_explicit_stage_iv_with_metastatic_is_high_confidence():
+    field = extract_stage("Stage IV adenocarcinoma, metastatic to liver.")
+
+    assert field.value == "IV"
+    assert field.confidence == "high"
+
+
+@pytest.mark.parametrize("name, stage", [
+    ("patient_a_breast_pathology.txt", "IV"),
+    ("patient_b_tnbc_oncology_note.txt", "IV"),
+    ("patient_d_lung_molecular.txt", "IV"),
+])
+def test_sample_documents_keep_their_stage(name, stage):
+    path = FIXTURE_DIR / name
+    if not path.exists():
+        pytest.skip(f"{name} not present")
+
+    assert extract_stage(path.read_text()).value.startswith(stage)
@@ -0,0 +1,57 @@
+"""Relevance-based slicing of reports before LLM extraction"""
+from pathlib import Path
+
+import pytest
+
+from app.extractors.text_slicer import slice_report
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent.parent
+BUDGET = 12000  # the extraction_prompt_max_chars default
+
+
+def fixture(name: str) -> str:
+    return (FIXTURE_DIR / name).read_text()
+
+
+def test_text_within_the_budget_is_unchanged():
+    text = fixture("patient_a_oncology_note.txt")
+    assert len(text) <= BUDGET
+
+    result = slice_report(text, BUDGET)
+
+    assert result.text == text
+    assert result.tokens_saved == 0
+
+
+@pytest.mark.parametrize("name, kept", [
+    # ECOG sits under VITAL SIGNS in both notes
+    ("patient_b_tnbc_oncology_note.txt", "PERFORMANCE STATUS: ECOG 1 (symptomatic"),
+    ("patient_c_her2pos_oncology_note.txt", "PERFORMANCE STATUS: ECOG 1 (symptomatic"),
+    # Current targeted therapy sits under CURRENT MEDICATIONS
+    ("patient_d_oncology_note.txt", "1. Osimertinib (Tagrisso) 80 mg PO daily"),
+])
+def test_facts_under_boilerplate_headings_survive(name, kept):
+    text = fixture(name)
+    result = slice_report(text, BUDGET)
+
+    assert len(result.text) < len(text) <= 2 * BUDGET  # really sliced
+    assert kept in result.text
+
+
+def test_only_matching_lines_of_a_medication_list_are_kept():
+    result = slice_report(fixture("patient_d_oncology_note.txt"), BUDGET)
+
+    assert "1. Osimertinib (Tagrisso) 80 mg PO daily" in result.text
+    assert "Metformin" not in result.text
+    assert "Amlodipine" not in result.text
+
+
+def test_boilerplate_without_relevant_lines_is_dropped():
+    note = fixture("patient_d_oncology_note.txt")
+    padding = "\nSOCIAL HISTORY:\nLives with spouse. Enjoys gardening and walking the dog.\n" * 400
+
+    result = slice_report(note + padding, BUDGET)
+
+    assert "gardening" not in result.text
+    assert "SOCIAL HISTORY" in result.dropped_sections
+    assert len(result.text) <= BUDGET
@@ -0,0 +1,71 @@
+"""read_upload: size-checked and hashed on Starlette's spool, never copied"""
+import asyncio
+import hashlib
+import tempfile
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.config import settings
+from app.extractors.document_extractor import DocumentExtractor
+from app.uploads import read_upload
+
+
+def make_upload(content: bytes, content_type: str = "text/plain") -> UploadFile:
+    # As Starlette's multipart parser does: a spool that rolls to disk at 1MB
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(content)
+    spool.seek(0)
+    return UploadFile(spool, size=len(content), filename="report.txt", headers={"content-type": content_type})
+
+
+class CountingReads:
+    """Wraps a spool and records how many bytes were read from it"""
+
+    def __init__(self, spool):
+        self._spool = spool
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self._spool.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._spool, name)
+
+
+def test_oversized_upload_is_rejected_without_reading_it():
+    file = make_upload(b"x" * 4096)
+    file.file = CountingReads(file.file)
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(read_upload(file, max_bytes=1024))
+
+    assert raised.value.status_code == 413
+    assert file.file.bytes_read == 0
+
+
+def test_small_upload_is_held_in_memory():
+    content = b"ER positive 95%. " * 100
+    upload = asyncio.run(read_upload(make_upload(content)))
+
+    assert upload.data == content
+    assert upload.file is None
+    assert upload.size == len(content)
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+
+
+def test_large_upload_uses_the_request_spool(monkeypatch):
+    monkeypatch.setattr(settings, "upload_spool_bytes", 1024)
+    content = b"HER2 IHC 1+. " * 2000
+    file = make_upload(content)
+
+    with asyncio.run(read_upload(file)) as upload:
+        assert upload.data is None
+        assert upload.file is file.file  # no second copy
+        assert upload.sha256 == hashlib.sha256(content).hexdigest()
+        assert upload.read_bytes() == content
+        text, _ = DocumentExtractor.extract_text_with_pages(upload.source, "text/plain")
+        assert text == content.decode()
+    assert not file.file.closed  # the UploadFile owns the spool